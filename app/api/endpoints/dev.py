@@ -1,8 +1,21 @@
+from typing import Any
+
 from fastapi import APIRouter, HTTPException, status
 from loguru import logger
 
 from app.api.dependencies import fmp_service, get_current_user
+from app.core.fmp_client import fmp_client
+from app.core.shared_cache import shared_cache
+from app.core.statement_cache import statement_cache
+from app.core.statement_filter import statement_filter
 from app.enums.fiscal_period import FiscalPeriodType
+from app.services.category_registry import category_registry
+from app.services.company_registry import company_registry
+from app.services.fetch_planner import fetch_planner
+from app.services.job import JobRunner
+from app.services.negative_cache import negative_cache
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.statement_loader import start_statement_filter_rebuild, statement_loader
 from app.utils.utils import get_task_status
 
 router = APIRouter(prefix="/dev", tags=["Dev"])
@@ -10,13 +23,13 @@ router = APIRouter(prefix="/dev", tags=["Dev"])
 
 @router.post("/update/companies")
 async def start_companies_update(
-    current_user: get_current_user, service: fmp_service, force_update: bool = False
+    current_user: get_current_user, service: fmp_service, force_update: bool = False, resume: bool = True
 ) -> str:
     if not current_user.superuser:
         logger.error("Access Denied, user is not a superuser")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
 
-    return await service.start_companies_update(force_update)
+    return await service.start_companies_update(force_update, resume)
 
 
 @router.post("/update/financial_statements")
@@ -25,12 +38,30 @@ async def start_financial_statements_update(
     service: fmp_service,
     periods: list[FiscalPeriodType],
     force_update: bool = False,
+    distributed: bool = False,
+    incremental: bool = False,
+    resume: bool = True,
+) -> str:
+    if not current_user.superuser:
+        logger.error("Access Denied, user is not a superuser")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
+
+    return await service.start_financial_statements_update(periods, force_update, distributed, incremental, resume)
+
+
+@router.post("/update/financial_statements/bulk")
+async def start_bulk_financial_statements_update(
+    current_user: get_current_user,
+    service: fmp_service,
+    years: list[int],
+    periods: list[FiscalPeriodType] | None = None,
+    resume: bool = True,
 ) -> str:
     if not current_user.superuser:
         logger.error("Access Denied, user is not a superuser")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
 
-    return await service.start_financial_statements_update(periods, force_update)
+    return await service.start_bulk_financial_statements_update(years, periods or [], resume)
 
 
 @router.get("/stop/companies")
@@ -65,8 +96,37 @@ async def stop_financial_statements_update(current_user: get_current_user, servi
         return "Update of financial statements has stopped."
 
 
+@router.get("/refresh_queue")
+async def get_refresh_queue(current_user: get_current_user, limit: int = 100) -> list[dict[str, Any]]:
+    if not current_user.superuser:
+        logger.error("Access Denied, user is not a superuser")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
+
+    return refresh_scheduler.get_queue(limit)
+
+
+@router.delete("/negative_cache")
+async def purge_negative_cache(current_user: get_current_user, ticker: str | None = None) -> str:
+    if not current_user.superuser:
+        logger.error("Access Denied, user is not a superuser")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
+
+    count = await negative_cache.purge(ticker)
+    return f"Purged {count} negative results" + (f" of {ticker}" if ticker else "") + "."
+
+
+@router.post("/statement_filter/rebuild")
+async def rebuild_statement_filter(current_user: get_current_user) -> dict[str, Any]:
+    if not current_user.superuser:
+        logger.error("Access Denied, user is not a superuser")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
+
+    await start_statement_filter_rebuild()
+    return statement_filter.get_metrics()
+
+
 @router.get("/check")
-async def check_update_tasks(current_user: get_current_user, service: fmp_service) -> dict[str, str]:
+async def check_update_tasks(current_user: get_current_user, service: fmp_service) -> dict[str, Any]:
     if not current_user.superuser:
         logger.error("Access Denied, user is not a superuser")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
@@ -74,4 +134,24 @@ async def check_update_tasks(current_user: get_current_user, service: fmp_servic
     return {
         "companies_update": get_task_status(service.companies_update_task),
         "financial_statements_update": get_task_status(service.financial_statements_update_task),
+        "jobs": await JobRunner.get_statuses(),
+        "financial_statements_pipeline": (
+            service.statements_pipeline.get_metrics() if service.statements_pipeline else None
+        ),
+        "financial_statements_extraction": service.extraction_executor.get_metrics(),
+        "category_registry": category_registry.get_metrics(),
+        "company_registry": company_registry.get_metrics(),
+        "fetch_planner": fetch_planner.get_metrics(),
+        "refresh_scheduler": refresh_scheduler.get_metrics(),
+        "statement_loader": statement_loader.get_metrics(),
+        "statement_cache": statement_cache.get_metrics(),
+        "statement_filter": statement_filter.get_metrics(),
+        "shared_cache": shared_cache.get_metrics(),
+        "negative_cache": negative_cache.get_metrics(),
+        "fmp_client": fmp_client.get_metrics(),
+        "fmp_rate_limiter": fmp_client.rate_limiter.get_metrics(),
+        "fmp_circuit_breakers": {
+            family: breaker.get_state() for family, breaker in fmp_client.circuit_breakers.items()
+        },
+        "fmp_response_cache": fmp_client.response_cache.get_metrics() if fmp_client.response_cache else None,
     }
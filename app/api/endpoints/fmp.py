@@ -13,8 +13,9 @@ async def get_statement(
     data: FinancialStatementRequest,
     force_update: bool = False,
     wait_response: bool = False,
+    full_refresh: bool = False,
 ) -> str | float | None:
-    return await service.get_financial_statement(data, force_update, wait_response)
+    return await service.get_financial_statement(data, force_update, wait_response, full_refresh)
 
 
 @router.post("/financial_statement/bulk")
@@ -24,5 +25,6 @@ async def get_statements(
     data: FinancialStatementsRequest,
     force_update: bool = False,
     wait_response: bool = False,
+    full_refresh: bool = False,
 ) -> dict[str, str | float | None]:
-    return await service.get_financial_statements(data, force_update, wait_response)
+    return await service.get_financial_statements(data, force_update, wait_response, full_refresh)
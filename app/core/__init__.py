@@ -1,4 +1,5 @@
 from .config import settings
 from .connection import async_session
+from .fmp_client import fmp_client
 
-__all__ = ["settings", "async_session"]
+__all__ = ["settings", "async_session", "fmp_client"]
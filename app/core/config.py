@@ -1,5 +1,10 @@
+from typing import Any
+
 from pydantic_settings import BaseSettings
 
+from app.enums.fiscal_period import FiscalPeriodType
+from app.enums.fmp import FMPPlan
+
 
 class Settings(BaseSettings):
     APP_HOST: str
@@ -21,6 +26,152 @@ class Settings(BaseSettings):
     STRIPE_API_KEY: str
     FMP_API_KEY: str
 
+    # Can point to a local stand-in serving fixture files
+    FMP_API_URL: str = "https://financialmodelingprep.com/api"
+    FMP_CONNECTION_LIMIT: int = 100
+    FMP_CONNECTION_LIMIT_PER_HOST: int = 50
+    FMP_DNS_CACHE_TTL: int = 300
+    FMP_KEEPALIVE_TIMEOUT: float = 30
+    FMP_CONNECT_TIMEOUT: float = 10
+    FMP_REQUEST_TIMEOUT: float = 60
+
+    FMP_PLAN: FMPPlan = FMPPlan.PREMIUM
+    # Overrides the plan's requests-per-minute limit when set
+    FMP_REQUESTS_PER_MINUTE: int | None = None
+    FMP_MAX_CONCURRENT_REQUESTS: int = 25
+    FMP_RATE_LIMIT_BURST: int = 10
+    FMP_THROTTLE_DELAY: float = 60
+
+    FMP_RETRY_MAX_ATTEMPTS: int = 3
+    FMP_RETRY_BASE_DELAY: float = 0.5
+    FMP_RETRY_MAX_DELAY: float = 10
+    # Per endpoint family overrides, e.g. {"statements": {"max_attempts": 5}}
+    FMP_RETRY_POLICIES: dict[str, dict[str, Any]] = {}
+    FMP_CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    FMP_CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = 30
+
+    FMP_CACHE_ENABLED: bool = True
+    FMP_CACHE_DIR: str = ".fmp_cache"
+    FMP_CACHE_MAX_SIZE_MB: int = 1024
+    # Seconds between scans of the cache directory, shared by all processes, which bound its total size
+    FMP_CACHE_RESCAN_INTERVAL: float = 60
+    # Serve every request from the cache regardless of TTL and never call FMP
+    FMP_CACHE_REPLAY_ONLY: bool = False
+    # TTLs in seconds by endpoint prefix, the longest matching prefix wins; 0 disables caching
+    FMP_CACHE_TTLS: dict[str, int] = {
+        "income-statement": 7 * 24 * 3600,
+        "balance-sheet-statement": 7 * 24 * 3600,
+        "cash-flow-statement": 7 * 24 * 3600,
+        "analyst-estimates": 24 * 3600,
+        "key-metrics-ttm": 3600,
+        "ratios-ttm": 3600,
+        "key-metrics": 24 * 3600,
+        "ratios": 24 * 3600,
+        "historical-price-full/stock_dividend": 24 * 3600,
+        "profile": 24 * 3600,
+        "stock/list": 3600,
+        "discounted-cash-flow": 300,
+        "price-target-consensus": 300,
+        "quote": 60,
+    }
+    FMP_CACHE_DEFAULT_TTL: int = 0
+
+    FMP_BULK_WRITE_BATCH_SIZE: int = 50000
+    FMP_PROFILE_BATCH_SIZE: int = 100
+    FMP_PROFILE_MAX_IN_FLIGHT: int = 5
+
+    FMP_STATEMENTS_QUEUE_SIZE: int = 100
+    FMP_STATEMENTS_FETCH_WORKERS: int = 20
+    FMP_STATEMENTS_EXTRACT_WORKERS: int = 2
+    FMP_STATEMENTS_WRITE_WORKERS: int = 1
+    # Number of (company, period type) payloads written in one transaction
+    FMP_STATEMENTS_WRITE_BATCH_SIZE: int = 50
+    FMP_STATEMENTS_WRITE_FLUSH_INTERVAL: float = 5
+    # Statements are extracted in a process pool, 0 disables it
+    FMP_EXTRACT_PROCESSES: int = 2
+    # Payloads with fewer values are extracted inline
+    FMP_EXTRACT_INLINE_THRESHOLD: int = 5000
+    # Extract statements column-wise with NumPy instead of row by row
+    FMP_EXTRACT_COLUMNAR: bool = False
+
+    # Days of the earnings calendar checked for new filings by the incremental refresh, at most 90
+    FMP_FILING_CALENDAR_DAYS: int = 7
+
+    REFRESH_SCHEDULER_ENABLED: bool = True
+    # Period types refreshed on demand, annual and quarter statements follow the filings instead
+    REFRESH_PERIOD_TYPES: list[FiscalPeriodType] = [FiscalPeriodType.LATEST, FiscalPeriodType.TTM]
+    REFRESH_INTERVAL: float = 60
+    # Decayed number of requests which makes a ticker hot, and the maximum age of its statements in seconds
+    REFRESH_HOT_THRESHOLD: float = 10
+    REFRESH_HOT_SLA: float = 900
+    REFRESH_POPULARITY_HALF_LIFE: float = 24 * 3600
+    REFRESH_MIN_POPULARITY: float = 0.1
+    REFRESH_MAX_CONCURRENT: int = 5
+    # FMP requests budget of the scheduled refreshes
+    REFRESH_REQUESTS_PER_MINUTE: int = 300
+
+    # Seconds statement lookups of concurrent requests are collected for before one query resolves them
+    STATEMENT_LOADER_WINDOW: float = 0.005
+    STATEMENT_LOADER_MAX_BATCH_SIZE: int = 5000
+
+    # Resolved statement values, invalidated when their company or its statements are written
+    STATEMENT_CACHE_TTL: float = 3600
+    STATEMENT_CACHE_MAX_ENTRIES: int = 200000
+    STATEMENT_CACHE_MAX_SIZE_MB: int = 128
+
+    # Membership filter of the stored statement keys, lookups of keys it rules out skip the database
+    STATEMENT_FILTER_ENABLED: bool = True
+    STATEMENT_FILTER_FALSE_POSITIVE_RATE: float = 0.01
+    # Minimum number of keys the filter is sized for, the estimated row count is used when larger
+    STATEMENT_FILTER_CAPACITY: int = 1000000
+    # Caps the memory of the filter, the false positive rate grows beyond the configured one instead
+    STATEMENT_FILTER_MAX_SIZE_MB: int = 256
+    STATEMENT_FILTER_REBUILD_INTERVAL: float = 6 * 3600
+    STATEMENT_FILTER_SCAN_BATCH_SIZE: int = 100000
+
+    # Shared cache tier of the workers and containers, disabled without a URL
+    REDIS_URL: str | None = None
+    REDIS_KEY_PREFIX: str = "cmg"
+    REDIS_SOCKET_TIMEOUT: float = 1
+    REDIS_RECONNECT_DELAY: float = 5
+    REDIS_CACHE_TTL: int = 3600
+    # Cached misses expire sooner, they are also invalidated once the statements are scraped
+    REDIS_NEGATIVE_TTL: int = 300
+
+    # Seconds misses confirmed by a scrape are short-circuited for, by scope
+    NEGATIVE_CACHE_TICKER_TTL: int = 7 * 24 * 3600
+    NEGATIVE_CACHE_PERIOD_TYPE_TTL: int = 24 * 3600
+    NEGATIVE_CACHE_STATEMENT_TTL: int = 24 * 3600
+    # Seconds between reloads of the misses confirmed by other processes
+    NEGATIVE_CACHE_RELOAD_INTERVAL: float = 60
+
+    # Seconds between reloads of the company ids by ticker, new companies are added on demand
+    COMPANY_REGISTRY_RELOAD_INTERVAL: float = 3600
+
+    # Seconds between checks of the categories version
+    CATEGORY_REGISTRY_CHECK_INTERVAL: float = 30
+    # Labels without an exact match which contain ILIKE wildcards (% and _) are matched as patterns, like lookups
+    # did before resolving labels by id. Exact labels never reach the fallback and benchmarks/statement_lookup.py
+    # measured pattern labels about as fast, while without it they all miss. Disable once the pattern_lookups
+    # metric of the registry stays at 0
+    CATEGORY_LABEL_PATTERNS: bool = True
+
+    JOB_HEARTBEAT_INTERVAL: float = 10
+    # A running job without a heartbeat for this long is considered interrupted and resumed
+    JOB_STALE_TIMEOUT: float = 120
+    # Seconds between claims of stale jobs, those of crashed processes
+    JOB_CLAIM_INTERVAL: float = 30
+    JOB_MAX_ERRORS: int = 100
+
+    WORK_UNIT_LEASE_SIZE: int = 20
+    WORK_UNIT_VISIBILITY_TIMEOUT: int = 300
+    WORK_UNIT_MAX_ATTEMPTS: int = 3
+    WORKER_POLL_INTERVAL: float = 5
+
+    # Repositories with COPY support use it for batches of at least this many rows,
+    # benchmarks/copy_upsert.py measured it faster from 25 rows, 50 leaves room for its extra round trips
+    DB_COPY_MIN_ROWS: int = 50
+
     JWT_SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -35,6 +186,10 @@ class Settings(BaseSettings):
     # Operators can be (+) or (-) symbols
     CUSTOM_FORMULA_OPERATOR_PATTERN: str = r"\(\+\)|\(\-\)"
 
+    @property
+    def fmp_requests_per_minute(self) -> int:
+        return self.FMP_REQUESTS_PER_MINUTE or self.FMP_PLAN.requests_per_minute
+
     @property
     def postgres_url(self) -> str:
         return (
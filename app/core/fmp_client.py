@@ -0,0 +1,142 @@
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from loguru import logger
+
+from app.core.config import settings
+from app.enums.fmp import FMPEndpointFamily
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.rate_limiter import TokenBucketRateLimiter
+from app.utils.response_cache import ResponseCache
+from app.utils.retry import RetryPolicy
+
+
+class FMPClient:
+    """
+    Long-lived HTTP client for the FMP API.
+
+    A single ``aiohttp.ClientSession`` with a shared keep-alive connector is created on application startup
+    and closed on shutdown, so FMP requests reuse pooled TCP/TLS connections instead of opening a new one per call.
+    All FMP calls of the process, interactive lookups and update jobs alike, share one rate limiter,
+    and each endpoint family has its own retry policy and circuit breaker.
+    Raw responses are kept in an on-disk cache when it is enabled.
+    """
+
+    def __init__(self) -> None:
+        self._session: aiohttp.ClientSession | None = None
+        self.rate_limiter = TokenBucketRateLimiter(
+            requests_per_minute=settings.fmp_requests_per_minute,
+            max_concurrent=settings.FMP_MAX_CONCURRENT_REQUESTS,
+            burst=settings.FMP_RATE_LIMIT_BURST,
+            throttle_delay=settings.FMP_THROTTLE_DELAY,
+        )
+        self.retry_policies = {
+            family: RetryPolicy(
+                **{
+                    "max_attempts": settings.FMP_RETRY_MAX_ATTEMPTS,
+                    "base_delay": settings.FMP_RETRY_BASE_DELAY,
+                    "max_delay": settings.FMP_RETRY_MAX_DELAY,
+                    **settings.FMP_RETRY_POLICIES.get(family, {}),
+                }
+            )
+            for family in FMPEndpointFamily
+        }
+        self.response_cache = (
+            ResponseCache(
+                directory=settings.FMP_CACHE_DIR,
+                max_size=settings.FMP_CACHE_MAX_SIZE_MB * 1024 * 1024,
+                ttls=settings.FMP_CACHE_TTLS,
+                default_ttl=settings.FMP_CACHE_DEFAULT_TTL,
+                replay_only=settings.FMP_CACHE_REPLAY_ONLY,
+                rescan_interval=settings.FMP_CACHE_RESCAN_INTERVAL,
+            )
+            if settings.FMP_CACHE_ENABLED or settings.FMP_CACHE_REPLAY_ONLY
+            else None
+        )
+        self.circuit_breakers = {
+            family: CircuitBreaker(
+                name=f"fmp:{family}",
+                failure_threshold=settings.FMP_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=settings.FMP_CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            )
+            for family in FMPEndpointFamily
+        }
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._connections_queued = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # allows using the client outside the app lifespan (e.g. in scripts)
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.FMP_CONNECTION_LIMIT,
+            limit_per_host=settings.FMP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.FMP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.FMP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.FMP_REQUEST_TIMEOUT,
+            connect=settings.FMP_CONNECT_TIMEOUT,
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace_config])
+
+    async def start(self) -> None:
+        logger.info("Starting FMP client")
+        _ = self.session
+        if self.response_cache:
+            await self.response_cache.load()
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            logger.info("Closing FMP client")
+            await self._session.close()
+        self._session = None
+
+    async def _on_connection_create_end(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self._connections_created += 1
+
+    async def _on_connection_reuseconn(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self._connections_reused += 1
+
+    async def _on_connection_queued_start(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self._connections_queued += 1
+
+    def get_metrics(self) -> dict[str, Any]:
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+
+        # aiohttp doesn't expose pool state publicly, so read it from the connector internals
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values()) if connector else 0
+        in_use = len(getattr(connector, "_acquired", ())) if connector else 0
+
+        total = self._connections_created + self._connections_reused
+        return {
+            "connections_open": idle + in_use,
+            "connections_idle": idle,
+            "connections_in_use": in_use,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "connections_queued": self._connections_queued,
+            "reuse_rate": round(self._connections_reused / total, 4) if total else 0.0,
+        }
+
+
+fmp_client = FMPClient()
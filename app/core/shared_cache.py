@@ -0,0 +1,296 @@
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+from uuid import UUID, uuid4
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+# a cached miss, distinct from a key which isn't cached
+NEGATIVE = object()
+
+# sets entries, given as generation, entry and tag keys, only while the generation of their ticker is the read one
+SET_IF_GENERATION_SCRIPT = """
+local written = 0
+for i = 1, #KEYS / 3 do
+    if (redis.call('GET', KEYS[i * 3 - 2]) or '0') == ARGV[i * 2 + 1] then
+        redis.call('SET', KEYS[i * 3 - 1], ARGV[i * 2 + 2], 'EX', ARGV[1])
+        redis.call('SADD', KEYS[i * 3], KEYS[i * 3 - 1])
+        redis.call('EXPIRE', KEYS[i * 3], ARGV[2])
+        written = written + 1
+    end
+end
+return written
+"""
+
+
+def encode_value(value: Any) -> str:
+    if value is NEGATIVE:
+        return json.dumps({"n": 1})
+    return json.dumps({"v": _encode(value)})
+
+
+def decode_value(data: str | bytes) -> Any:
+    entry = json.loads(data)
+    if "n" in entry:
+        return NEGATIVE
+    return _decode(entry["v"])
+
+
+def _encode(value: Any) -> Any:
+    # types of statement values and company columns which JSON doesn't keep
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    elif isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    elif isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    elif isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$decimal" in value:
+            return Decimal(value["$decimal"])
+        elif "$datetime" in value:
+            return datetime.fromisoformat(value["$datetime"])
+        elif "$uuid" in value:
+            return UUID(value["$uuid"])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+class SharedCache:
+    """
+    Redis cache tier shared by all workers and containers, disabled without REDIS_URL.
+
+    Entries are tagged with the tickers they depend on. invalidate() deletes the entries of the tickers
+    and broadcasts them, so every process also drops them from its in-process caches. It also bumps a generation
+    counter of every ticker: readers get the generations before querying the database and their entries are only
+    set while those are unchanged, so a value read before a write can't be cached after its invalidation.
+    Redis errors are logged and treated as misses, the database stays the source of truth.
+    """
+
+    def __init__(self) -> None:
+        self.prefix = settings.REDIS_KEY_PREFIX
+        self.channel = f"{self.prefix}:invalidations"
+        # messages of this process are skipped by its own listener
+        self.origin = f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+
+        self._client: Redis | None = None
+        self._listener: asyncio.Task | None = None
+        self._subscribers: list[Callable[[list[str]], Awaitable[None] | None]] = []
+        self._set_if_generation: AsyncScript | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        # entries not set because their ticker was invalidated since it was read
+        self._outdated = 0
+        self._published = 0
+        self._received = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    async def start(self) -> None:
+        if not settings.REDIS_URL or self._client is not None:
+            return
+
+        self._client = Redis.from_url(settings.REDIS_URL, socket_timeout=settings.REDIS_SOCKET_TIMEOUT)
+        self._set_if_generation = self._client.register_script(SET_IF_GENERATION_SCRIPT)
+        self._listener = asyncio.create_task(self._listen())
+        logger.info("Started shared cache")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._set_if_generation = None
+
+    def subscribe(self, callback: Callable[[list[str]], Awaitable[None] | None]) -> None:
+        """
+        Call a function with the tickers invalidated by other processes
+
+        Args:
+            callback: function to call
+        """
+        self._subscribers.append(callback)
+
+    def _get_key(self, namespace: str, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ":".join([self.prefix, namespace, *map(str, parts)])
+
+    def _get_tag_key(self, ticker: str) -> str:
+        return f"{self.prefix}:tag:{ticker}"
+
+    def _get_generation_key(self, ticker: str) -> str:
+        return f"{self.prefix}:gen:{ticker}"
+
+    async def get_generations(self, tickers: Iterable[str]) -> dict[str, int] | None:
+        """
+        Get the generations of tickers, read before the values to cache
+
+        Args:
+            tickers: tickers
+
+        Returns:
+            Generation by ticker, None if they can't be read and nothing should be cached
+        """
+        tickers = list(set(tickers))
+        if not self.enabled or not tickers:
+            return {}
+
+        try:
+            data = await self._client.mget([self._get_generation_key(ticker) for ticker in tickers])
+        except RedisError as e:
+            self._errors += 1
+            logger.warning(f"Failed to get {len(tickers)} generations from the shared cache: {e!r}")
+            return None
+
+        return {ticker: int(item or 0) for ticker, item in zip(tickers, data)}
+
+    async def get_many(self, namespace: str, keys: list[Hashable]) -> dict[Hashable, Any]:
+        """
+        Get many entries in one round trip
+
+        Args:
+            namespace: namespace of the keys
+            keys: keys
+
+        Returns:
+            Values of the cached keys, NEGATIVE for cached misses
+        """
+        if not self.enabled or not keys:
+            return {}
+
+        try:
+            data = await self._client.mget([self._get_key(namespace, key) for key in keys])
+        except RedisError as e:
+            self._errors += 1
+            logger.warning(f"Failed to get {len(keys)} {namespace} entries from the shared cache: {e!r}")
+            return {}
+
+        values = {key: decode_value(item) for key, item in zip(keys, data) if item is not None}
+        self._hits += len(values)
+        self._misses += len(keys) - len(values)
+        return values
+
+    async def set_many(
+        self,
+        namespace: str,
+        entries: dict[Hashable, tuple[Any, str]],
+        ttl: int,
+        generations: dict[str, int] | None,
+    ) -> None:
+        """
+        Set many entries in one script call, skipping those of tickers invalidated since their generation was read
+
+        Args:
+            namespace: namespace of the keys
+            entries: values, or NEGATIVE, and the tickers they depend on by key
+            ttl: seconds to keep the entries
+            generations: generations of the tickers read before the values, nothing is set without them
+        """
+        if not self.enabled or not entries or generations is None:
+            return
+
+        keys = []
+        # the tag outlives its entries, expired members are harmless
+        args = [ttl, settings.REDIS_CACHE_TTL]
+        for key, (value, ticker) in entries.items():
+            keys.extend([self._get_generation_key(ticker), self._get_key(namespace, key), self._get_tag_key(ticker)])
+            args.extend([str(generations.get(ticker, 0)), encode_value(value)])
+
+        try:
+            written = await self._set_if_generation(keys=keys, args=args)
+        except RedisError as e:
+            self._errors += 1
+            logger.warning(f"Failed to set {len(entries)} {namespace} entries in the shared cache: {e!r}")
+            return
+
+        self._outdated += len(entries) - written
+
+    async def invalidate(self, tickers: Iterable[str]) -> None:
+        tickers = sorted(set(tickers))
+        if not self.enabled or not tickers:
+            return
+
+        try:
+            # generations are bumped first, entries of values read before can't be set after the deletion
+            async with self._client.pipeline(transaction=False) as pipeline:
+                for ticker in tickers:
+                    pipeline.incr(self._get_generation_key(ticker))
+                    pipeline.expire(self._get_generation_key(ticker), settings.REDIS_CACHE_TTL)
+                for ticker in tickers:
+                    pipeline.smembers(self._get_tag_key(ticker))
+                results = await pipeline.execute()
+
+            members = results[len(tickers) * 2 :]
+            keys = [key for ticker_keys in members for key in ticker_keys]
+            keys.extend(self._get_tag_key(ticker) for ticker in tickers)
+            async with self._client.pipeline(transaction=False) as pipeline:
+                pipeline.delete(*keys)
+                pipeline.publish(self.channel, json.dumps({"origin": self.origin, "tickers": tickers}))
+                await pipeline.execute()
+        except RedisError as e:
+            self._errors += 1
+            logger.warning(f"Failed to invalidate {len(tickers)} tickers in the shared cache: {e!r}")
+            return
+
+        self._published += 1
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self._handle(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"Shared cache invalidations listener failed, resubscribing: {e!r}")
+                await asyncio.sleep(settings.REDIS_RECONNECT_DELAY)
+
+    async def _handle(self, message: dict[str, Any]) -> None:
+        if message.get("origin") == self.origin:
+            return
+
+        self._received += 1
+        for callback in self._subscribers:
+            result = callback(message["tickers"])
+            if asyncio.iscoroutine(result):
+                await result
+
+    def get_metrics(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+            "errors": self._errors,
+            "outdated": self._outdated,
+            "published_invalidations": self._published,
+            "received_invalidations": self._received,
+        }
+
+
+shared_cache = SharedCache()
@@ -0,0 +1,35 @@
+from typing import Callable, Iterable
+
+from app.core.config import settings
+from app.core.shared_cache import shared_cache
+from app.utils.value_cache import ValueCache
+
+# values of (ticker, category, period) statement keys, tagged with the ticker
+statement_cache = ValueCache(
+    ttl=settings.STATEMENT_CACHE_TTL,
+    max_entries=settings.STATEMENT_CACHE_MAX_ENTRIES,
+    max_size=settings.STATEMENT_CACHE_MAX_SIZE_MB * 1024 * 1024,
+)
+# writes of other processes
+shared_cache.subscribe(statement_cache.invalidate)
+
+# other in-process caches of the tickers, e.g. the negative cache of the services
+_subscribers: list[Callable[[set[str]], None]] = []
+
+
+def subscribe_writes(callback: Callable[[set[str]], None]) -> None:
+    """
+    Call a function with the tickers written by this process
+
+    Args:
+        callback: function to call
+    """
+    _subscribers.append(callback)
+
+
+async def invalidate_statements(tickers: Iterable[str]) -> None:
+    tickers = set(tickers)
+    statement_cache.invalidate(tickers)
+    for callback in _subscribers:
+        callback(tickers)
+    await shared_cache.invalidate(tickers)
@@ -0,0 +1,184 @@
+import asyncio
+from time import monotonic
+from typing import Any, Iterable
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.shared_cache import shared_cache
+from app.utils.bloom_filter import BloomFilter
+
+# room for the rows inserted until the next rebuild
+CAPACITY_HEADROOM = 1.25
+# batches added to the filter in a thread instead of the event loop
+THREAD_BATCH_SIZE = 1000
+
+
+class StatementFilter:
+    """
+    Membership filter of the stored (company id, category id, period) statement keys.
+
+    A key the filter rules out has no row, so its lookup skips the database. Rows upserted by this process
+    are added after their commit. Tickers written by other processes can't be added, they bypass the filter
+    until the next rebuild, which runs every STATEMENT_FILTER_REBUILD_INTERVAL seconds or once the filter
+    exceeds its capacity. All keys bypass it until the first build, and always without the shared cache,
+    whose invalidations are the only news of the writes of other processes.
+    """
+
+    def __init__(self, false_positive_rate: float, capacity: int, max_size: int, rebuild_interval: float) -> None:
+        self.false_positive_rate = false_positive_rate
+        self.capacity = capacity
+        self.max_size = max_size
+        self.rebuild_interval = rebuild_interval
+
+        self._filter: BloomFilter | None = None
+        self._stale: set[str] = set()
+        self._built_at = 0.0
+        # keys added while a rebuild scans the table, replayed on the new filter
+        self._pending: list[bytes] | None = None
+        self._stale_before_rebuild: set[str] = set()
+
+        self._probes = 0
+        self._rejected = 0
+        self._bypassed = 0
+        self._false_positives = 0
+        self._rebuilds = 0
+        self._rebuild_duration = 0.0
+
+    @staticmethod
+    def get_item(company_id: UUID, category_id: UUID, period: str) -> bytes:
+        return company_id.bytes + category_id.bytes + period.encode()
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._pending is not None
+
+    def needs_rebuild(self) -> bool:
+        if not self.ready or self.rebuilding:
+            return False
+        return monotonic() - self._built_at >= self.rebuild_interval or self._filter.count > self._filter.capacity
+
+    def begin_rebuild(self, estimated_count: int) -> BloomFilter:
+        """
+        Start a rebuild, the keys inserted from now on are replayed on the new filter
+
+        Args:
+            estimated_count: estimated number of rows
+
+        Returns:
+            Empty filter to add the scanned keys to
+        """
+        self._pending = []
+        self._stale_before_rebuild = set(self._stale)
+
+        capacity = max(self.capacity, int(estimated_count * CAPACITY_HEADROOM))
+        return BloomFilter(capacity, self.false_positive_rate, self.max_size)
+
+    def finish_rebuild(self, bloom_filter: BloomFilter, duration: float) -> None:
+        bloom_filter.add_many(self._pending)
+        self._filter = bloom_filter
+        # tickers written by other processes during the scan may be missing from it
+        self._stale -= self._stale_before_rebuild
+        self._built_at = monotonic()
+        self.abort_rebuild()
+
+        self._rebuilds += 1
+        self._rebuild_duration = duration
+        logger.info(f"Built statement filter of {bloom_filter.count} keys in {duration:.2f}s")
+
+    def abort_rebuild(self) -> None:
+        self._pending = None
+        self._stale_before_rebuild = set()
+
+    async def add(self, keys: Iterable[tuple[UUID, UUID, str]]) -> None:
+        """
+        Add the keys of upserted rows, inserted or not, a row may predate the filter
+
+        Args:
+            keys: (company id, category id, period) keys
+        """
+        if not self.ready and not self.rebuilding:
+            return
+
+        items = [self.get_item(*key) for key in keys]
+        if self.rebuilding:
+            self._pending.extend(items)
+
+        if self._filter is not None:
+            if len(items) >= THREAD_BATCH_SIZE:
+                await asyncio.to_thread(self._add_new, self._filter, items)
+            else:
+                self._add_new(self._filter, items)
+
+    @staticmethod
+    def _add_new(bloom_filter: BloomFilter, items: list[bytes]) -> None:
+        # rewritten rows are mostly known, adding them again would only count towards the capacity
+        bloom_filter.add_many([item for item in dict.fromkeys(items) if item not in bloom_filter])
+
+    def mark_stale(self, tickers: Iterable[str]) -> None:
+        if self.ready or self.rebuilding:
+            self._stale.update(tickers)
+
+    def probe(self, ticker: str, company_id: UUID, category_ids: list[UUID], period: str) -> list[UUID] | None:
+        """
+        Get the categories of a statement key which may have a row
+
+        Args:
+            ticker: company ticker
+            company_id: company id
+            category_ids: ids of the categories matching the label
+            period: stored period
+
+        Returns:
+            Ids of the categories in the given order, None if the filter can't tell
+        """
+        if self._filter is None or not shared_cache.enabled or ticker in self._stale:
+            self._bypassed += 1
+            return None
+
+        self._probes += 1
+        category_ids = [
+            category_id
+            for category_id in category_ids
+            if self.get_item(company_id, category_id, period) in self._filter
+        ]
+        if not category_ids:
+            self._rejected += 1
+        return category_ids
+
+    def record_false_positives(self, count: int) -> None:
+        self._false_positives += count
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "rebuilding": self.rebuilding,
+            "filter": self._filter.get_metrics() if self._filter is not None else None,
+            "stale_tickers": len(self._stale),
+            "probes": self._probes,
+            "rejected": self._rejected,
+            "bypassed": self._bypassed,
+            "false_positives": self._false_positives,
+            "measured_false_positive_rate": (
+                round(self._false_positives / (self._false_positives + self._rejected), 6)
+                if self._false_positives + self._rejected
+                else 0.0
+            ),
+            "rebuilds": self._rebuilds,
+            "rebuild_duration": round(self._rebuild_duration, 2),
+        }
+
+
+statement_filter = StatementFilter(
+    false_positive_rate=settings.STATEMENT_FILTER_FALSE_POSITIVE_RATE,
+    capacity=settings.STATEMENT_FILTER_CAPACITY,
+    max_size=settings.STATEMENT_FILTER_MAX_SIZE_MB * 1024 * 1024,
+    rebuild_interval=settings.STATEMENT_FILTER_REBUILD_INTERVAL,
+)
+# writes of other processes
+shared_cache.subscribe(statement_filter.mark_stale)
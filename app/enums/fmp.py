@@ -0,0 +1,54 @@
+from app.enums.base import BaseStrEnum
+
+
+class FMPPlan(BaseStrEnum):
+    STARTER = "starter"
+    PREMIUM = "premium"
+    ULTIMATE = "ultimate"
+
+    @property
+    def requests_per_minute(self) -> int:
+        return {
+            FMPPlan.STARTER: 300,
+            FMPPlan.PREMIUM: 750,
+            FMPPlan.ULTIMATE: 3000,
+        }[self]
+
+
+class FMPEndpointFamily(BaseStrEnum):
+    PROFILE = "profile"
+    STATEMENTS = "statements"
+    KEY_METRICS = "key-metrics"
+    DIVIDENDS = "dividends"
+    OTHER = "other"
+
+    @classmethod
+    def from_uri(cls, uri: str) -> "FMPEndpointFamily":
+        # v3/income-statement/AAPL -> income-statement, v4/price-target-consensus?symbol=AAPL -> price-target-consensus
+        path = uri.split("?")[0].split("/", 1)[-1]
+
+        for prefix, family in (
+            ("profile", cls.PROFILE),
+            ("income-statement", cls.STATEMENTS),
+            ("balance-sheet-statement", cls.STATEMENTS),
+            ("cash-flow-statement", cls.STATEMENTS),
+            ("analyst-estimates", cls.STATEMENTS),
+            ("key-metrics", cls.KEY_METRICS),
+            ("ratios", cls.KEY_METRICS),
+            ("discounted-cash-flow", cls.KEY_METRICS),
+            ("price-target-consensus", cls.KEY_METRICS),
+            ("historical-price-full/stock_dividend", cls.DIVIDENDS),
+        ):
+            if path.startswith(prefix):
+                return family
+
+        return cls.OTHER
+
+
+class NegativeResultScope(BaseStrEnum):
+    # FMP doesn't know the ticker
+    TICKER = "ticker"
+    # FMP returns no statements of the period type for the ticker
+    PERIOD_TYPE = "period_type"
+    # the scraped statements don't contain the category for the period
+    STATEMENT = "statement"
@@ -0,0 +1,21 @@
+from app.enums.base import BaseStrEnum
+
+
+class JobType(BaseStrEnum):
+    companies_update = "companies_update"
+    financial_statements_update = "financial_statements_update"
+    bulk_financial_statements_update = "bulk_financial_statements_update"
+
+
+class JobStatus(BaseStrEnum):
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class WorkUnitStatus(BaseStrEnum):
+    pending = "pending"
+    leased = "leased"
+    done = "done"
+    dead = "dead"
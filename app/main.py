@@ -1,3 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,6 +12,16 @@ from app.api.endpoints.dev import router as dev_router
 from app.api.endpoints.fmp import router as fmp_router
 from app.api.endpoints.healthcheck import router as healthcheck_router
 from app.api.endpoints.order import router as order_router
+from app.core.config import settings
+from app.core.fmp_client import fmp_client
+from app.core.shared_cache import shared_cache
+from app.services.category_registry import category_registry
+from app.services.company_registry import company_registry
+from app.services.fetch_planner import fetch_planner
+from app.services.fmp import FMPService
+from app.services.negative_cache import negative_cache
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.statement_loader import start_statement_filter_rebuild
 
 origins = [
     "http://localhost:3000",
@@ -15,7 +29,36 @@ origins = [
     "https://admin.cmgfinances.com",
 ]
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await fmp_client.start()
+    await shared_cache.start()
+    await category_registry.load()
+    await company_registry.load()
+    await fetch_planner.load()
+    await negative_cache.load()
+    # without the shared cache the writes of other processes go unnoticed and lookups always bypass the filter
+    if settings.STATEMENT_FILTER_ENABLED and shared_cache.enabled:
+        # lookups bypass the filter until it's built
+        start_statement_filter_rebuild()
+    # jobs released by the previous process are claimed at once, those of crashed ones once stale
+    claim_task = asyncio.create_task(FMPService().claim_stale_jobs())
+    if settings.REFRESH_SCHEDULER_ENABLED:
+        refresh_scheduler.start(
+            FMPService().refresh_statements,
+            {period_type: len(endpoints) for period_type, endpoints in FMPService.statement_endpoints.items()},
+        )
+    yield
+    claim_task.cancel()
+    await FMPService().release_jobs()
+    refresh_scheduler.shutdown()
+    FMPService.extraction_executor.close()
+    await shared_cache.close()
+    await fmp_client.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
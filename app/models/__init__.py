@@ -1,19 +1,33 @@
 from .api_key import ApiKey
 from .category import Category, FMPCategory
+from .category_source import CategorySource
 from .company import Company, CompanyV2
 from .financial_statement import FinancialStatement, FMPStatement, FMPStatementV2
+from .job import Job
+from .negative_result import NegativeResult
+from .registry_version import RegistryVersion
+from .statement_payload_hash import StatementPayloadHash
+from .stock_list import StockListSymbol
 from .subscription import Subscription
 from .user import User
+from .work_unit import WorkUnit
 
 __all__ = [
     "ApiKey",
     "Category",
+    "CategorySource",
     "Company",
     "CompanyV2",
     "FinancialStatement",
     "FMPCategory",
     "FMPStatement",
     "FMPStatementV2",
+    "Job",
+    "NegativeResult",
+    "RegistryVersion",
+    "StatementPayloadHash",
+    "StockListSymbol",
     "Subscription",
     "User",
+    "WorkUnit",
 ]
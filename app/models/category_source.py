@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.models.base import Base
+
+
+class CategorySource(Base):
+    __tablename__ = "fmp_category_sources"
+
+    period_type = Column(String, primary_key=True)
+    # lowercase value definition and the FMP endpoint which returns it
+    value_definition = Column(String, primary_key=True)
+    endpoint = Column(String, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import UUID, Column, Index, Numeric, String, UniqueConstraint
+from sqlalchemy import UUID, Column, DateTime, Index, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -60,4 +60,6 @@ class CompanyV2(Base):
     change = Column(Numeric(38, 2))
     volume = Column(Numeric(38, 2))
 
+    delisted_at = Column(DateTime, nullable=True)
+
     fmp_statements_v2 = relationship("FMPStatementV2", back_populates="company_v2")
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import UUID, Column, ForeignKey, Index, Numeric, String, UniqueConstraint
+from sqlalchemy import UUID, Column, ForeignKey, Index, Numeric, String, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -44,6 +44,13 @@ class FMPStatementV2(Base):
     __table_args__ = (
         UniqueConstraint("company_id", "period", "category_id", name="uq_company_id_period_category_id"),
         Index("idx_company_id_period_category_id", "company_id", "period", "category_id"),
+        # report date watermarks of the incremental refresh
+        Index(
+            "idx_company_id_quarter_report_date",
+            "company_id",
+            "report_date",
+            postgresql_where=text("period LIKE 'Q%'"),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default="gen_random_uuid()")
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, UUID, Column, DateTime, Enum, Integer, String
+
+from app.enums.job import JobStatus, JobType
+from app.models.base import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default="gen_random_uuid()")
+    type = Column(Enum(JobType), nullable=False, index=True)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.running)
+    params = Column(JSON, nullable=False, default=dict)
+
+    # key of the last item, all items up to which are processed
+    cursor = Column(String, nullable=True)
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)
+    stats = Column(JSON, nullable=False, default=dict)
+
+    started_at = Column(DateTime, default=datetime.utcnow)
+    resumed_at = Column(DateTime, default=datetime.utcnow)
+    resumed_processed = Column(Integer, nullable=False, default=0)
+    heartbeat_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.models.base import Base
+
+
+class NegativeResult(Base):
+    __tablename__ = "fmp_negative_results"
+
+    # ticker, ticker|period type or ticker|category|period depending on the scope
+    key = Column(String, primary_key=True)
+    scope = Column(String, nullable=False)
+    ticker = Column(String, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
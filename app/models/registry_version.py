@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from app.models.base import Base
+
+
+class RegistryVersion(Base):
+    __tablename__ = "registry_versions"
+
+    # name of the versioned table, bumped by its triggers on every change
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, String
+
+from app.models.base import Base
+
+
+class StatementPayloadHash(Base):
+    __tablename__ = "fmp_statement_payload_hashes"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies_v2.id", ondelete="CASCADE"), primary_key=True)
+    period_type = Column(String, primary_key=True)
+    # hash of the raw FMP payload the statements were last written from
+    hash = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.models.base import Base
+
+
+class StockListSymbol(Base):
+    __tablename__ = "fmp_stock_list"
+
+    symbol = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
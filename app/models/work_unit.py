@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import UUID, Column, DateTime, Enum, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from app.enums.job import WorkUnitStatus
+from app.models.base import Base
+
+
+class WorkUnit(Base):
+    __tablename__ = "work_units"
+    __table_args__ = (
+        UniqueConstraint("job_id", "company_id", "period_type", name="uq_job_id_company_id_period_type"),
+        Index("idx_work_units_status_leased_until", "status", "leased_until"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default="gen_random_uuid()")
+
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies_v2.id", ondelete="CASCADE"), nullable=False)
+    period_type = Column(String, nullable=False)
+
+    status = Column(Enum(WorkUnitStatus), nullable=False, default=WorkUnitStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    leased_by = Column(String, nullable=True)
+    leased_until = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,13 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Generic, Sequence, Type, TypeVar
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Generic, Sequence, Type, TypeVar
+from uuid import uuid4
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy import Column, ColumnClause, Executable, Result, Select, delete, func, select, update
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ColumnClause,
+    Enum,
+    Executable,
+    Numeric,
+    Result,
+    Select,
+    column,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import QueryableAttribute, joinedload
 
+from app.core.config import settings
 from app.enums.base import OrderDirection
 from app.models.base import Base
 
@@ -56,6 +77,8 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType]):
     join_load_list: list[QueryableAttribute] = []
     index_elements: list[QueryableAttribute] = []
     columns_to_update: list[QueryableAttribute] = []
+    # create_many streams large batches through COPY instead of multi-row inserts
+    use_copy: bool = False
 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -240,29 +263,142 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType]):
         statement = self.add_loading_options(statement)
         return await self.execute(statement=statement, action=lambda result: result.unique().scalar_one())
 
-    async def create_many(self, obj_in: list[dict[str, Any]]) -> None:
+    def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Call a function once the unit of work commits, it's dropped on rollback
+
+        Args:
+            callback: function to call
+        """
+        self.session.info.setdefault("on_commit", []).append(callback)
+
+    async def create_many(self, obj_in: list[dict[str, Any]]) -> dict[str, int]:
         """
         Create objects
 
         Args:
             obj_in: objects to create
+
+        Returns:
+            Number of inserted, updated and unchanged objects
         """
         logger.debug(f"Creating {self.model_name}")
 
+        if self.use_copy and len(obj_in) >= settings.DB_COPY_MIN_ROWS:
+            return await self.copy_many(obj_in)
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
         for i in range(0, len(obj_in), 4000):
             values = obj_in[i : i + 4000]
-            statement = insert(self.model).values(values)
+            statement = self.add_conflict_clause(insert(self.model).values(values))
+            self.add_counts(counts, len(values), await self.execute(statement=statement))
 
-            if self.index_elements and self.columns_to_update:
-                statement = statement.on_conflict_do_update(
-                    index_elements=self.index_elements,
-                    set_={column.key: getattr(statement.excluded, column.key) for column in self.columns_to_update},
-                )
-            else:
-                statement = statement.on_conflict_do_nothing()
+        return counts
 
-            statement = self.add_loading_options(statement)
-            await self.execute(statement=statement)
+    def add_conflict_clause(self, statement: Insert) -> Insert:
+        """
+        Add upsert clause to insert statement
+
+        Conflicting rows are only updated when one of the columns to update changes,
+        so unchanged rows don't produce dead tuples and WAL.
+        The statement returns whether every written row was inserted or updated.
+
+        Args:
+            statement: insert statement
+
+        Returns:
+            statement
+        """
+        if self.index_elements and self.columns_to_update:
+            statement = statement.on_conflict_do_update(
+                index_elements=self.index_elements,
+                set_={column.key: getattr(statement.excluded, column.key) for column in self.columns_to_update},
+                where=or_(
+                    *[
+                        column.is_distinct_from(getattr(statement.excluded, column.key))
+                        for column in self.columns_to_update
+                    ]
+                ),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing()
+
+        # xmax is only set for rows that existed before the statement
+        return statement.returning(literal_column("xmax = 0", type_=Boolean))
+
+    @staticmethod
+    def add_counts(counts: dict[str, int], total: int, result: Result) -> None:
+        inserted = result.scalars().all()
+        counts["inserted"] += sum(inserted)
+        counts["updated"] += len(inserted) - sum(inserted)
+        counts["unchanged"] += total - len(inserted)
+
+    async def copy_many(self, obj_in: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Create objects through a staging table filled with COPY
+
+        The rows are upserted with a single INSERT ... SELECT with the same conflict handling as create_many,
+        without compiling statements with tens of thousands of bind parameters.
+
+        Args:
+            obj_in: objects to create
+
+        Returns:
+            Number of inserted, updated and unchanged objects
+        """
+        logger.debug(f"Copying {len(obj_in)} of {self.model_name}")
+
+        model_table = self.model.__table__
+        keys = list(dict.fromkeys(key for obj in obj_in for key in obj))
+        # COPY skips python side defaults, so they are filled in like insert does
+        defaults = {
+            model_column.key: model_column.default
+            for model_column in model_table.columns
+            if model_column.key not in keys
+            and model_column.default is not None
+            and (model_column.default.is_scalar or model_column.default.is_callable)
+        }
+        columns = [model_table.columns[key] for key in [*keys, *defaults]]
+
+        def get_value(model_column: Column, obj: dict[str, Any]) -> Any:
+            if model_column.key in defaults:
+                default = defaults[model_column.key]
+                value = default.arg(None) if default.is_callable else default.arg
+            else:
+                value = obj.get(model_column.key)
+
+            # the binary COPY format needs the exact python types of the columns
+            if value is None:
+                return None
+            elif isinstance(model_column.type, Numeric):
+                return value if isinstance(value, Decimal) else Decimal(str(value))
+            elif isinstance(model_column.type, Enum):
+                return str(value)
+            return value
+
+        staging_name = f"tmp_{model_table.name}_{uuid4().hex[:8]}"
+        await self.execute(
+            # dropped with the transaction if the DROP below isn't reached, pooled connections outlive it
+            statement=text(
+                f'CREATE TEMP TABLE {staging_name} (LIKE "{model_table.name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+        )
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_name,
+            records=[tuple(get_value(model_column, obj) for model_column in columns) for obj in obj_in],
+            columns=[model_column.name for model_column in columns],
+        )
+
+        staging = table(staging_name, *[column(model_column.name) for model_column in columns])
+        statement = self.add_conflict_clause(insert(self.model).from_select(columns, select(*staging.columns)))
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        self.add_counts(counts, len(obj_in), await self.execute(statement=statement))
+        await self.execute(statement=text(f"DROP TABLE {staging_name}"))
+        return counts
 
     async def update(
         self, obj_in: BaseModel | dict[str, Any], *, return_object: bool = False, **filters: Any
@@ -1,6 +1,43 @@
+from typing import Any, Sequence
+
+from loguru import logger
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.postgresql import insert
+
 from app.models.category import FMPCategory
 from app.repository.base import SQLAlchemyRepository
 
 
 class CategoryRepository(SQLAlchemyRepository[FMPCategory]):
     model = FMPCategory
+    use_copy = True
+
+    async def get_registry_rows(self) -> Sequence[Row]:
+        logger.debug(f"Getting {self.model_name} registry rows")
+
+        statement = select(self.model.id, self.model.label, self.model.value_definition).order_by(
+            self.model.priority, self.model.id
+        )
+        return await self.execute(statement=statement, action=lambda result: result.all())
+
+    async def allocate(self, obj_in: list[dict[str, Any]]) -> Sequence[Row]:
+        """
+        Create categories or get the existing ones
+
+        The no-op update makes the statement return the id of a category that already exists,
+        including one inserted by a concurrent transaction, which the statement waits for.
+
+        Args:
+            obj_in: categories to create
+
+        Returns:
+            Ids, labels and value definitions of the categories
+        """
+        logger.debug(f"Allocating {len(obj_in)} of {self.model_name}")
+
+        statement = insert(self.model).values(obj_in)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_label_value_definition",
+            set_={"label": statement.excluded.label},
+        ).returning(self.model.id, self.model.label, self.model.value_definition)
+        return await self.execute(statement=statement, action=lambda result: result.all())
@@ -0,0 +1,6 @@
+from app.models.category_source import CategorySource
+from app.repository.base import SQLAlchemyRepository
+
+
+class CategorySourceRepository(SQLAlchemyRepository[CategorySource]):
+    model = CategorySource
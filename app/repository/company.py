@@ -1,9 +1,14 @@
+from typing import Any
+from uuid import UUID
+
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
+from app.core.statement_cache import invalidate_statements
 from app.models import FMPStatement
 from app.models.company import Company, CompanyV2
 from app.models.financial_statement import FMPStatementV2
+from app.models.negative_result import NegativeResult
 from app.repository.base import SQLAlchemyRepository
 
 
@@ -41,6 +46,7 @@ class CompanyRepositoryV2(SQLAlchemyRepository[CompanyV2]):
     model = CompanyV2
     index_elements = [CompanyV2.cik, CompanyV2.ticker]
     columns_to_update = [
+        CompanyV2.name,
         CompanyV2.sector,
         CompanyV2.industry,
         CompanyV2.market_cap,
@@ -48,7 +54,18 @@ class CompanyRepositoryV2(SQLAlchemyRepository[CompanyV2]):
         CompanyV2.price,
         CompanyV2.change,
         CompanyV2.volume,
+        CompanyV2.delisted_at,
     ]
+    use_copy = True
+
+    async def create_many(self, obj_in: list[dict[str, Any]]) -> dict[str, int]:
+        counts = await super().create_many(obj_in)
+        if counts["inserted"] or counts["updated"]:
+            tickers = {obj["ticker"] for obj in obj_in}
+            # the misses confirmed by scrapes no longer hold
+            await self.execute(statement=delete(NegativeResult).where(NegativeResult.ticker.in_(tickers)))
+            self.on_commit(lambda: invalidate_statements(tickers))
+        return counts
 
     async def get_tickers(self) -> list[str]:
         logger.debug(f"Getting {self.model_name} tickers")
@@ -65,3 +82,11 @@ class CompanyRepositoryV2(SQLAlchemyRepository[CompanyV2]):
         filled_companies = await self.execute(statement=statement, action=lambda result: result.scalars().all())
 
         return [company for company in companies if company.id not in filled_companies]
+
+    async def get_ids_by_ticker(self, tickers: list[str] | None = None) -> dict[str, UUID]:
+        logger.debug(f"Getting {self.model_name} ids by ticker")
+
+        statement = select(self.model.ticker, self.model.id)
+        if tickers is not None:
+            statement = statement.where(self.model.ticker.in_(tickers))
+        return await self.execute(statement=statement, action=lambda result: dict(result.tuples().all()))
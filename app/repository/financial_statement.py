@@ -1,13 +1,20 @@
-from typing import Any
+from decimal import Decimal
+from typing import Any, AsyncIterator, Sequence
+from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import Row, String, Uuid, and_, bindparam, cast, column, delete, func, select, table
+from sqlalchemy.dialects.postgresql import ARRAY
 
+from app.core.config import settings
+from app.core.statement_cache import invalidate_statements
+from app.core.statement_filter import statement_filter
 from app.enums.base import OrderDirection
 from app.models import Company
 from app.models.category import FMPCategory
 from app.models.company import CompanyV2
 from app.models.financial_statement import FMPStatement, FMPStatementV2
+from app.models.negative_result import NegativeResult
 from app.repository.base import ModelType, SQLAlchemyRepository
 
 
@@ -62,42 +69,111 @@ class FinancialStatementRepositoryV2(SQLAlchemyRepository[FMPStatementV2]):
     join_load_list = [FMPStatementV2.company_v2, FMPStatementV2.fmp_category]
     index_elements = [FMPStatementV2.company_id, FMPStatementV2.period, FMPStatementV2.category_id]
     columns_to_update = [FMPStatementV2.value]
-
-    async def get_one_or_none(
-        self, order_by: str | None = None, order_direction: OrderDirection = OrderDirection.DESC, **filters: Any
-    ) -> ModelType | None:
+    use_copy = True
+    # (company id, category id, period) keys resolved by one query
+    values_batch_size = 5000
+
+    async def create_many(self, obj_in: list[dict[str, Any]]) -> dict[str, int]:
+        counts = await super().create_many(obj_in)
+        if counts["inserted"] or counts["updated"]:
+            # cached values are tagged with tickers
+            statement = select(CompanyV2.ticker).where(CompanyV2.id.in_({obj["company_id"] for obj in obj_in}))
+            tickers = await self.execute(statement=statement, action=lambda result: result.scalars().all())
+            # the misses confirmed by scrapes no longer hold
+            await self.execute(statement=delete(NegativeResult).where(NegativeResult.ticker.in_(tickers)))
+            self.on_commit(lambda: invalidate_statements(tickers))
+        if obj_in:
+            # unchanged rows too, the filter of this process may not know rows written by others
+            keys = [(obj["company_id"], obj["category_id"], obj["period"]) for obj in obj_in]
+            self.on_commit(lambda: statement_filter.add(keys))
+        return counts
+
+    async def iter_keys(self) -> AsyncIterator[Sequence[Row]]:
         """
-        Get one object or None
-
-        Args:
-            order_by: order by
-            order_direction: order direction
-
-        Kwargs:
-            filters: filters
+        Stream the keys of all statements
 
         Returns:
-            Object or None
+            Batches of (company id, category id, period) rows
         """
-        logger.debug(f"Getting one or none of {self.model_name} with {order_by=}, {filters=}")
+        logger.debug(f"Streaming {self.model_name} keys")
 
-        where_clauses = []
+        statement = select(self.model.company_id, self.model.category_id, self.model.period).execution_options(
+            yield_per=settings.STATEMENT_FILTER_SCAN_BATCH_SIZE
+        )
+        result = await self.session.stream(statement)
+        async for rows in result.partitions():
+            yield rows
 
-        if ticker := filters.pop("ticker", None):
-            where_clauses.append(CompanyV2.ticker.__eq__(ticker))
+    async def get_estimated_count(self) -> int:
+        logger.debug(f"Getting {self.model_name} estimated count")
 
-        if label := filters.pop("label", None):
-            where_clauses.append(FMPCategory.label.ilike(label))
+        # the planner statistics, counting the rows would scan the table
+        pg_class = table("pg_class", column("relname"), column("reltuples"))
+        statement = select(pg_class.c.reltuples).where(pg_class.c.relname == self.model.__tablename__)
+        count = await self.execute(statement=statement, action=lambda result: result.scalar_one_or_none())
+        return max(int(count or 0), 0)
 
-        where_clauses.extend(self.get_where_clauses(filters))
+    async def get_report_date_watermarks(self) -> dict[UUID, str]:
+        """
+        Get the latest report date of every company
+
+        Only quarter statements are considered: FMP reports every fiscal quarter, including the one closing
+        the fiscal year, while annual statements share their periods with the dividends history.
+
+        Returns:
+            Latest quarter report date by company id
+        """
+        logger.debug(f"Getting {self.model_name} report date watermarks")
 
         statement = (
-            select(self.model)
-            .join(CompanyV2, FMPStatementV2.company_id == CompanyV2.id)
-            .join(FMPCategory, FMPStatementV2.category_id == FMPCategory.id)
-            .where(*where_clauses)
+            select(self.model.company_id, func.max(self.model.report_date))
+            .where(self.model.period.like("Q%"))
+            .group_by(self.model.company_id)
         )
-        if order_by:
-            statement = self.add_order_clause(statement, order_by, order_direction)
+        return await self.execute(statement=statement, action=lambda result: dict(result.tuples().all()))
 
-        return await self.execute(statement=statement, action=lambda result: result.unique().scalars().one_or_none())
+    async def get_values(self, keys: list[tuple[UUID, UUID, str]]) -> dict[tuple[UUID, UUID, str], Decimal]:
+        """
+        Get values of many statements, joining the keys unnested from an array per column
+
+        Every key is an equality probe of the (company id, period, category id) index, the ids are resolved
+        by the company and category registries. The statement doesn't depend on the keys, unlike a VALUES list,
+        so it's compiled once and not for every lookup.
+
+        Args:
+            keys: (company id, category id, period) keys
+
+        Returns:
+            Values of the found keys
+        """
+        logger.debug(f"Getting {self.model_name} values of {len(keys)} keys")
+
+        found: dict[tuple[UUID, UUID, str], Decimal] = {}
+        keys = list(dict.fromkeys(keys))
+        for i in range(0, len(keys), self.values_batch_size):
+            company_ids, category_ids, periods = zip(*keys[i : i + self.values_batch_size])
+            requested = (
+                func.unnest(
+                    cast(bindparam("company_ids", list(company_ids)), ARRAY(Uuid)),
+                    cast(bindparam("category_ids", list(category_ids)), ARRAY(Uuid)),
+                    cast(bindparam("periods", list(periods)), ARRAY(String)),
+                )
+                .table_valued(
+                    column("company_id", Uuid), column("category_id", Uuid), column("period", String), name="requested"
+                )
+                .render_derived()
+            )
+
+            statement = select(self.model.company_id, self.model.category_id, self.model.period, self.model.value).join(
+                requested,
+                and_(
+                    self.model.company_id == requested.c.company_id,
+                    self.model.period == requested.c.period,
+                    self.model.category_id == requested.c.category_id,
+                ),
+            )
+            rows = await self.execute(statement=statement, action=lambda result: result.tuples().all())
+            for company_id, category_id, period, value in rows:
+                found[(company_id, category_id, period)] = value
+
+        return found
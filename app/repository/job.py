@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import update
+
+from app.enums.job import JobStatus, JobType
+from app.models.job import Job
+from app.repository.base import SQLAlchemyRepository
+
+
+class JobRepository(SQLAlchemyRepository[Job]):
+    model = Job
+
+    async def get_latest(self, type: JobType) -> Job | None:
+        jobs = await self.get_multi(limit=1, order_by="started_at", type=type)
+        return jobs[0] if jobs else None
+
+    async def claim_stale(self, stale_before: datetime) -> list[Job]:
+        """
+        Claim running jobs whose process stopped sending heartbeats
+
+        Args:
+            stale_before: jobs with an older heartbeat are considered stale
+
+        Returns:
+            Claimed jobs
+        """
+        logger.debug(f"Claiming {self.model_name} with heartbeat before {stale_before}")
+
+        # refreshing the heartbeat in the same statement lets only one process claim a job
+        statement = (
+            update(self.model)
+            .where(self.model.status == JobStatus.running, self.model.heartbeat_at < stale_before)
+            .values(heartbeat_at=datetime.utcnow())
+            .returning(self.model)
+        )
+        return await self.execute(statement=statement, action=lambda result: result.scalars().all())
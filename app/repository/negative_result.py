@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import select
+
+from app.models.negative_result import NegativeResult
+from app.repository.base import SQLAlchemyRepository
+
+
+class NegativeResultRepository(SQLAlchemyRepository[NegativeResult]):
+    model = NegativeResult
+    index_elements = [NegativeResult.key]
+    columns_to_update = [NegativeResult.created_at, NegativeResult.expires_at]
+
+    async def get_expirations(self) -> dict[str, datetime]:
+        logger.debug(f"Getting {self.model_name} expirations")
+
+        statement = select(self.model.key, self.model.expires_at).where(self.model.expires_at > datetime.utcnow())
+        return await self.execute(statement=statement, action=lambda result: dict(result.tuples().all()))
@@ -0,0 +1,15 @@
+from loguru import logger
+from sqlalchemy import select
+
+from app.models.registry_version import RegistryVersion
+from app.repository.base import SQLAlchemyRepository
+
+
+class RegistryVersionRepository(SQLAlchemyRepository[RegistryVersion]):
+    model = RegistryVersion
+
+    async def get_version(self, name: str) -> int:
+        logger.debug(f"Getting {self.model_name} of {name}")
+
+        statement = select(self.model.version).where(self.model.name == name)
+        return await self.execute(statement=statement, action=lambda result: result.scalar_one_or_none() or 0)
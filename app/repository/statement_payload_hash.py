@@ -0,0 +1,37 @@
+from datetime import datetime
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import select
+
+from app.models.company import CompanyV2
+from app.models.statement_payload_hash import StatementPayloadHash
+from app.repository.base import SQLAlchemyRepository
+
+
+class StatementPayloadHashRepository(SQLAlchemyRepository[StatementPayloadHash]):
+    model = StatementPayloadHash
+    index_elements = [StatementPayloadHash.company_id, StatementPayloadHash.period_type]
+    columns_to_update = [StatementPayloadHash.hash, StatementPayloadHash.updated_at]
+
+    async def get_hashes(self) -> dict[tuple[UUID, str], str]:
+        logger.debug(f"Getting {self.model_name} hashes")
+
+        statement = select(self.model.company_id, self.model.period_type, self.model.hash)
+        return await self.execute(
+            statement=statement,
+            action=lambda result: {(company_id, period_type): hash for company_id, period_type, hash in result},
+        )
+
+    async def get_updated_at(self, tickers: list[str]) -> dict[tuple[str, str], datetime]:
+        logger.debug(f"Getting {self.model_name} updates of {len(tickers)} tickers")
+
+        statement = (
+            select(CompanyV2.ticker, self.model.period_type, self.model.updated_at)
+            .join(CompanyV2, CompanyV2.id == self.model.company_id)
+            .where(CompanyV2.ticker.in_(tickers), self.model.updated_at.is_not(None))
+        )
+        return await self.execute(
+            statement=statement,
+            action=lambda result: {(ticker, period_type): updated_at for ticker, period_type, updated_at in result},
+        )
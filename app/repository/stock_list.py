@@ -0,0 +1,17 @@
+from loguru import logger
+from sqlalchemy import select
+
+from app.models.stock_list import StockListSymbol
+from app.repository.base import SQLAlchemyRepository
+
+
+class StockListRepository(SQLAlchemyRepository[StockListSymbol]):
+    model = StockListSymbol
+    index_elements = [StockListSymbol.symbol]
+    columns_to_update = [StockListSymbol.fingerprint, StockListSymbol.updated_at]
+
+    async def get_fingerprints(self) -> dict[str, str]:
+        logger.debug(f"Getting {self.model_name} fingerprints")
+
+        statement = select(self.model.symbol, self.model.fingerprint)
+        return await self.execute(statement=statement, action=lambda result: dict(result.tuples().all()))
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import and_, func, or_, select, update
+
+from app.enums.job import WorkUnitStatus
+from app.models.work_unit import WorkUnit
+from app.repository.base import SQLAlchemyRepository
+
+
+class WorkUnitRepository(SQLAlchemyRepository[WorkUnit]):
+    model = WorkUnit
+
+    async def lease(
+        self,
+        worker_id: str,
+        limit: int,
+        visibility_timeout: float,
+        max_attempts: int,
+        job_id: UUID | None = None,
+    ) -> Sequence[WorkUnit]:
+        """
+        Lease pending units and units whose lease expired
+
+        Args:
+            worker_id: id of the leasing worker
+            limit: max number of units to lease
+            visibility_timeout: lease duration in seconds, after which other workers can lease the unit again
+            max_attempts: units leased this many times are moved to the dead letter state instead
+            job_id: lease units of this job only
+
+        Returns:
+            Leased units
+        """
+        logger.debug(f"Leasing {limit} of {self.model_name} for {worker_id=}, {job_id=}")
+
+        now = datetime.utcnow()
+        expired = and_(self.model.status == WorkUnitStatus.leased, self.model.leased_until < now)
+        job_clauses = [self.model.job_id == job_id] if job_id else []
+
+        # units of crashed workers that ran out of attempts
+        statement = (
+            update(self.model)
+            .where(expired, self.model.attempts >= max_attempts, *job_clauses)
+            .values(status=WorkUnitStatus.dead, last_error="Lease expired")
+        )
+        await self.execute(statement=statement)
+
+        # SKIP LOCKED lets concurrent workers lease disjoint units without waiting for each other
+        units = (
+            select(self.model.id)
+            .where(or_(self.model.status == WorkUnitStatus.pending, expired), *job_clauses)
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id.in_(units.scalar_subquery()))
+            .values(
+                status=WorkUnitStatus.leased,
+                leased_by=worker_id,
+                leased_until=now + timedelta(seconds=visibility_timeout),
+                attempts=self.model.attempts + 1,
+            )
+            .returning(self.model)
+        )
+        return await self.execute(statement=statement, action=lambda result: result.scalars().all())
+
+    async def complete(self, ids: list[UUID]) -> None:
+        logger.debug(f"Completing {len(ids)} of {self.model_name}")
+
+        statement = (
+            update(self.model)
+            .where(self.model.id.in_(ids), self.model.status == WorkUnitStatus.leased)
+            .values(status=WorkUnitStatus.done, leased_until=None, last_error=None)
+        )
+        await self.execute(statement=statement)
+
+    async def fail(self, ids: list[UUID], error: str, max_attempts: int) -> None:
+        logger.debug(f"Failing {len(ids)} of {self.model_name}")
+
+        # failed units go back to the queue until they run out of attempts
+        for status, attempts_clause in (
+            (WorkUnitStatus.dead, self.model.attempts >= max_attempts),
+            (WorkUnitStatus.pending, self.model.attempts < max_attempts),
+        ):
+            statement = (
+                update(self.model)
+                .where(self.model.id.in_(ids), self.model.status == WorkUnitStatus.leased, attempts_clause)
+                .values(status=status, leased_until=None, last_error=error)
+            )
+            await self.execute(statement=statement)
+
+    async def get_counts(self, job_id: UUID) -> dict[str, Any]:
+        logger.debug(f"Getting {self.model_name} counts for {job_id=}")
+
+        statement = (
+            select(self.model.status, func.count(self.model.id))
+            .where(self.model.job_id == job_id)
+            .group_by(self.model.status)
+        )
+        counts = await self.execute(statement=statement, action=lambda result: dict(result.tuples().all()))
+        return {status: counts.get(status, 0) for status in WorkUnitStatus}
@@ -3,8 +3,10 @@ from uuid import UUID
 
 from fastapi import HTTPException
 
+from app.core.statement_cache import statement_cache
 from app.enums.base import OrderDirection
 from app.schemas.category import Category, CategoryCreateRequest, CategoryUpdateRequest
+from app.services.category_registry import category_registry
 from app.utils.unitofwork import ABCUnitOfWork
 
 
@@ -53,7 +55,12 @@ class CategoryService:
     ) -> Category:
         async with unit_of_work:
             category = await unit_of_work.category.create(category)
+            # statements of unchanged payloads have to be written for the new category too
+            await unit_of_work.statement_payload_hash.delete()
 
+        category_registry.invalidate()
+        # values are cached by category label
+        statement_cache.clear()
         return Category.model_validate(category.__dict__)
 
     @staticmethod
@@ -66,7 +73,11 @@ class CategoryService:
             db_category = await unit_of_work.category.update(
                 category.model_dump(exclude_unset=True), return_object=True, id=category_id
             )
+            if category.value_definition is not None:
+                await unit_of_work.statement_payload_hash.delete()
 
+        category_registry.invalidate()
+        statement_cache.clear()
         if not db_category:
             raise HTTPException(status_code=404, detail="Category not found")
 
@@ -77,6 +88,8 @@ class CategoryService:
         async with unit_of_work:
             db_category = await unit_of_work.category.delete(return_object=True, id=category_id)
 
+        category_registry.invalidate()
+        statement_cache.clear()
         if not db_category:
             raise HTTPException(status_code=404, detail="Category not found")
 
@@ -0,0 +1,186 @@
+import asyncio
+import re
+from time import monotonic
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.statement_cache import statement_cache
+from app.utils.unitofwork import UnitOfWork
+
+
+class CategoryRegistry:
+    """
+    Process-wide map of category ids by label and value definition.
+
+    The map is reloaded when the categories version, bumped by a trigger on every change of the categories table,
+    differs from the loaded one. The version is checked at most every CATEGORY_REGISTRY_CHECK_INTERVAL seconds,
+    or on the next lookup after invalidate(). Ids are ordered by category priority. Values are cached by category
+    label, so a reload also clears the statement cache of the process, whichever process changed the categories;
+    the shared cache tier is namespaced by the version.
+
+    Labels are matched exactly, ignoring case. Until CATEGORY_LABEL_PATTERNS is disabled, a label without a match
+    which contains ILIKE wildcards is matched as a pattern against the loaded labels, and logged so its callers
+    can move to exact labels.
+    """
+
+    name = "fmp_categories"
+
+    def __init__(self, check_interval: float) -> None:
+        self.check_interval = check_interval
+        self.version: int | None = None
+
+        self._label_ids: dict[str, list[UUID]] = {}
+        self._value_definition_ids: dict[str, list[UUID]] = {}
+        self._label_value_definitions: dict[str, list[str]] = {}
+        # ids of the labels matching ILIKE patterns, by lowercase pattern
+        self._pattern_ids: dict[str, list[UUID]] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+        self._reloads = 0
+        self._allocated = 0
+        self._pattern_lookups = 0
+
+    async def load(self) -> None:
+        async with self._lock:
+            async with UnitOfWork() as unit_of_work:
+                version = await unit_of_work.registry_version.get_version(self.name)
+                rows = await unit_of_work.category.get_registry_rows()
+
+            label_ids: dict[str, list[UUID]] = {}
+            value_definition_ids: dict[str, list[UUID]] = {}
+            label_value_definitions: dict[str, list[str]] = {}
+            for id, label, value_definition in rows:
+                label_ids.setdefault(label.lower(), []).append(id)
+                value_definition_ids.setdefault(value_definition.lower(), []).append(id)
+                label_value_definitions.setdefault(label.lower(), []).append(value_definition.lower())
+
+            self._label_ids = label_ids
+            self._value_definition_ids = value_definition_ids
+            self._label_value_definitions = label_value_definitions
+            self._pattern_ids = {}
+            if version != self.version:
+                statement_cache.clear()
+            self.version = version
+            self._checked_at = monotonic()
+            self._reloads += 1
+
+        logger.info(f"Loaded {len(rows)} categories of version {version}")
+
+    async def refresh(self) -> None:
+        if self.version is not None and monotonic() - self._checked_at < self.check_interval:
+            return
+
+        async with UnitOfWork() as unit_of_work:
+            version = await unit_of_work.registry_version.get_version(self.name)
+
+        if version != self.version:
+            await self.load()
+        else:
+            self._checked_at = monotonic()
+
+    def invalidate(self) -> None:
+        self._checked_at = 0.0
+
+    async def get_value_definition_ids(self) -> dict[str, list[UUID]]:
+        await self.refresh()
+        return self._value_definition_ids
+
+    async def get_label_ids(self, label: str) -> list[UUID]:
+        await self.refresh()
+        ids = self._label_ids.get(label.lower())
+        if ids is None and settings.CATEGORY_LABEL_PATTERNS and ("%" in label or "_" in label):
+            ids = self._get_pattern_ids(label.lower())
+        return ids or []
+
+    @staticmethod
+    def get_pattern(label: str) -> re.Pattern:
+        """
+        Translate an ILIKE pattern to a regular expression
+
+        Args:
+            label: pattern, % matches any characters, _ a single one and a backslash escapes the next one
+
+        Returns:
+            Case-insensitive regular expression of the whole label
+        """
+        parts = []
+        escaped = False
+        for char in label:
+            if escaped:
+                parts.append(re.escape(char))
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == "%":
+                parts.append(".*")
+            elif char == "_":
+                parts.append(".")
+            else:
+                parts.append(re.escape(char))
+        return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+    def _get_pattern_ids(self, label: str) -> list[UUID]:
+        self._pattern_lookups += 1
+        if label not in self._pattern_ids:
+            pattern = self.get_pattern(label)
+            self._pattern_ids[label] = [
+                id
+                for known_label in sorted(self._label_ids)
+                if pattern.fullmatch(known_label)
+                for id in self._label_ids[known_label]
+            ]
+            logger.warning(f"Matched label {label!r} as a pattern to {len(self._pattern_ids[label])} categories")
+        return self._pattern_ids[label]
+
+    async def get_value_definitions(self, label: str) -> list[str]:
+        await self.refresh()
+        return self._label_value_definitions.get(label.lower(), [])
+
+    async def allocate(self, categories: list[dict[str, Any]]) -> dict[UUID, UUID]:
+        """
+        Create new categories, concurrent scrapes of the same tag converge on one id
+
+        Args:
+            categories: categories with provisional ids
+
+        Returns:
+            Allocated ids by provisional ids
+        """
+        unique_categories = {(category["label"], category["value_definition"]): category for category in categories}
+
+        async with UnitOfWork() as unit_of_work:
+            rows = await unit_of_work.category.allocate(list(unique_categories.values()))
+
+        allocated_ids = {(label, value_definition): id for id, label, value_definition in rows}
+        for (label, value_definition), id in allocated_ids.items():
+            ids = self._value_definition_ids.setdefault(value_definition.lower(), [])
+            if id not in ids:
+                ids.append(id)
+            ids = self._label_ids.setdefault(label.lower(), [])
+            if id not in ids:
+                ids.append(id)
+                self._label_value_definitions.setdefault(label.lower(), []).append(value_definition.lower())
+                self._pattern_ids = {}
+
+        self._allocated += len(rows)
+        return {
+            category["id"]: allocated_ids[(category["label"], category["value_definition"])] for category in categories
+        }
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "labels": len(self._label_ids),
+            "value_definitions": len(self._value_definition_ids),
+            "reloads": self._reloads,
+            "allocated": self._allocated,
+            # lookups of labels matched as ILIKE patterns, see CATEGORY_LABEL_PATTERNS
+            "pattern_lookups": self._pattern_lookups,
+        }
+
+
+category_registry = CategoryRegistry(settings.CATEGORY_REGISTRY_CHECK_INTERVAL)
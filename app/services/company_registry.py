@@ -0,0 +1,81 @@
+import asyncio
+from time import monotonic
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.utils.unitofwork import UnitOfWork
+
+
+class CompanyRegistry:
+    """
+    Process-wide map of company ids by normalized ticker.
+
+    Tickers missing from the map are looked up on demand and added to it, so companies created since the last
+    load, by any process, resolve without a reload. The map is reloaded every COMPANY_REGISTRY_RELOAD_INTERVAL
+    seconds to drop the companies deleted since.
+    """
+
+    def __init__(self, reload_interval: float) -> None:
+        self.reload_interval = reload_interval
+
+        self._ids: dict[str, UUID] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+        self._reloads = 0
+        self._lookups = 0
+        self._queried = 0
+
+    @staticmethod
+    def normalize(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    async def load(self) -> None:
+        async with self._lock:
+            async with UnitOfWork() as unit_of_work:
+                ids = await unit_of_work.company_v2.get_ids_by_ticker()
+
+            self._ids = {self.normalize(ticker): id for ticker, id in ids.items()}
+            self._loaded_at = monotonic()
+            self._reloads += 1
+
+        logger.info(f"Loaded {len(ids)} company ids")
+
+    async def get_ids(self, tickers: list[str]) -> dict[str, UUID]:
+        """
+        Get company ids, querying the tickers missing from the map
+
+        Args:
+            tickers: company tickers
+
+        Returns:
+            Ids of the found companies by the given ticker
+        """
+        if self._loaded_at is None or monotonic() - self._loaded_at >= self.reload_interval:
+            await self.load()
+
+        normalized = {ticker: self.normalize(ticker) for ticker in tickers}
+        missing = list({ticker for ticker in normalized.values() if ticker not in self._ids})
+        if missing:
+            async with UnitOfWork() as unit_of_work:
+                ids = await unit_of_work.company_v2.get_ids_by_ticker(missing)
+            self._ids.update({self.normalize(ticker): id for ticker, id in ids.items()})
+            self._queried += len(missing)
+
+        self._lookups += len(tickers)
+        return {ticker: self._ids[key] for ticker, key in normalized.items() if key in self._ids}
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "companies": len(self._ids),
+            "reloads": self._reloads,
+            "lookups": self._lookups,
+            # tickers missing from the map, new or unknown companies
+            "queried": self._queried,
+        }
+
+
+company_registry = CompanyRegistry(settings.COMPANY_REGISTRY_RELOAD_INTERVAL)
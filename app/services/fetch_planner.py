@@ -0,0 +1,99 @@
+from typing import Any
+
+from loguru import logger
+
+from app.enums.fiscal_period import FiscalPeriodType
+from app.utils.unitofwork import UnitOfWork
+
+
+class FetchPlanner:
+    """
+    Index of the FMP endpoints that return each value definition, by period type.
+
+    Sources are recorded whenever statements are fetched, so an on-demand scrape of a category only requests
+    the endpoints that can return it. Value definitions without a known source fall back to all endpoints.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[tuple[str, str], set[str]] = {}
+
+        self._planned = 0
+        self._full = 0
+        self._skipped_endpoints = 0
+
+    async def load(self) -> None:
+        async with UnitOfWork() as unit_of_work:
+            sources = await unit_of_work.category_source.get_multi()
+
+        self._sources = {}
+        for source in sources:
+            self._sources.setdefault((source.period_type, source.value_definition), set()).add(source.endpoint)
+
+        logger.info(f"Loaded {len(sources)} category sources")
+
+    async def record(self, period_type: FiscalPeriodType, endpoint: str, value_definitions: set[str]) -> None:
+        new_sources = []
+        for value_definition in value_definitions:
+            endpoints = self._sources.setdefault((period_type, value_definition), set())
+            if endpoint not in endpoints:
+                endpoints.add(endpoint)
+                new_sources.append(
+                    {"period_type": period_type, "value_definition": value_definition, "endpoint": endpoint}
+                )
+
+        if new_sources:
+            logger.info(f"Recording {len(new_sources)} {period_type} category sources of {endpoint}")
+            async with UnitOfWork() as unit_of_work:
+                await unit_of_work.category_source.create_many(new_sources)
+
+    def plan(
+        self,
+        value_definitions: list[str],
+        period_types: dict[FiscalPeriodType, list[str]],
+    ) -> dict[FiscalPeriodType, list[str]]:
+        """
+        Get endpoints to fetch for value definitions
+
+        Args:
+            value_definitions: lowercase value definitions of the requested category
+            period_types: all endpoints by period types the category can come from
+
+        Returns:
+            Endpoints by period type, all of them if any value definition has no known source
+        """
+        sources: dict[FiscalPeriodType, set[str]] = {period_type: set() for period_type in period_types}
+        for value_definition in value_definitions:
+            known = False
+            for period_type in period_types:
+                if endpoints := self._sources.get((period_type, value_definition)):
+                    sources[period_type] |= endpoints
+                    known = True
+
+            if not known:
+                self._full += 1
+                return period_types
+
+        # the order of the endpoints is kept, so plans of the same endpoints are equal
+        planned = {
+            period_type: [endpoint for endpoint in endpoints if endpoint in sources[period_type]]
+            for period_type, endpoints in period_types.items()
+        }
+        planned = {period_type: endpoints for period_type, endpoints in planned.items() if endpoints}
+        if not planned:
+            self._full += 1
+            return period_types
+
+        self._planned += 1
+        self._skipped_endpoints += sum(map(len, period_types.values())) - sum(map(len, planned.values()))
+        return planned
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "sources": sum(len(endpoints) for endpoints in self._sources.values()),
+            "planned": self._planned,
+            "full": self._full,
+            "skipped_endpoints": self._skipped_endpoints,
+        }
+
+
+fetch_planner = FetchPlanner()
@@ -1,45 +1,232 @@
 import asyncio
+import hashlib
+import json
+import os
+import socket
+from datetime import date, datetime, timedelta
 from math import ceil
-from typing import Any
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Sequence
 from uuid import UUID, uuid4
 
-import aiohttp
-from aiohttp import ClientResponseError
+from aiohttp import ClientError, ClientResponseError, ClientTimeout
 from fastapi import HTTPException
 from loguru import logger
 from starlette import status
 
 from app.core.config import settings
+from app.core.fmp_client import fmp_client
+from app.core.statement_cache import statement_cache
 from app.enums.base import RequestMethod
 from app.enums.category import CategoryDefinitionType
 from app.enums.fiscal_period import FiscalPeriod, FiscalPeriodType
+from app.enums.fmp import FMPEndpointFamily, NegativeResultScope
+from app.enums.job import JobType, WorkUnitStatus
 from app.models.company import CompanyV2
 from app.schemas.financial_statement import FinancialStatementRequest, FinancialStatementsRequest
+from app.services.category_registry import category_registry
+from app.services.fetch_planner import fetch_planner
+from app.services.job import JobRunner
+from app.services.negative_cache import negative_cache
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.statement_loader import StatementKey, get_statement_values, statement_loader
+from app.utils.columnar import extract_statements_columnar
+from app.utils.executor import ExtractionExecutor
+from app.utils.pipeline import Pipeline
+from app.utils.rate_limiter import parse_retry_after
 from app.utils.unitofwork import ABCUnitOfWork, UnitOfWork
-from app.utils.utils import parse_financial_statement_key, synchronized_request, transform_category
+from app.utils.utils import (
+    iter_csv_rows,
+    parse_financial_statement_key,
+    synchronized_request,
+    transform_category,
+)
 
+# (key, company, period type) of the statements to update
+StatementsItem = tuple[Any, CompanyV2, FiscalPeriodType]
+
+
+class CompanyNotFoundError(HTTPException):
+    """The company profile lookup found no company for the ticker, unlike any other 404 of FMP"""
+
+    def __init__(self, ticker: str) -> None:
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=f"Company not found for stock ticker {ticker}")
 
-class FMPService:
-    api_url = "https://financialmodelingprep.com/api"
 
-    semaphore = asyncio.Semaphore(25)
+class FMPService:
+    api_url = settings.FMP_API_URL
+
+    not_value_keys = {
+        "date",
+        "symbol",
+        "reportedCurrency",
+        "cik",
+        "fillingDate",
+        "acceptedDate",
+        "calendarYear",
+        "period",
+        "link",
+        "finalLink",
+        "label",
+        "recordDate",
+        "paymentDate",
+        "declarationDate",
+    }
+    bulk_statements = [
+        "income-statement-bulk",
+        "balance-sheet-statement-bulk",
+        "cash-flow-statement-bulk",
+        "income-statement-growth-bulk",
+        "balance-sheet-statement-growth-bulk",
+        "cash-flow-statement-growth-bulk",
+        "key-metrics-bulk",
+        "ratios-bulk",
+    ]
+
+    statement_endpoints = {
+        FiscalPeriodType.LATEST: ["discounted-cash-flow", "price-target-consensus"],
+        FiscalPeriodType.TTM: ["key-metrics-ttm", "ratios-ttm"],
+        FiscalPeriodType.HISTORICAL: ["historical-price-full/stock_dividend"],
+        FiscalPeriodType.ANNUAL: [
+            "income-statement",
+            "balance-sheet-statement",
+            "cash-flow-statement",
+            "income-statement-growth",
+            "balance-sheet-statement-growth",
+            "cash-flow-statement-growth",
+            "key-metrics",
+            "ratios",
+            "analyst-estimates",
+        ],
+    }
+    statement_endpoints[FiscalPeriodType.QUARTER] = statement_endpoints[FiscalPeriodType.ANNUAL]
+    # period types refreshed on new filings only by the incremental refresh
+    filing_period_types = {FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER}
 
     requests: dict = {}
+    background_tasks: set[asyncio.Task] = set()
     companies_update_task: asyncio.Task | None = None
     financial_statements_update_task: asyncio.Task | None = None
-
-    async def request(self, uri: str, method: RequestMethod = RequestMethod.GET, **kwargs: Any) -> dict:
+    statements_pipeline: Pipeline | None = None
+    extraction_executor = ExtractionExecutor(settings.FMP_EXTRACT_PROCESSES, settings.FMP_EXTRACT_INLINE_THRESHOLD)
+
+    async def request(
+        self, uri: str, method: RequestMethod = RequestMethod.GET, refresh: bool = False, **kwargs: Any
+    ) -> dict:
+        """
+        Send a request to FMP, GET responses are served from and stored in the response cache
+
+        Args:
+            uri: endpoint uri
+            method: request method
+            refresh: skip the cached response, the fresh one replaces it
+            kwargs: request arguments
+
+        Returns:
+            Response data
+        """
         params = kwargs.setdefault("params", {})
         params["apikey"] = settings.FMP_API_KEY
-        async with aiohttp.ClientSession() as session:
+
+        response_cache = fmp_client.response_cache
+        # replay only mode never calls FMP, so it serves the cache even on refresh
+        if response_cache and method == RequestMethod.GET and (not refresh or response_cache.replay_only):
+            cached = await response_cache.get(uri, params)
+            if cached is not None:
+                return cached
+            elif response_cache.replay_only:
+                logger.error(f"{method} {self.api_url}/{uri} - Not cached in replay only mode")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"{uri} is not cached and FMP requests are disabled",
+                )
+
+        family = FMPEndpointFamily.from_uri(uri)
+        retry_policy = fmp_client.retry_policies[family]
+        circuit_breaker = fmp_client.circuit_breakers[family]
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not circuit_breaker.allow():
+                logger.error(f"{method} {self.api_url}/{uri} - FMP {family} endpoints are unavailable")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"FMP {family} endpoints are unavailable",
+                )
+
             try:
-                response = await session.request(method=method, url=f"{self.api_url}/{uri}", **kwargs)
+                result = await self._send(uri, method, **kwargs)
+            except ClientResponseError as e:
+                if e.status >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+
+                if not retry_policy.should_retry(method, attempt, e.status):
+                    logger.error(f"{method} {self.api_url}/{uri} {e.status} - Failed")
+                    raise HTTPException(status_code=e.status, detail=e.message)
+                error = f"{e.status}"
+            except (ClientError, asyncio.TimeoutError) as e:
+                circuit_breaker.record_failure()
+
+                if not retry_policy.should_retry(method, attempt):
+                    logger.error(f"{method} {self.api_url}/{uri} - Failed: {e!r}")
+                    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+                error = repr(e)
+            else:
+                circuit_breaker.record_success()
+                if response_cache and method == RequestMethod.GET:
+                    await response_cache.set(uri, params, result)
+                return result
+
+            delay = retry_policy.get_delay(attempt)
+            logger.warning(f"{method} {self.api_url}/{uri} {error} - Retrying in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def _send(self, uri: str, method: RequestMethod, **kwargs: Any) -> dict:
+        rate_limiter = fmp_client.rate_limiter
+        async with rate_limiter.acquire():
+            async with fmp_client.session.request(method=method, url=f"{self.api_url}/{uri}", **kwargs) as response:
                 await response.read()
-                response.raise_for_status()
+                if response.status == status.HTTP_429_TOO_MANY_REQUESTS:
+                    rate_limiter.throttle(parse_retry_after(response.headers.get("Retry-After")))
+                if not response.ok:
+                    raise ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=await response.text(),
+                        headers=response.headers,
+                    )
+                rate_limiter.recover()
                 return await response.json()
-            except ClientResponseError:
-                logger.error(f"{method} {self.api_url}/{uri} {response.status} - Failed")
-                raise HTTPException(status_code=response.status, detail=await response.text())
+
+    async def stream(self, uri: str, **kwargs: Any) -> AsyncIterator[str]:
+        params = kwargs.setdefault("params", {})
+        params["apikey"] = settings.FMP_API_KEY
+
+        family = FMPEndpointFamily.from_uri(uri)
+        circuit_breaker = fmp_client.circuit_breakers[family]
+        if not circuit_breaker.allow():
+            logger.error(f"GET {self.api_url}/{uri} - FMP {family} endpoints are unavailable")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"FMP {family} endpoints are unavailable",
+            )
+
+        # bulk files take minutes to download, so only bound the time between reads
+        timeout = ClientTimeout(sock_connect=settings.FMP_CONNECT_TIMEOUT, sock_read=settings.FMP_REQUEST_TIMEOUT)
+        async with fmp_client.rate_limiter.acquire():
+            async with fmp_client.session.get(f"{self.api_url}/{uri}", timeout=timeout, **kwargs) as response:
+                if not response.ok:
+                    if response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                        circuit_breaker.record_failure()
+                    logger.error(f"GET {self.api_url}/{uri} {response.status} - Failed")
+                    raise HTTPException(status_code=response.status, detail=await response.text())
+
+                circuit_breaker.record_success()
+                async for line in response.content:
+                    yield line.decode()
 
     @staticmethod
     def _extract_company_data(company: dict) -> dict | None:
@@ -69,23 +256,6 @@ class FMPService:
         period_type: FiscalPeriodType,
         company_id: UUID,
     ) -> tuple[list[dict], list[dict]]:
-        not_value_keys = {
-            "date",
-            "symbol",
-            "reportedCurrency",
-            "cik",
-            "fillingDate",
-            "acceptedDate",
-            "calendarYear",
-            "period",
-            "link",
-            "finalLink",
-            "label",
-            "recordDate",
-            "paymentDate",
-            "declarationDate",
-        }
-
         results = {}
         historical_results = {}
         categories_to_update = []
@@ -124,7 +294,7 @@ class FMPService:
                 }
 
             for k, v in statement.items():
-                if v is None or k in not_value_keys:
+                if v is None or k in FMPService.not_value_keys:
                     continue
 
                 value = round(v, 4)
@@ -160,68 +330,211 @@ class FMPService:
 
         return values, categories_to_update
 
+    async def extract_statements(
+        self, statements: list[dict], period_type: FiscalPeriodType, company_id: UUID
+    ) -> list[dict]:
+        """
+        Extract financial statements rows, in the extraction pool for large payloads
+
+        Args:
+            statements: raw FMP statements
+            period_type: period type of the statements
+            company_id: company id
+
+        Returns:
+            Financial statements rows
+        """
+        category_ids = await category_registry.get_value_definition_ids()
+
+        # only the categories of the payload are sent to the pool
+        keys = {key.lower() for statement in statements for key in statement}
+        payload_category_ids = {key: category_ids[key] for key in keys if key in category_ids}
+
+        size = sum(len(statement) for statement in statements)
+        if settings.FMP_EXTRACT_COLUMNAR:
+            values, new_categories = await self.extraction_executor.run(
+                size,
+                extract_statements_columnar,
+                statements,
+                payload_category_ids,
+                period_type,
+                company_id,
+                self.not_value_keys,
+            )
+        else:
+            values, new_categories = await self.extraction_executor.run(
+                size, self._extract_statements, statements, payload_category_ids, period_type, company_id
+            )
+
+        if new_categories:
+            allocated_ids = await category_registry.allocate(new_categories)
+            for value in values:
+                value["category_id"] = allocated_ids.get(value["category_id"], value["category_id"])
+
+        return values
+
     @staticmethod
-    async def _get_financial_statement(data: FinancialStatementRequest) -> str | float | None:
-        async with UnitOfWork() as unit_of_work:
-            column_keys = CompanyV2.get_column_keys()
-            if key := column_keys.get(data.category):
-                company = await unit_of_work.company_v2.get_one_or_none(ticker=data.ticker)
-                result = getattr(company, key, None)
-            else:
-                financial_statement = await unit_of_work.financial_statement_v2.get_one_or_none(
-                    ticker=data.ticker,
-                    label=data.category,
-                    period=data.period
-                    if data.period_type in (FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER)
-                    else data.period.lower(),
-                )
-                result = financial_statement.value if financial_statement else None
-            logger.info(f"Got financial statement for {data=}")
-            return result
+    def _get_stored_period(data: FinancialStatementRequest) -> str:
+        if data.period_type in (FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER):
+            return data.period
+        return data.period.lower()
+
+    def _get_statement_key(self, data: FinancialStatementRequest) -> StatementKey:
+        return data.ticker, data.category, self._get_stored_period(data)
+
+    def _get_negative_keys(self, data: FinancialStatementRequest) -> list[str]:
+        return negative_cache.get_keys(data.ticker, data.period_type, data.category, self._get_stored_period(data))
+
+    async def _get_financial_statement(self, data: FinancialStatementRequest) -> str | float | None:
+        key = self._get_statement_key(data)
+        result = statement_cache.get(key)
+        if result is None:
+            # coalesced with the lookups of concurrent requests
+            result = await statement_loader.load(key)
+        logger.info(f"Got financial statement for {data=}")
+        return result
+
+    async def _get_financial_statements(
+        self, requests: dict[str, FinancialStatementRequest]
+    ) -> dict[str, str | float | None]:
+        """
+        Get values of many requests
+
+        Args:
+            requests: requests by key
+
+        Returns:
+            Values by key, None for the keys whose lookup failed
+        """
+        results = await asyncio.gather(
+            *[self._get_financial_statement(data) for data in requests.values()], return_exceptions=True
+        )
+
+        values = {}
+        for key, result in zip(requests, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get financial statement for {key}: {result}")
+                result = None
+            values[key] = result
+        return values
+
+    def _prepare_request(self, data: FinancialStatementRequest) -> FinancialStatementRequest:
+        refresh_scheduler.record_access(data.ticker, data.period_type)
+
+        if data.period_type == FiscalPeriodType.TTM and not data.category.endswith("ttm"):
+            data.category = f"{data.category} ttm"
+        return data
+
+    async def _get_update_plan(
+        self, data: FinancialStatementRequest, full_refresh: bool = False
+    ) -> dict[FiscalPeriodType, list[str]]:
+        plan = self.get_fetch_plan(data.period_type)
+        if not full_refresh:
+            # only the endpoints known to return the category are fetched
+            value_definitions = await category_registry.get_value_definitions(data.category)
+            plan = fetch_planner.plan(value_definitions, plan)
+        return plan
+
+    def _merge_plans(
+        self, period_type: FiscalPeriodType, plans: list[dict[FiscalPeriodType, list[str]]]
+    ) -> dict[FiscalPeriodType, list[str]]:
+        endpoints: dict[FiscalPeriodType, set[str]] = {}
+        for plan in plans:
+            for plan_period_type, plan_endpoints in plan.items():
+                endpoints.setdefault(plan_period_type, set()).update(plan_endpoints)
+
+        return {
+            plan_period_type: [endpoint for endpoint in all_endpoints if endpoint in endpoints[plan_period_type]]
+            for plan_period_type, all_endpoints in self.get_fetch_plan(period_type).items()
+            if plan_period_type in endpoints
+        }
 
     async def get_financial_statements(
         self,
         data: FinancialStatementsRequest,
         force_update: bool = False,
         wait_response: bool = False,
+        full_refresh: bool = False,
     ) -> dict[str, str | float | None]:
         logger.info(f"Accepted request with {len(data.keys)} keys: {data.keys}")
 
-        parsed_statements = {}
+        parsed_statements: dict[str, str | float | None] = {key: None for key in data.keys}
 
-        tasks = [self.get_financial_statement_by_key(key, force_update, wait_response) for key in data.keys]
-        for statement in await asyncio.gather(*tasks):
-            parsed_statements.update(statement)
+        # an unparseable key fails the whole request with a 400
+        requests = {key: parse_financial_statement_key(key) for key in parsed_statements}
+        requests = {key: self._prepare_request(request) for key, request in requests.items()}
 
-        logger.info(f"Parsed {len(parsed_statements)} statements: {parsed_statements}")
+        await negative_cache.refresh()
+        if force_update:
+            await negative_cache.discard(
+                [key for request in requests.values() for key in self._get_negative_keys(request)]
+            )
+        else:
+            # misses confirmed by a scrape neither query the database nor scrape again
+            requests = {key: request for key, request in requests.items() if not self._check_negative(request)}
 
-        return parsed_statements
+        if not force_update:
+            parsed_statements.update(await self._get_financial_statements(requests))
+
+        # a scrape per ticker and period type, fetching the endpoints of all its missing categories
+        misses = [key for key in requests if parsed_statements[key] is None]
+        groups: dict[tuple[str, FiscalPeriodType], list[str]] = {}
+        for key in misses:
+            groups.setdefault((requests[key].ticker, requests[key].period_type), []).append(key)
+
+        column_keys = CompanyV2.get_column_keys()
+        updates = []
+        for (ticker, period_type), keys in groups.items():
+            statement_keys = [key for key in keys if requests[key].category not in column_keys]
+            # company columns only need the company, which update_financial_statement creates before returning
+            request = requests[statement_keys[0] if statement_keys else keys[0]]
+            try:
+                plan = self._merge_plans(
+                    period_type, [await self._get_update_plan(requests[key], full_refresh) for key in statement_keys]
+                )
+            except Exception as e:
+                # the keys of the group stay None, like the ones of a failed scrape
+                logger.error(f"Failed to plan the update of {ticker} {period_type}: {e}")
+                continue
+            updates.append(({key: requests[key] for key in keys}, request, plan))
 
-    async def get_financial_statement_by_key(
-        self, key: str, force_update: bool = False, wait_response: bool = False
-    ) -> dict[str, float | None]:
-        data = parse_financial_statement_key(key)
-        try:
-            value = await self.get_financial_statement(data, force_update, wait_response)
-        except HTTPException as e:
-            logger.error(e.detail)
-            value = None
-        except Exception as e:
-            logger.error(str(e))
-            value = None
+        if wait_response:
+            logger.info(f"Updating {len(updates)} financial statements of {len(misses)} keys")
+            results = await asyncio.gather(
+                *[self._update_statements(*update) for update in updates], return_exceptions=True
+            )
+
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(result.detail if isinstance(result, HTTPException) else str(result))
+                else:
+                    parsed_statements.update(result)
+        else:
+            # run bg tasks to calculate values
+            logger.info(f"Creating {len(updates)} financial statements update tasks of {len(misses)} keys")
+            for update in updates:
+                self._create_background_task(self._update_statements(*update))
+
+        logger.info(f"Parsed {len(parsed_statements)} statements: {parsed_statements}")
 
-        return {key: value}
+        return parsed_statements
 
     async def get_financial_statement(
         self,
         data: FinancialStatementRequest,
         force_update: bool = False,
         wait_response: bool = False,
+        full_refresh: bool = False,
     ) -> str | float | None:
         logger.info(f"Accepted {data} request")
+        data = self._prepare_request(data)
 
-        if data.period_type == FiscalPeriodType.TTM and not data.category.endswith("ttm"):
-            data.category = f"{data.category} ttm"
+        await negative_cache.refresh()
+        if force_update:
+            await negative_cache.discard(self._get_negative_keys(data))
+        elif self._check_negative(data):
+            # a miss confirmed by a scrape, neither the database nor FMP has the value
+            return None
 
         if not force_update:
             # gets value from db or None
@@ -233,36 +546,140 @@ class FMPService:
         # we need to check if there are any formula type categories and calculate the value
         # if there are no formula type categories, we need to scrape the data
         value = None
-        key = f"{data.ticker}|{data.period_type}"
+        plan = await self._get_update_plan(data, full_refresh)
+
+        key = self._get_update_key(data.ticker, data.period_type, plan)
         if wait_response:
             logger.info(f"Updating financial statement, {key=}")
-            await self.update_financial_statement(data, key=key)
-            value = await self._get_financial_statement(data)
+            values = await self._update_statements({key: data}, data, plan)
+            value = values[key]
         else:
             # run bg task to calculate value
             logger.info(f"Creating financial statement update task, {key=}")
-            task = asyncio.create_task(self.update_financial_statement(data, key=key))
+            self._create_background_task(self._update_statements({key: data}, data, plan))
 
         return value
 
+    @classmethod
+    def _create_background_task(cls, coroutine: Awaitable[Any]) -> asyncio.Task:
+        # the event loop only keeps weak references to tasks
+        task = asyncio.create_task(coroutine)
+        cls.background_tasks.add(task)
+        task.add_done_callback(cls.background_tasks.discard)
+        return task
+
+    def _check_negative(self, data: FinancialStatementRequest) -> bool:
+        key = negative_cache.check(self._get_negative_keys(data))
+        if key is None:
+            return False
+
+        logger.info(f"Skipping {data}, confirmed missing by {key}")
+        return True
+
+    async def _update_statements(
+        self,
+        requests: dict[str, FinancialStatementRequest],
+        data: FinancialStatementRequest,
+        plan: dict[FiscalPeriodType, list[str]],
+    ) -> dict[str, str | float | None]:
+        """
+        Scrape statements of a ticker and period type, get the values of its requests and confirm the misses
+
+        Args:
+            requests: requests of the ticker and period type by key
+            data: request to scrape for
+            plan: endpoints by period type to fetch
+
+        Returns:
+            Values by key
+        """
+        try:
+            count = await self.update_financial_statement(
+                data, plan, key=self._get_update_key(data.ticker, data.period_type, plan)
+            )
+        except CompanyNotFoundError:
+            await negative_cache.confirm(NegativeResultScope.TICKER, data.ticker, [data.ticker])
+            raise
+
+        values = await self._get_financial_statements(requests)
+
+        # only the request which scraped confirms, the ones which waited for it get no count
+        if count is None:
+            return values
+
+        if count == 0 and plan == self.get_fetch_plan(data.period_type):
+            await negative_cache.confirm(
+                NegativeResultScope.PERIOD_TYPE, data.ticker, [f"{data.ticker}|{data.period_type}"]
+            )
+            return values
+
+        column_keys = CompanyV2.get_column_keys()
+        missing = {
+            key: self._get_statement_key(requests[key])
+            for key, value in values.items()
+            if value is None and requests[key].category not in column_keys
+        }
+        # the cached misses may predate the scrape, a miss is only confirmed by the database itself
+        found = await get_statement_values(list(set(missing.values())), use_filter=False)
+        for key, statement_key in missing.items():
+            if statement_key in found:
+                values[key] = found[statement_key]
+
+        await negative_cache.confirm(
+            NegativeResultScope.STATEMENT,
+            data.ticker,
+            [
+                self._get_negative_keys(requests[key])[-1]
+                for key, statement_key in missing.items()
+                if statement_key not in found
+            ],
+        )
+        return values
+
+    @staticmethod
+    def _get_update_key(ticker: str, period_type: FiscalPeriodType, plan: dict[FiscalPeriodType, list[str]]) -> str:
+        # updates planning the same endpoints share one scrape
+        endpoints = ";".join(f"{period_type}:{','.join(endpoints)}" for period_type, endpoints in plan.items())
+        return f"{ticker}|{period_type}|{endpoints}"
+
+    async def refresh_statements(self, ticker: str, period_type: FiscalPeriodType) -> None:
+        async with UnitOfWork() as unit_of_work:
+            company = await unit_of_work.company_v2.get_one_or_none(ticker=ticker)
+        if not company:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Company not found for stock ticker {ticker}",
+            )
+
+        await self._invalidate_cached_statements([company], [period_type])
+
+        plan = self.get_fetch_plan(period_type)
+        await self._refresh_statements(company, plan, key=self._get_update_key(ticker, period_type, plan))
+
+    @synchronized_request
+    async def _refresh_statements(self, company: CompanyV2, plan: dict[FiscalPeriodType, list[str]]) -> None:
+        async with UnitOfWork() as unit_of_work:
+            await self.add_statement(unit_of_work, company=company, plan=plan)
+
     @synchronized_request
-    async def update_financial_statement(self, data: FinancialStatementRequest) -> None:
+    async def update_financial_statement(
+        self, data: FinancialStatementRequest, plan: dict[FiscalPeriodType, list[str]] | None = None
+    ) -> int | None:
         async with UnitOfWork() as unit_of_work:
             company = await self.update_company_if_not_exists(unit_of_work, data.ticker)
             if not company:
                 logger.error(f"Company not found for stock ticker {data.ticker}")
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Company not found for stock ticker {data.ticker}",
-                )
+                raise CompanyNotFoundError(data.ticker)
             elif data.category in CompanyV2.get_column_keys():
-                return
+                return None
 
             logger.info(f"Scraping data for {data.ticker} {data.period_type}")
 
-            await self.add_statement(unit_of_work, company=company, period=data.period)
+            # a scrape runs for missing or forced values, which a cached response may predate
+            count = await self.add_statement(unit_of_work, company=company, period=data.period, plan=plan, refresh=True)
 
             logger.info(f"Data scraped for {data.ticker} {data.period_type}")
+            return count
 
     async def update_company_if_not_exists(self, unit_of_work: ABCUnitOfWork, ticker: str) -> CompanyV2 | None:
         company = await unit_of_work.company_v2.get_one_or_none(ticker=ticker)
@@ -287,164 +704,765 @@ class FMPService:
 
         return await unit_of_work.company_v2.create(company_data)
 
-    async def fetch_statements(self, ticker: str, period_type: FiscalPeriodType, year: int | None = None) -> list[dict]:
+    @staticmethod
+    def _get_statement_request(endpoint: str, ticker: str, period_type: FiscalPeriodType) -> tuple[str, dict]:
+        if endpoint == "price-target-consensus":
+            return f"v4/{endpoint}?symbol={ticker}", {}
+        elif period_type in (FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER):
+            return f"v3/{endpoint}/{ticker}", {"period": period_type}
+        return f"v3/{endpoint}/{ticker}", {}
+
+    async def fetch_statements(
+        self,
+        ticker: str,
+        period_type: FiscalPeriodType,
+        year: int | None = None,
+        endpoints: list[str] | None = None,
+        refresh: bool = False,
+    ) -> list[dict]:
+        """
+        Fetch raw statements of a company
+
+        Args:
+            ticker: company ticker
+            period_type: period type of the statements
+            year: unused
+            endpoints: endpoints to fetch, all endpoints of the period type by default
+            refresh: skip cached responses
+
+        Returns:
+            Statements of all endpoints
+        """
         # limit = datetime.now(UTC).year - year + 1 if year else 100
         # if period.type == FiscalPeriodType.QUARTER:
         #     limit *= 4
 
-        if period_type == FiscalPeriodType.LATEST:
-            tasks = [
-                self.request(statement)
-                for statement in [f"v3/discounted-cash-flow/{ticker}", f"v4/price-target-consensus?symbol={ticker}"]
-            ]
-        elif period_type == FiscalPeriodType.TTM:
-            tasks = [self.request(f"v3/{statement}/{ticker}") for statement in ["key-metrics-ttm", "ratios-ttm"]]
-        elif period_type == FiscalPeriodType.HISTORICAL:
-            tasks = [
-                self.request(f"v3/{statement}/{ticker}")
-                for statement in [
-                    "historical-price-full/stock_dividend",
-                ]
-            ]
-        else:
-            params = {"period": period_type}
-
-            tasks = [
-                self.request(f"v3/{statement}/{ticker}", params=params)
-                for statement in [
-                    "income-statement",
-                    "balance-sheet-statement",
-                    "cash-flow-statement",
-                    "income-statement-growth",
-                    "balance-sheet-statement-growth",
-                    "cash-flow-statement-growth",
-                    "key-metrics",
-                    "ratios",
-                    "analyst-estimates",
-                ]
-            ]
-
-        results = await asyncio.gather(*tasks)
-        if period_type == FiscalPeriodType.HISTORICAL:
-            results = [result.get("historical") for result in results]
-        results = list(filter(None, results))
+        endpoints = endpoints or self.statement_endpoints[period_type]
+
+        async def fetch(endpoint: str) -> list[dict]:
+            uri, params = self._get_statement_request(endpoint, ticker, period_type)
+            result = await self.request(uri, params=params, refresh=refresh)
+            if period_type == FiscalPeriodType.HISTORICAL:
+                result = result.get("historical")
+            result = result or []
+
+            await fetch_planner.record(
+                period_type,
+                endpoint,
+                {
+                    key.lower()
+                    for statement in result
+                    for key, value in statement.items()
+                    if value is not None and key not in self.not_value_keys
+                },
+            )
+            return result
 
+        results = await asyncio.gather(*[fetch(endpoint) for endpoint in endpoints])
         return [statement for result in results for statement in result]
 
-    async def add_statement(self, unit_of_work: ABCUnitOfWork, company: CompanyV2, period: str | None = None) -> None:
-        if period:
-            fiscal_period = period.split()[0]
-            period_type = FiscalPeriod(fiscal_period).type
-        else:
-            period_type = FiscalPeriodType.LATEST
-
-        categories = await unit_of_work.category.get_multi()
-
-        category_ids = {}
-        for category in categories:
-            category_ids.setdefault(category.value_definition.lower(), []).append(category.id)
-
-        raw_statements = await self.fetch_statements(company.ticker, period_type)
-
-        statements, categories_to_update = self._extract_statements(
-            raw_statements, category_ids, period_type, company.id
-        )
-        if period_type == FiscalPeriodType.ANNUAL:
-            raw_historical_statements = await self.fetch_statements(company.ticker, FiscalPeriodType.HISTORICAL)
-            historical_statements, historical_categories_to_update = self._extract_statements(
-                raw_historical_statements, category_ids, FiscalPeriodType.HISTORICAL, company.id
+    async def add_statement(
+        self,
+        unit_of_work: ABCUnitOfWork,
+        company: CompanyV2,
+        period: str | None = None,
+        plan: dict[FiscalPeriodType, list[str]] | None = None,
+        refresh: bool = False,
+    ) -> int:
+        """
+        Scrape and save statements of a company
+
+        Args:
+            unit_of_work: unit of work
+            company: company
+            period: requested period, latest by default
+            plan: endpoints by period type to fetch, all endpoints of the period by default
+            refresh: skip cached responses
+
+        Returns:
+            Number of scraped statements
+        """
+        period_type = FiscalPeriod(period.split()[0]).type if period else FiscalPeriodType.LATEST
+
+        statements = []
+        for plan_period_type, endpoints in (plan or self.get_fetch_plan(period_type)).items():
+            raw_statements = await self.fetch_statements(
+                company.ticker, plan_period_type, endpoints=endpoints, refresh=refresh
             )
-            statements.extend(historical_statements)
-            categories_to_update.extend(historical_categories_to_update)
+            statements.extend(await self.extract_statements(raw_statements, plan_period_type, company.id))
 
         logger.info(
             f"Saving financial statements for company with ticker {company.ticker} "
             f"and {len(statements)} financial statements"
         )
-        if categories_to_update:
-            await unit_of_work.category.create_many(categories_to_update)
         await unit_of_work.financial_statement_v2.create_many(statements)
+        return len(statements)
+
+    def get_fetch_plan(self, period_type: FiscalPeriodType) -> dict[FiscalPeriodType, list[str]]:
+        plan = {period_type: self.statement_endpoints[period_type]}
+        if period_type == FiscalPeriodType.ANNUAL:
+            # annual values can also come from the dividends history
+            plan[FiscalPeriodType.HISTORICAL] = self.statement_endpoints[FiscalPeriodType.HISTORICAL]
+        return plan
+
+    @staticmethod
+    def _get_stock_list_fingerprint(company: dict) -> str:
+        # the price changes every day, only the listing data is relevant for the diff
+        data = {key: company.get(key) for key in ("name", "exchange", "exchangeShortName", "type")}
+        return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
-    async def add_companies(self, force_update: bool = False) -> None:
+    async def add_companies(self, force_update: bool = False, job: JobRunner | None = None) -> None:
         companies = await self.request("v3/stock/list")
         if not companies:
             return
 
+        fingerprints = {
+            company["symbol"]: self._get_stock_list_fingerprint(company)
+            for company in companies
+            if company.get("symbol")
+        }
+
         async with UnitOfWork() as unit_of_work:
-            tickers = set(company["symbol"] for company in companies)
-            if not force_update:
-                tickers -= set(await unit_of_work.company_v2.get_tickers())
+            stored_fingerprints = await unit_of_work.stock_list.get_fingerprints()
+            previous_fingerprints = stored_fingerprints
+            if not stored_fingerprints and not force_update:
+                # first sync, consider existing companies unchanged
+                previous_fingerprints = {
+                    ticker: fingerprints[ticker]
+                    for ticker in await unit_of_work.company_v2.get_tickers()
+                    if ticker in fingerprints
+                }
 
-        tasks = [self.request(f"v3/profile/{ticker}") for ticker in tickers]
-        for i in range(0, len(tasks), 100):
-            async with UnitOfWork() as unit_of_work:
-                try:
-                    results = await asyncio.gather(*tasks[i : i + 100])
-                    companies_data = [
-                        data
-                        for company in results
-                        if company and (data := self._extract_company_data(company[0])) is not None
-                    ]
+        added = fingerprints.keys() - previous_fingerprints.keys()
+        removed = previous_fingerprints.keys() - fingerprints.keys()
+        changed = {
+            ticker
+            for ticker in fingerprints.keys() & previous_fingerprints.keys()
+            if fingerprints[ticker] != previous_fingerprints[ticker]
+        }
+        tickers = sorted(set(fingerprints) if force_update else added | changed)
 
-                    logger.info(f"Get {len(companies_data)} companies data")
+        logger.info(
+            f"Stock list has {len(added)} added, {len(removed)} removed and {len(changed)} changed symbols, "
+            f"updating {len(tickers)} companies"
+        )
 
-                    if companies_data:
-                        await unit_of_work.company_v2.create_many(companies_data)
+        updated_tickers = set()
+        if job and job.cursor:
+            # the profiles up to the cursor were processed before the job was interrupted, the failed ones are
+            # left out of the stock list so the next sync retries them
+            failed_tickers = set(job.stats.get("failed_tickers", []))
+            updated_tickers = {ticker for ticker in tickers if ticker <= job.cursor and ticker not in failed_tickers}
+            tickers = [ticker for ticker in tickers if ticker > job.cursor]
+
+        updated_tickers |= await self.update_company_profiles(tickers, job=job)
 
-                    logger.info(f"Finished updating {i + 100} companies")
-                except Exception as e:
-                    logger.error(f"Error while updating companies: {e}")
+        async with UnitOfWork() as unit_of_work:
+            if removed:
+                await unit_of_work.company_v2.update(
+                    {"delisted_at": datetime.utcnow()}, ticker__in=list(removed), delisted_at=None
+                )
+                await unit_of_work.stock_list.delete(symbol__in=list(removed))
+
+            # symbols of failed batches are left out, so they are retried on the next sync
+            symbols = updated_tickers | (previous_fingerprints.keys() - stored_fingerprints.keys())
+            await unit_of_work.stock_list.create_many(
+                [
+                    {"symbol": symbol, "fingerprint": fingerprints[symbol], "updated_at": datetime.utcnow()}
+                    for symbol in sorted(symbols)
+                ]
+            )
 
         logger.info("Finished updating companies")
 
-    async def add_statements(self, periods: list[FiscalPeriodType], force_update: bool = False) -> None:
+    async def update_company_profiles(self, tickers: list[str], job: JobRunner | None = None) -> set[str]:
+        semaphore = asyncio.Semaphore(settings.FMP_PROFILE_MAX_IN_FLIGHT)
+        updated_tickers = set()
+
+        batch_size = settings.FMP_PROFILE_BATCH_SIZE
+        batches = [tickers[i : i + batch_size] for i in range(0, len(tickers), batch_size)]
+        if job:
+            job.track([batch[-1] for batch in batches])
+
+        async def update_batch(index: int, batch: list[str]) -> None:
+            error = None
+            try:
+                # FMP accepts comma separated symbols and returns one profile per known symbol
+                companies = await self.request(f"v3/profile/{','.join(batch)}")
+                companies_data = [
+                    data for company in companies or [] if (data := self._extract_company_data(company)) is not None
+                ]
+
+                logger.info(f"Get {len(companies_data)} companies data")
+
+                if companies_data:
+                    async with UnitOfWork() as unit_of_work:
+                        await unit_of_work.company_v2.create_many(companies_data)
+                updated_tickers.update(batch)
+            except Exception as e:
+                error = f"Error while updating companies {batch[0]}-{batch[-1]}: {e}"
+                logger.error(error)
+                if job:
+                    # checkpointed with the cursor, a resumed job doesn't take them for updated
+                    job.stats["failed_tickers"] = [*job.stats.get("failed_tickers", []), *batch]
+            finally:
+                semaphore.release()
+
+            if job:
+                job.complete(index, error)
+
+        tasks = set()
+        try:
+            for index, batch in enumerate(batches):
+                # bounds the number of batches in flight and the memory they hold
+                await semaphore.acquire()
+                task = asyncio.create_task(update_batch(index, batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+                logger.info(f"Started updating {index * batch_size + len(batch)} companies")
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return updated_tickers
+
+    @staticmethod
+    def _get_payload_hash(statements: list[dict]) -> str:
+        return hashlib.sha1(json.dumps(statements, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def _run_statements_pipeline(
+        self,
+        items: Iterable[StatementsItem] | AsyncIterable[StatementsItem],
+        on_complete: Callable[[Any, str | None], Awaitable[None]],
+        on_write: Callable[[ABCUnitOfWork, list[Any]], Awaitable[None]] | None = None,
+        stats: dict[str, int] | None = None,
+        refresh: Callable[[Any], bool] | None = None,
+        on_skip: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> dict[str, int]:
+        """
+        Fetch, extract and write statements of companies and periods
+
+        Payloads equal to the ones the statements were last written from are skipped.
+
+        Args:
+            items: (key, company, period type) items to process
+            on_complete: called with the item key and error once the item is written or failed
+            on_write: called with the item keys in the write transaction
+            stats: counts to add to
+            refresh: whether an item skips cached responses, by item key
+            on_skip: called with the key of an item whose payload is unchanged, which never reaches on_write
+
+        Returns:
+            Number of unchanged payloads and inserted, updated and unchanged statements
+        """
+        stats = stats if stats is not None else {}
+        for name in ("unchanged_payloads", "inserted", "updated", "unchanged"):
+            stats.setdefault(name, 0)
+
+        async with UnitOfWork() as unit_of_work:
+            payload_hashes = await unit_of_work.statement_payload_hash.get_hashes()
+
+        async def complete(key: Any, error: str | None = None) -> None:
+            if error:
+                logger.error(error)
+            await on_complete(key, error)
+
+        async def fetch(item: StatementsItem) -> tuple | None:
+            key, company, period_type = item
+            try:
+                raw_statements = await self.fetch_statements(
+                    company.ticker, period_type, refresh=bool(refresh and refresh(key))
+                )
+            except Exception as e:
+                await complete(key, f"Error while fetching {period_type} statements for company {company.ticker}: {e}")
+                return None
+
+            payload_hash = self._get_payload_hash(raw_statements)
+            if payload_hashes.get((company.id, period_type)) == payload_hash:
+                stats["unchanged_payloads"] += 1
+                error = None
+                if on_skip:
+                    try:
+                        await on_skip(key)
+                    except Exception as e:
+                        error = f"Error while skipping {period_type} statements for company {company.ticker}: {e}"
+                await complete(key, error)
+                return None
+
+            return key, company, period_type, payload_hash, raw_statements
+
+        async def extract(item: tuple) -> tuple[Any, dict, list[dict]] | None:
+            key, company, period_type, payload_hash, raw_statements = item
+            try:
+                values = await self.extract_statements(raw_statements, period_type, company.id)
+            except Exception as e:
+                await complete(
+                    key, f"Error while extracting {period_type} statements for company {company.ticker}: {e}"
+                )
+                return None
+
+            payload = {"company_id": company.id, "period_type": period_type, "hash": payload_hash}
+            return key, payload, values
+
+        async def write(items: list[tuple[Any, dict, list[dict]]]) -> None:
+            statements = {}
+            payloads = []
+            for _, payload, values in items:
+                payloads.append(payload | {"updated_at": datetime.utcnow()})
+                for value in values:
+                    statements[(value["company_id"], value["period"], value["category_id"])] = value
+
+            logger.info(f"Saving {len(statements)} financial statements of {len(items)} companies and periods")
+
+            error = None
+            try:
+                async with UnitOfWork() as unit_of_work:
+                    counts = await unit_of_work.financial_statement_v2.create_many(list(statements.values()))
+                    # the hashes are written with the statements, so a skipped payload is always stored
+                    await unit_of_work.statement_payload_hash.create_many(payloads)
+                    if on_write:
+                        await on_write(unit_of_work, [key for key, _, _ in items])
+            except Exception as e:
+                error = f"Error while saving financial statements: {e}"
+                raise
+            else:
+                for name, count in counts.items():
+                    stats[name] += count
+                for payload in payloads:
+                    payload_hashes[(payload["company_id"], payload["period_type"])] = payload["hash"]
+            finally:
+                for key, _, _ in items:
+                    await complete(key, error)
+
+        FMPService.statements_pipeline = (
+            Pipeline("financial statements", queue_size=settings.FMP_STATEMENTS_QUEUE_SIZE)
+            .add_stage("fetch", fetch, workers=settings.FMP_STATEMENTS_FETCH_WORKERS)
+            .add_stage("extract", extract, workers=settings.FMP_STATEMENTS_EXTRACT_WORKERS)
+            .add_stage(
+                "write",
+                write,
+                workers=settings.FMP_STATEMENTS_WRITE_WORKERS,
+                batch_size=settings.FMP_STATEMENTS_WRITE_BATCH_SIZE,
+                flush_interval=settings.FMP_STATEMENTS_WRITE_FLUSH_INTERVAL,
+            )
+        )
+        await FMPService.statements_pipeline.run(items)
+
+        logger.info(
+            f"Skipped {stats['unchanged_payloads']} unchanged payloads, inserted {stats['inserted']}, "
+            f"updated {stats['updated']} and left {stats['unchanged']} unchanged financial statements"
+        )
+        return stats
+
+    async def get_filed_company_ids(self, companies: Sequence[CompanyV2]) -> set[UUID]:
+        """
+        Get companies which reported a fiscal period newer than their stored statements
+
+        Args:
+            companies: companies to check
+
+        Returns:
+            Ids of companies in the earnings calendar of the last FMP_FILING_CALENDAR_DAYS days
+            with a fiscal period ending after their report date watermark
+        """
+        to_date = date.today()
+        from_date = to_date - timedelta(days=settings.FMP_FILING_CALENDAR_DAYS)
+        calendar = await self.request("v3/earning_calendar", params={"from": str(from_date), "to": str(to_date)})
+
         async with UnitOfWork() as unit_of_work:
-            categories = await unit_of_work.category.get_multi()
+            watermarks = await unit_of_work.financial_statement_v2.get_report_date_watermarks()
+
+        company_ids = {company.ticker: company.id for company in companies}
+        filed_company_ids = set()
+        for filing in calendar or []:
+            company_id = company_ids.get(filing.get("symbol"))
+            # the calendar also lists upcoming reports
+            if not company_id or filing.get("date", "") > str(to_date):
+                continue
 
-            category_ids = {}
-            for category in categories:
-                category_ids.setdefault(category.value_definition.lower(), []).append(category.id)
+            fiscal_date_ending = filing.get("fiscalDateEnding")
+            if not fiscal_date_ending or fiscal_date_ending > watermarks.get(company_id, ""):
+                filed_company_ids.add(company_id)
 
-            if force_update:
-                companies = await unit_of_work.company_v2.get_multi()
+        logger.info(f"Found new filings of {len(filed_company_ids)} companies since {from_date}")
+        return filed_company_ids
+
+    async def add_statements(
+        self,
+        periods: list[FiscalPeriodType],
+        force_update: bool = False,
+        distributed: bool = False,
+        incremental: bool = False,
+        job: JobRunner | None = None,
+    ) -> None:
+        """
+        Update financial statements of companies
+
+        Args:
+            periods: period types to update, all by default
+            force_update: update all listed companies, otherwise only companies without statements
+            distributed: process the companies through the work queue
+            incremental: update annual and quarter statements only of listed companies with new filings,
+                other period types of all listed companies
+            job: job to track the progress in
+        """
+        async with UnitOfWork() as unit_of_work:
+            if force_update or incremental:
+                companies = await unit_of_work.company_v2.get_multi(delisted_at=None)
             else:
                 companies = await unit_of_work.company_v2.get_unfilled_companies()
 
-        periods = periods if periods else FiscalPeriodType.list()
+        periods = [FiscalPeriodType(period_type) for period_type in periods] if periods else FiscalPeriodType.list()
+
+        filed_company_ids = set()
+        if incremental and set(periods) & self.filing_period_types:
+            filed_company_ids = await self.get_filed_company_ids(companies)
+            await self._invalidate_cached_statements(
+                [company for company in companies if company.id in filed_company_ids], self.filing_period_types
+            )
+
+        # a stable order lets an interrupted job continue after its cursor
+        items = sorted(
+            (
+                (company, period_type)
+                for company in companies
+                for period_type in periods
+                if not incremental or period_type not in self.filing_period_types or company.id in filed_company_ids
+            ),
+            key=lambda item: (item[0].ticker, periods.index(item[1])),
+        )
+
+        if distributed and job:
+            await self._add_statements_distributed(items, job)
+            logger.info("Finished updating financial statements")
+            return
+
+        if job and job.cursor:
+            ticker, period_type = job.cursor.split("|")
+            cursor = (ticker, periods.index(FiscalPeriodType(period_type)))
+            items = [item for item in items if (item[0].ticker, periods.index(item[1])) > cursor]
+        if job:
+            job.track([f"{company.ticker}|{period_type}" for company, period_type in items])
+
+        async def complete(index: int, error: str | None) -> None:
+            if job:
+                job.complete(index, error)
+
+        await self._run_statements_pipeline(
+            ((index, company, period_type) for index, (company, period_type) in enumerate(items)),
+            on_complete=complete,
+            stats=job.stats if job else None,
+            refresh=lambda key: force_update,
+        )
+
+        logger.info("Finished updating financial statements")
 
+    async def _invalidate_cached_statements(
+        self, companies: Sequence[CompanyV2], period_types: Iterable[FiscalPeriodType]
+    ) -> None:
+        response_cache = fmp_client.response_cache
+        if not response_cache:
+            return
+
+        # refreshed statements must not be served from responses cached before them
         for company in companies:
-            for period_type in periods:
+            for period_type in period_types:
+                for endpoint in self.statement_endpoints[period_type]:
+                    uri, params = self._get_statement_request(endpoint, company.ticker, period_type)
+                    await response_cache.invalidate(uri, params)
+
+    async def _add_statements_distributed(
+        self, items: list[tuple[CompanyV2, FiscalPeriodType]], job: JobRunner
+    ) -> None:
+        async with UnitOfWork() as unit_of_work:
+            # the unique constraint makes enqueuing idempotent, a resumed job keeps its units
+            await unit_of_work.work_unit.create_many(
+                [
+                    {"job_id": job.job_id, "company_id": company.id, "period_type": period_type}
+                    for company, period_type in items
+                ]
+            )
+
+        logger.info(f"Enqueued {len(items)} financial statements work units of job {job.job_id}")
+
+        # other workers lease units of the same job, this process helps until the queue is drained
+        await self.run_worker(job_id=job.job_id, stats=job.stats)
+
+        while True:
+            async with UnitOfWork() as unit_of_work:
+                counts = await unit_of_work.work_unit.get_counts(job.job_id)
+
+            job.total = sum(counts.values())
+            job.processed = counts[WorkUnitStatus.done] + counts[WorkUnitStatus.dead]
+            job.failed = counts[WorkUnitStatus.dead]
+            if not counts[WorkUnitStatus.pending] and not counts[WorkUnitStatus.leased]:
+                return
+
+            # units leased by other workers, or expired leases left by crashed ones
+            await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
+            await self.run_worker(job_id=job.job_id, stats=job.stats)
+
+    async def run_worker(
+        self, job_id: UUID | None = None, worker_id: str | None = None, stats: dict[str, int] | None = None
+    ) -> None:
+        """
+        Process financial statements work units leased from the queue
+
+        Args:
+            job_id: process units of this job only and return once none can be leased,
+                otherwise process units of any job forever
+            worker_id: id recorded on the leased units
+            stats: write counts to add to
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+        # units of forced updates skip cached responses
+        refresh_ids: set[UUID] = set()
+
+        async def lease() -> AsyncIterator[StatementsItem]:
+            while True:
                 async with UnitOfWork() as unit_of_work:
-                    try:
-                        raw_statements = await self.fetch_statements(company.ticker, period_type)
-                        statements, categories_to_update = self._extract_statements(
-                            raw_statements, category_ids, period_type, company.id
-                        )
-
-                        logger.info(
-                            f"Saving {period_type} financial statements for company with ticker {company.ticker} "
-                            f"and {len(statements)} financial statements"
-                        )
-                        if categories_to_update:
-                            await unit_of_work.category.create_many(categories_to_update)
-                        await unit_of_work.financial_statement_v2.create_many(statements)
-                    except Exception as e:
-                        logger.error(f"Error while updating financial statements for company {company.ticker}: {e}")
+                    units = await unit_of_work.work_unit.lease(
+                        worker_id,
+                        limit=settings.WORK_UNIT_LEASE_SIZE,
+                        visibility_timeout=settings.WORK_UNIT_VISIBILITY_TIMEOUT,
+                        max_attempts=settings.WORK_UNIT_MAX_ATTEMPTS,
+                        job_id=job_id,
+                    )
+                    if not units:
+                        companies = None
+                    else:
+                        companies = await unit_of_work.company_v2.get_multi(id__in=[unit.company_id for unit in units])
+                        jobs = await unit_of_work.job.get_multi(id__in=list({unit.job_id for unit in units}))
+                        forced_job_ids = {job.id for job in jobs if job.params.get("force_update")}
+                        refresh_ids.update(unit.id for unit in units if unit.job_id in forced_job_ids)
+
+                if not units:
+                    if job_id:
+                        return
+                    await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
+                    continue
 
-            logger.info("Finished updating financial statements")
+                companies = {company.id: company for company in companies}
+
+                logger.info(f"Worker {worker_id} leased {len(units)} financial statements work units")
+                for unit in units:
+                    yield unit.id, companies[unit.company_id], FiscalPeriodType(unit.period_type)
+
+        async def mark_done(unit_of_work: ABCUnitOfWork, ids: list[UUID]) -> None:
+            # in the write transaction, so a unit is never done without its statements
+            await unit_of_work.work_unit.complete(ids)
+
+        async def mark_skipped(id: UUID) -> None:
+            # the statements of an unchanged payload are already stored
+            async with UnitOfWork() as unit_of_work:
+                await unit_of_work.work_unit.complete([id])
+
+        async def complete(id: UUID, error: str | None) -> None:
+            refresh_ids.discard(id)
+            if not error:
+                return
+            try:
+                async with UnitOfWork() as unit_of_work:
+                    await unit_of_work.work_unit.fail([id], error, settings.WORK_UNIT_MAX_ATTEMPTS)
+            except Exception as e:
+                # the lease expires and the unit is retried anyway
+                logger.error(f"Failed to release work unit {id}: {e}")
+
+        await self._run_statements_pipeline(
+            lease(),
+            on_complete=complete,
+            on_write=mark_done,
+            stats=stats,
+            refresh=lambda id: id in refresh_ids,
+            on_skip=mark_skipped,
+        )
+
+    @staticmethod
+    def _parse_bulk_row(row: dict[str, str]) -> dict[str, str | float | None]:
+        statement = {}
+        for k, v in row.items():
+            if k in FMPService.not_value_keys:
+                statement[k] = v or None
+                continue
+
+            try:
+                statement[k] = float(v)
+            except (TypeError, ValueError):
+                statement[k] = None
+
+        return statement
 
-    async def start_companies_update(self, force_update: bool = False) -> str:
+    async def add_bulk_statements(
+        self, years: list[int], periods: list[FiscalPeriodType], job: JobRunner | None = None
+    ) -> None:
+        # new categories get provisional ids until they are allocated before every write
+        category_ids = dict(await category_registry.get_value_definition_ids())
+
+        async with UnitOfWork() as unit_of_work:
+            company_ids = await unit_of_work.company_v2.get_ids_by_ticker()
+
+        periods = [
+            FiscalPeriodType(period_type)
+            for period_type in periods or [FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER]
+            if period_type in (FiscalPeriodType.ANNUAL, FiscalPeriodType.QUARTER)
+        ]
+
+        files = [
+            (year, period_type, statement)
+            for year in years
+            for period_type in periods
+            for statement in self.bulk_statements
+        ]
+        keys = [f"{year}|{period_type}|{statement}" for year, period_type, statement in files]
+        if job and job.cursor in keys:
+            position = keys.index(job.cursor) + 1
+            files, keys = files[position:], keys[position:]
+        if job:
+            job.track(keys)
+
+        statements = {}
+        categories_to_update = []
+
+        async def save() -> None:
+            if categories_to_update:
+                allocated_ids = await category_registry.allocate(categories_to_update)
+                for key, ids in category_ids.items():
+                    category_ids[key] = [allocated_ids.get(id, id) for id in ids]
+                for value in statements.values():
+                    value["category_id"] = allocated_ids.get(value["category_id"], value["category_id"])
+
+            logger.info(f"Saving {len(statements)} bulk financial statements")
+            async with UnitOfWork() as unit_of_work:
+                await unit_of_work.financial_statement_v2.create_many(list(statements.values()))
+
+            statements.clear()
+            categories_to_update.clear()
+
+        for index, (year, period_type, statement) in enumerate(files):
+            uri = f"v4/{statement}"
+            logger.info(f"Streaming {uri} for {year} {period_type}")
+
+            error = None
+            try:
+                lines = self.stream(uri, params={"year": year, "period": period_type, "datatype": "csv"})
+                async for row in iter_csv_rows(lines):
+                    company_id = company_ids.get(row.get("symbol"))
+                    if not company_id:
+                        continue
+
+                    values, new_categories = self._extract_statements(
+                        [self._parse_bulk_row(row)], category_ids, period_type, company_id
+                    )
+                    categories_to_update.extend(new_categories)
+                    for value in values:
+                        # the same tag can come from several files, keep one row per conflict key
+                        statements[(value["company_id"], value["period"], value["category_id"])] = value
+
+                    if len(statements) >= settings.FMP_BULK_WRITE_BATCH_SIZE:
+                        await save()
+
+                if job and (statements or categories_to_update):
+                    # the checkpoint only covers written rows
+                    await save()
+            except Exception as e:
+                error = f"Error while updating bulk financial statements from {uri} for {year} {period_type}: {e}"
+                logger.error(error)
+
+            if job:
+                job.complete(index, error)
+
+        if statements or categories_to_update:
+            await save()
+
+        logger.info("Finished updating bulk financial statements")
+
+    async def run_job(self, job: JobRunner) -> None:
+        async with job:
+            if job.type == JobType.companies_update:
+                await self.add_companies(job=job, **job.params)
+            elif job.type == JobType.financial_statements_update:
+                await self.add_statements(job=job, **job.params)
+            elif job.type == JobType.bulk_financial_statements_update:
+                await self.add_bulk_statements(job=job, **job.params)
+
+    async def claim_stale_jobs(self) -> None:
+        """Resume the jobs interrupted in any process every JOB_CLAIM_INTERVAL seconds"""
+        while True:
+            try:
+                await self.resume_jobs()
+            except Exception as e:
+                logger.error(f"Failed to claim stale jobs: {e}")
+            await asyncio.sleep(settings.JOB_CLAIM_INTERVAL)
+
+    async def release_jobs(self) -> None:
+        """Stop the jobs of this process on shutdown, leaving them to the next one"""
+        for job in list(JobRunner.active):
+            job.release()
+
+        tasks = [
+            task
+            for task in (FMPService.companies_update_task, FMPService.financial_statements_update_task)
+            if task and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def resume_jobs(self) -> None:
+        for job in await JobRunner.claim_stale():
+            task = asyncio.create_task(self.run_job(job))
+            if job.type == JobType.companies_update:
+                FMPService.companies_update_task = task
+            else:
+                FMPService.financial_statements_update_task = task
+
+    async def start_companies_update(self, force_update: bool = False, resume: bool = True) -> str:
         if FMPService.companies_update_task and not FMPService.companies_update_task.done():
             return "Companies data is being updated"
 
-        FMPService.companies_update_task = asyncio.create_task(self.add_companies(force_update))
+        job = await JobRunner.start(JobType.companies_update, {"force_update": force_update}, resume)
+        if not job:
+            return "Companies data is being updated"
+
+        FMPService.companies_update_task = asyncio.create_task(self.run_job(job))
         return "Company data has started to be updated"
 
     async def start_financial_statements_update(
-        self, periods: list[FiscalPeriodType], force_update: bool = False
+        self,
+        periods: list[FiscalPeriodType],
+        force_update: bool = False,
+        distributed: bool = False,
+        incremental: bool = False,
+        resume: bool = True,
     ) -> str:
         if FMPService.financial_statements_update_task and not FMPService.financial_statements_update_task.done():
             return "Financial statements data is being updated"
 
-        FMPService.financial_statements_update_task = asyncio.create_task(self.add_statements(periods, force_update))
+        job = await JobRunner.start(
+            JobType.financial_statements_update,
+            {"periods": periods, "force_update": force_update, "distributed": distributed, "incremental": incremental},
+            resume,
+        )
+        if not job:
+            return "Financial statements data is being updated"
+
+        FMPService.financial_statements_update_task = asyncio.create_task(self.run_job(job))
         return "Financial statements data has started to be updated"
+
+    async def start_bulk_financial_statements_update(
+        self, years: list[int], periods: list[FiscalPeriodType], resume: bool = True
+    ) -> str:
+        if FMPService.financial_statements_update_task and not FMPService.financial_statements_update_task.done():
+            return "Financial statements data is being updated"
+
+        job = await JobRunner.start(
+            JobType.bulk_financial_statements_update, {"years": years, "periods": periods}, resume
+        )
+        if not job:
+            return "Financial statements data is being updated"
+
+        FMPService.financial_statements_update_task = asyncio.create_task(self.run_job(job))
+        return "Bulk financial statements data has started to be updated"
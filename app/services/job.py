@@ -0,0 +1,196 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import settings
+from app.enums.job import JobStatus, JobType
+from app.models.job import Job
+from app.utils.unitofwork import UnitOfWork
+
+
+class JobRunner:
+    """
+    Persists the progress of a long-running job.
+
+    Items can complete out of order, so the cursor only moves up to the last item
+    before which everything is processed; a resumed job skips the items up to the cursor.
+    Progress is committed together with a heartbeat, which tells other processes the job is alive.
+    A job released on shutdown keeps running with an expired heartbeat, so the next process claims it at once.
+    """
+
+    # runners of this process
+    active: set["JobRunner"] = set()
+
+    def __init__(self, job: Job) -> None:
+        self.job_id = job.id
+        self.type = job.type
+        self.params = job.params
+        self.cursor = job.cursor
+        self.total = job.total
+        self.processed = job.processed
+        self.failed = job.failed
+        self.errors = list(job.errors or [])
+        self.stats = dict(job.stats or {})
+
+        self._keys: list[str] = []
+        self._done: set[int] = set()
+        self._position = 0
+        self._heartbeat_task: asyncio.Task | None = None
+        self._released = False
+
+    @classmethod
+    async def start(cls, type: JobType, params: dict[str, Any], resume: bool = True) -> "JobRunner | None":
+        now = datetime.utcnow()
+        async with UnitOfWork() as unit_of_work:
+            job = await unit_of_work.job.get_latest(type)
+            if job and job.status == JobStatus.running and not cls.is_stale(job):
+                logger.info(f"Job {job.id} of type {type} is already running")
+                return None
+
+            if resume and job and job.status != JobStatus.completed and job.params == params:
+                logger.info(f"Resuming job {job.id} of type {type} from {job.cursor}")
+                job = await unit_of_work.job.update(
+                    {
+                        "status": JobStatus.running,
+                        "resumed_at": now,
+                        "resumed_processed": job.processed,
+                        "heartbeat_at": now,
+                        "finished_at": None,
+                    },
+                    return_object=True,
+                    id=job.id,
+                )
+            else:
+                job = await unit_of_work.job.create({"type": type, "status": JobStatus.running, "params": params})
+                logger.info(f"Started job {job.id} of type {type}")
+
+        return cls(job)
+
+    @staticmethod
+    def is_stale(job: Job) -> bool:
+        return job.heartbeat_at < datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_TIMEOUT)
+
+    @staticmethod
+    async def claim_stale() -> list["JobRunner"]:
+        async with UnitOfWork() as unit_of_work:
+            stale_before = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_TIMEOUT)
+            jobs = await unit_of_work.job.claim_stale(stale_before)
+
+        for job in jobs:
+            logger.info(f"Claimed stale job {job.id} of type {job.type} at {job.cursor}")
+
+        return [JobRunner(job) for job in jobs]
+
+    def release(self) -> None:
+        """Leave the job to the next process once cancelled, instead of marking it cancelled"""
+        self._released = True
+
+    async def __aenter__(self) -> "JobRunner":
+        JobRunner.active.add(self)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        JobRunner.active.discard(self)
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+
+        if self._released and exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            logger.info(f"Job {self.job_id} of type {self.type} is released at {self.cursor}")
+            await self.save(heartbeat_at=datetime.utcfromtimestamp(0))
+            return
+
+        if exc_type is None:
+            status = JobStatus.completed
+        elif issubclass(exc_type, asyncio.CancelledError):
+            status = JobStatus.cancelled
+        else:
+            status = JobStatus.failed
+            self.add_error(repr(exc))
+
+        logger.info(f"Job {self.job_id} of type {self.type} is {status}")
+        await self.save(status=status, finished_at=datetime.utcnow())
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Failed to save job {self.job_id} checkpoint: {e}")
+
+    async def save(self, **values: Any) -> None:
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.job.update(
+                {
+                    "cursor": self.cursor,
+                    "total": self.total,
+                    "processed": self.processed,
+                    "failed": self.failed,
+                    "errors": self.errors,
+                    "stats": self.stats,
+                    "heartbeat_at": datetime.utcnow(),
+                    **values,
+                },
+                id=self.job_id,
+            )
+
+    def track(self, keys: list[str]) -> None:
+        """
+        Set ordered keys of the items left to process
+
+        Args:
+            keys: item keys in processing order, all greater than the current cursor
+        """
+        self._keys = keys
+        self._done = set()
+        self._position = 0
+        self.total = self.processed + len(keys)
+
+    def complete(self, index: int, error: str | None = None) -> None:
+        self.processed += 1
+        if error:
+            self.failed += 1
+            self.add_error(error)
+
+        self._done.add(index)
+        while self._position in self._done:
+            self._done.remove(self._position)
+            self._position += 1
+            self.cursor = self._keys[self._position - 1]
+
+    def add_error(self, error: str) -> None:
+        self.errors = [*self.errors, error][-settings.JOB_MAX_ERRORS :]
+
+    @staticmethod
+    async def get_statuses() -> dict[str, dict[str, Any] | None]:
+        async with UnitOfWork() as unit_of_work:
+            return {type: JobRunner.get_status(await unit_of_work.job.get_latest(type)) for type in JobType}
+
+    @staticmethod
+    def get_status(job: Job | None) -> dict[str, Any] | None:
+        if not job:
+            return None
+
+        elapsed = ((job.heartbeat_at or job.resumed_at) - job.resumed_at).total_seconds()
+        rate = (job.processed - job.resumed_processed) / elapsed if elapsed > 0 else 0.0
+        eta = (job.total - job.processed) / rate if rate and job.status == JobStatus.running else None
+
+        return {
+            "id": str(job.id),
+            "status": job.status if job.status != JobStatus.running or not JobRunner.is_stale(job) else "stale",
+            "params": job.params,
+            "cursor": job.cursor,
+            "total": job.total,
+            "processed": job.processed,
+            "failed": job.failed,
+            "rate": round(rate, 2),
+            "eta": round(eta) if eta is not None else None,
+            "started_at": job.started_at,
+            "heartbeat_at": job.heartbeat_at,
+            "finished_at": job.finished_at,
+            "stats": job.stats,
+            "last_errors": job.errors[-5:],
+        }
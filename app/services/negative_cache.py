@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Iterable
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.shared_cache import shared_cache
+from app.core.statement_cache import subscribe_writes
+from app.enums.fiscal_period import FiscalPeriodType
+from app.enums.fmp import NegativeResultScope
+from app.utils.unitofwork import UnitOfWork
+
+
+class NegativeCache:
+    """
+    Persisted misses confirmed by a scrape, mirrored in memory.
+
+    A ticker unknown to FMP, a period type FMP returns no statements of, or a category missing from the scraped
+    statements of a period is short-circuited until its TTL expires or it's purged, so requests for it
+    neither query the database nor scrape again. Writing a company or its statements deletes its misses in the same
+    transaction and drops them from the mirrors once committed. The mirror is also reloaded every
+    NEGATIVE_CACHE_RELOAD_INTERVAL seconds to pick up the misses and purges of other processes.
+    """
+
+    ttls = {
+        NegativeResultScope.TICKER: settings.NEGATIVE_CACHE_TICKER_TTL,
+        NegativeResultScope.PERIOD_TYPE: settings.NEGATIVE_CACHE_PERIOD_TYPE_TTL,
+        NegativeResultScope.STATEMENT: settings.NEGATIVE_CACHE_STATEMENT_TTL,
+    }
+
+    def __init__(self, reload_interval: float) -> None:
+        self.reload_interval = reload_interval
+
+        self._expirations: dict[str, datetime] = {}
+        self._loaded_at: float | None = None
+
+        self._hits = 0
+        self._confirmed = 0
+        self._purged = 0
+
+    @staticmethod
+    def get_keys(ticker: str, period_type: FiscalPeriodType, category: str, period: str) -> list[str]:
+        return [ticker, f"{ticker}|{period_type}", f"{ticker}|{category}|{period}"]
+
+    async def load(self) -> None:
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.negative_result.delete(expires_at__le=datetime.utcnow())
+            self._expirations = await unit_of_work.negative_result.get_expirations()
+        self._loaded_at = monotonic()
+
+        logger.info(f"Loaded {len(self._expirations)} negative results")
+
+    async def refresh(self) -> None:
+        if self._loaded_at is None or monotonic() - self._loaded_at >= self.reload_interval:
+            await self.load()
+
+    def check(self, keys: list[str]) -> str | None:
+        """
+        Get the first key with a confirmed miss
+
+        Args:
+            keys: keys from the widest to the narrowest scope
+
+        Returns:
+            Key of the miss or None
+        """
+        now = datetime.utcnow()
+        for key in keys:
+            expires_at = self._expirations.get(key)
+            if expires_at is not None and expires_at > now:
+                self._hits += 1
+                return key
+        return None
+
+    async def confirm(self, scope: NegativeResultScope, ticker: str, keys: list[str]) -> None:
+        if not keys:
+            return
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttls[scope])
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.negative_result.create_many(
+                [
+                    {"key": key, "scope": scope, "ticker": ticker, "created_at": now, "expires_at": expires_at}
+                    for key in keys
+                ]
+            )
+
+        for key in keys:
+            self._expirations[key] = expires_at
+        self._confirmed += len(keys)
+        logger.info(f"Confirmed {len(keys)} {scope} negative results of {ticker}")
+
+    async def discard(self, keys: list[str]) -> None:
+        keys = [key for key in keys if key in self._expirations]
+        if not keys:
+            return
+
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.negative_result.delete(key__in=keys)
+
+        for key in keys:
+            self._expirations.pop(key, None)
+
+    def forget(self, tickers: Iterable[str]) -> None:
+        """
+        Drop the misses of written tickers from the mirror, their rows are deleted by the write
+
+        Args:
+            tickers: written tickers
+        """
+        tickers = set(tickers)
+        # keys start with the ticker, see get_keys
+        for key in [key for key in self._expirations if key.split("|", 1)[0] in tickers]:
+            del self._expirations[key]
+
+    async def purge(self, ticker: str | None = None) -> int:
+        async with UnitOfWork() as unit_of_work:
+            if ticker:
+                count = await unit_of_work.negative_result.delete(ticker=ticker)
+            else:
+                count = await unit_of_work.negative_result.delete()
+
+        await self.load()
+        self._purged += count
+        logger.info(f"Purged {count} negative results" + (f" of {ticker}" if ticker else ""))
+        return count
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._expirations),
+            "hits": self._hits,
+            "confirmed": self._confirmed,
+            "purged": self._purged,
+        }
+
+
+negative_cache = NegativeCache(settings.NEGATIVE_CACHE_RELOAD_INTERVAL)
+# writes of this process and of the others
+subscribe_writes(negative_cache.forget)
+shared_cache.subscribe(negative_cache.forget)
@@ -0,0 +1,196 @@
+import asyncio
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from loguru import logger
+
+from app.core.config import settings
+from app.enums.fiscal_period import FiscalPeriodType
+from app.utils.unitofwork import UnitOfWork
+
+
+@dataclass
+class RefreshEntry:
+    ticker: str
+    period_type: FiscalPeriodType
+    # accesses decayed by REFRESH_POPULARITY_HALF_LIFE, as of accessed_at
+    popularity: float = 0.0
+    accessed_at: float = field(default_factory=monotonic)
+    refreshed_at: float = field(default_factory=monotonic)
+    refreshing: bool = False
+    # refreshed_at is the stored write time of the statements instead of the first access
+    seeded: bool = False
+
+    def get_popularity(self, now: float) -> float:
+        return self.popularity * 0.5 ** ((now - self.accessed_at) / settings.REFRESH_POPULARITY_HALF_LIFE)
+
+    def get_score(self, now: float) -> float:
+        return self.get_popularity(now) * (now - self.refreshed_at) / settings.REFRESH_HOT_SLA
+
+    def is_hot(self, now: float) -> bool:
+        return self.get_popularity(now) >= settings.REFRESH_HOT_THRESHOLD
+
+    def is_due(self, now: float) -> bool:
+        return not self.refreshing and self.is_hot(now) and now - self.refreshed_at >= settings.REFRESH_HOT_SLA
+
+
+class RefreshScheduler:
+    """
+    Demand-driven refresh of frequently requested statements.
+
+    Accesses are counted per (ticker, period type) and decay with REFRESH_POPULARITY_HALF_LIFE. Every
+    REFRESH_INTERVAL seconds, hot entries older than REFRESH_HOT_SLA are refreshed in order of popularity
+    times staleness, within REFRESH_MAX_CONCURRENT refreshes and REFRESH_REQUESTS_PER_MINUTE FMP requests.
+    Cold entries are never refreshed and are forgotten once their popularity decays below REFRESH_MIN_POPULARITY.
+    The age of a new entry starts when its payload hash was last written, e.g. by a financial statements job,
+    or at its first access if no hash is stored.
+    """
+
+    def __init__(self, period_types: list[FiscalPeriodType]) -> None:
+        self.period_types = set(period_types)
+
+        self._entries: dict[tuple[str, FiscalPeriodType], RefreshEntry] = {}
+        self._scheduler: AsyncIOScheduler | None = None
+        self._refresh: Callable[[str, FiscalPeriodType], Awaitable[None]] | None = None
+        self._costs: dict[FiscalPeriodType, int] = {}
+        self._semaphore = asyncio.Semaphore(settings.REFRESH_MAX_CONCURRENT)
+
+        self._refreshed = 0
+        self._failed = 0
+        self._over_budget = 0
+
+    def start(
+        self, refresh: Callable[[str, FiscalPeriodType], Awaitable[None]], costs: dict[FiscalPeriodType, int]
+    ) -> None:
+        """
+        Start refreshing on schedule
+
+        Args:
+            refresh: refreshes statements of a ticker and period type
+            costs: FMP requests of a refresh by period type
+        """
+        self._refresh = refresh
+        self._costs = costs
+
+        self._scheduler = AsyncIOScheduler()
+        self._scheduler.add_job(
+            self.tick, "interval", seconds=settings.REFRESH_INTERVAL, max_instances=1, coalesce=True
+        )
+        self._scheduler.start()
+        logger.info(f"Started refresh scheduler of {', '.join(self.period_types)} statements")
+
+    def shutdown(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.shutdown(wait=False)
+            self._scheduler = None
+
+    def record_access(self, ticker: str, period_type: FiscalPeriodType) -> None:
+        if period_type not in self.period_types:
+            return
+
+        now = monotonic()
+        entry = self._entries.get((ticker, period_type))
+        if entry is None:
+            # the first request either finds current data or scrapes it
+            entry = self._entries[(ticker, period_type)] = RefreshEntry(ticker, period_type)
+
+        entry.popularity = entry.get_popularity(now) + 1
+        entry.accessed_at = now
+
+    async def tick(self) -> None:
+        now = monotonic()
+        for key, entry in list(self._entries.items()):
+            if not entry.refreshing and entry.get_popularity(now) < settings.REFRESH_MIN_POPULARITY:
+                del self._entries[key]
+
+        await self._seed()
+        now = monotonic()
+        due = [entry for entry in self._entries.values() if entry.is_due(now)]
+        budget = settings.REFRESH_REQUESTS_PER_MINUTE * settings.REFRESH_INTERVAL / 60
+
+        entries = []
+        for entry in sorted(due, key=lambda entry: entry.get_score(now), reverse=True):
+            cost = self._costs.get(entry.period_type, 1)
+            if cost > budget:
+                break
+            budget -= cost
+            entries.append(entry)
+
+        self._over_budget += len(due) - len(entries)
+        if entries:
+            logger.info(f"Refreshing {len(entries)} of {len(due)} due statements")
+            await asyncio.gather(*[self._refresh_entry(entry) for entry in entries])
+
+    async def _seed(self) -> None:
+        entries = [entry for entry in self._entries.values() if not entry.seeded]
+        if not entries:
+            return
+
+        try:
+            async with UnitOfWork() as unit_of_work:
+                updated_at = await unit_of_work.statement_payload_hash.get_updated_at(
+                    list({entry.ticker for entry in entries})
+                )
+        except Exception as e:
+            # retried on the next tick, until then the entries age from their first access
+            logger.error(f"Error while getting the update times of {len(entries)} statements: {e}")
+            return
+
+        now, utcnow = monotonic(), datetime.utcnow()
+        for entry in entries:
+            entry.seeded = True
+            if (entry.ticker, entry.period_type) in updated_at:
+                age = (utcnow - updated_at[(entry.ticker, entry.period_type)]).total_seconds()
+                entry.refreshed_at = now - max(age, 0.0)
+
+    async def _refresh_entry(self, entry: RefreshEntry) -> None:
+        entry.refreshing = True
+        try:
+            async with self._semaphore:
+                await self._refresh(entry.ticker, entry.period_type)
+        except Exception as e:
+            self._failed += 1
+            logger.error(f"Error while refreshing {entry.period_type} statements of {entry.ticker}: {e}")
+        else:
+            self._refreshed += 1
+        finally:
+            # a failed refresh waits for the next SLA period as well, instead of retrying on every tick
+            entry.refreshed_at = monotonic()
+            entry.seeded = True
+            entry.refreshing = False
+
+    def get_queue(self, limit: int = 100) -> list[dict[str, Any]]:
+        now = monotonic()
+        entries = heapq.nlargest(limit, self._entries.values(), key=lambda entry: entry.get_score(now))
+        return [
+            {
+                "ticker": entry.ticker,
+                "period_type": entry.period_type,
+                "popularity": round(entry.get_popularity(now), 4),
+                "age": round(now - entry.refreshed_at, 2),
+                "score": round(entry.get_score(now), 4),
+                "hot": entry.is_hot(now),
+                "due": entry.is_due(now),
+                "refreshing": entry.refreshing,
+            }
+            for entry in entries
+        ]
+
+    def get_metrics(self) -> dict[str, Any]:
+        now = monotonic()
+        return {
+            "running": self._scheduler is not None,
+            "tracked": len(self._entries),
+            "hot": sum(entry.is_hot(now) for entry in self._entries.values()),
+            "due": sum(entry.is_due(now) for entry in self._entries.values()),
+            "refreshed": self._refreshed,
+            "failed": self._failed,
+            "over_budget": self._over_budget,
+        }
+
+
+refresh_scheduler = RefreshScheduler(settings.REFRESH_PERIOD_TYPES)
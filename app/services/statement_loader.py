@@ -0,0 +1,228 @@
+import asyncio
+from decimal import Decimal
+from time import monotonic
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.shared_cache import NEGATIVE, shared_cache
+from app.core.statement_cache import statement_cache
+from app.core.statement_filter import statement_filter
+from app.models.company import CompanyV2
+from app.services.category_registry import category_registry
+from app.services.company_registry import company_registry
+from app.utils.batch_loader import BatchLoader
+from app.utils.unitofwork import UnitOfWork
+
+# ticker, lowercase category and stored period of a statement
+StatementKey = tuple[str, str, str]
+
+_rebuild_task: asyncio.Task | None = None
+
+
+async def get_companies(tickers: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Get company rows from the shared cache or the database
+
+    Args:
+        tickers: company tickers
+
+    Returns:
+        Columns of the found companies by ticker
+    """
+    cached = await shared_cache.get_many("companies", tickers)
+    companies = {ticker: row for ticker, row in cached.items() if row is not NEGATIVE}
+    missing = [ticker for ticker in tickers if ticker not in companies]
+    if not missing:
+        return companies
+
+    column_keys = CompanyV2.get_column_keys().values()
+    generations = await shared_cache.get_generations(missing)
+    async with UnitOfWork() as unit_of_work:
+        for company in await unit_of_work.company_v2.get_multi(ticker__in=missing):
+            companies[company.ticker] = {key: getattr(company, key) for key in column_keys}
+
+    await shared_cache.set_many(
+        "companies",
+        {ticker: (companies[ticker], ticker) for ticker in missing if ticker in companies},
+        settings.REDIS_CACHE_TTL,
+        generations,
+    )
+    return companies
+
+
+async def load_financial_statements(keys: list[StatementKey]) -> dict[StatementKey, Any]:
+    """
+    Get values of many statements from the shared cache, then from the database in a few queries
+
+    Args:
+        keys: statement keys, categories matching a company column are read from the company
+
+    Returns:
+        Values by key
+    """
+    # found values are cached unless their company is written while they are read
+    version = statement_cache.version
+    column_keys = CompanyV2.get_column_keys()
+    company_keys = [key for key in keys if key[1] in column_keys]
+
+    values: dict[StatementKey, Any] = {}
+
+    if company_keys:
+        companies = await get_companies(list({ticker for ticker, _, _ in company_keys}))
+        for key in company_keys:
+            values[key] = companies.get(key[0], {}).get(column_keys[key[1]])
+
+    # values are resolved by category label, a category change moves to other entries
+    namespace = f"statements:{category_registry.version}"
+    statement_keys = [key for key in keys if key[1] not in column_keys]
+    cached = await shared_cache.get_many(namespace, statement_keys)
+    for key, value in cached.items():
+        values[key] = None if value is NEGATIVE else value
+
+    statement_keys = [key for key in statement_keys if key not in cached]
+    generations = await shared_cache.get_generations(ticker for ticker, _, _ in statement_keys)
+    found = await get_statement_values(statement_keys)
+
+    new_values = {}
+    new_misses = {}
+    for key in statement_keys:
+        if key in found:
+            values[key] = new_values[key] = found[key]
+        else:
+            values[key] = None
+            new_misses[key] = NEGATIVE
+
+    await shared_cache.set_many(
+        namespace, {key: (value, key[0]) for key, value in new_values.items()}, settings.REDIS_CACHE_TTL, generations
+    )
+    await shared_cache.set_many(
+        namespace,
+        {key: (value, key[0]) for key, value in new_misses.items()},
+        settings.REDIS_NEGATIVE_TTL,
+        generations,
+    )
+
+    for key, value in values.items():
+        if value is not None:
+            statement_cache.set(key, value, (key[0],), version)
+
+    logger.info(f"Got {len(keys)} financial statements, {len(cached)} from the shared cache")
+    return values
+
+
+async def get_statement_values(keys: list[StatementKey], use_filter: bool = True) -> dict[StatementKey, Decimal]:
+    """
+    Get values of statement keys by their ids, without joining the companies and categories
+
+    Tickers and labels are resolved to ids by the company and category registries, and the statement filter
+    drops the categories without a row. A label matching several categories resolves to the value of the one
+    with the highest priority.
+
+    Args:
+        keys: statement keys
+        use_filter: skip the categories ruled out by the statement filter, a miss confirmed by the result reads
+            every category
+
+    Returns:
+        Values of the found keys
+    """
+    if not keys:
+        return {}
+
+    use_filter = use_filter and settings.STATEMENT_FILTER_ENABLED
+    if use_filter and statement_filter.needs_rebuild():
+        start_statement_filter_rebuild()
+
+    company_ids = await company_registry.get_ids(list({ticker for ticker, _, _ in keys}))
+
+    candidates: dict[StatementKey, tuple[UUID, list[UUID]]] = {}
+    probed = set()
+    for key in keys:
+        ticker, label, period = key
+        company_id = company_ids.get(ticker)
+        category_ids = await category_registry.get_label_ids(label)
+        if company_id is None or not category_ids:
+            continue
+
+        if use_filter:
+            probed_ids = statement_filter.probe(ticker, company_id, category_ids, period)
+            if probed_ids is not None:
+                probed.add(key)
+                category_ids = probed_ids
+        if category_ids:
+            candidates[key] = (company_id, category_ids)
+
+    if not candidates:
+        return {}
+
+    async with UnitOfWork() as unit_of_work:
+        rows = await unit_of_work.financial_statement_v2.get_values(
+            [
+                (company_id, category_id, key[2])
+                for key, (company_id, category_ids) in candidates.items()
+                for category_id in category_ids
+            ]
+        )
+
+    found = {}
+    for key, (company_id, category_ids) in candidates.items():
+        # category ids are ordered by priority
+        for category_id in category_ids:
+            value = rows.get((company_id, category_id, key[2]))
+            if value is not None:
+                found[key] = value
+                break
+
+    statement_filter.record_false_positives(sum(key in probed and key not in found for key in candidates))
+    return found
+
+
+async def rebuild_statement_filter() -> None:
+    """
+    Build the statement filter from a scan of the stored statement keys
+    """
+    started_at = monotonic()
+    async with UnitOfWork() as unit_of_work:
+        estimated_count = await unit_of_work.financial_statement_v2.get_estimated_count()
+
+        bloom_filter = statement_filter.begin_rebuild(estimated_count)
+        try:
+            async for rows in unit_of_work.financial_statement_v2.iter_keys():
+                # hashing a batch takes a while, the event loop keeps serving requests meanwhile
+                await asyncio.to_thread(bloom_filter.add_many, [statement_filter.get_item(*row) for row in rows])
+        except Exception:
+            statement_filter.abort_rebuild()
+            raise
+
+    statement_filter.finish_rebuild(bloom_filter, monotonic() - started_at)
+
+
+def start_statement_filter_rebuild() -> asyncio.Task:
+    """
+    Rebuild the statement filter in the background, joining a running rebuild
+
+    Returns:
+        Task of the rebuild
+    """
+    global _rebuild_task
+
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(rebuild_statement_filter())
+        _rebuild_task.add_done_callback(_log_rebuild_error)
+    return _rebuild_task
+
+
+def _log_rebuild_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Error while rebuilding the statement filter: {task.exception()}")
+
+
+statement_loader = BatchLoader(
+    "financial statements",
+    load_financial_statements,
+    settings.STATEMENT_LOADER_WINDOW,
+    settings.STATEMENT_LOADER_MAX_BATCH_SIZE,
+)
@@ -0,0 +1,119 @@
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from loguru import logger
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Coalesces loads of keys from concurrent requests into batches.
+
+    Keys requested within the window after the first pending one are deduplicated and loaded by one call
+    of the batch function, whose results are fanned out to every waiter. A batch is dispatched early
+    once it reaches the maximum size. The batch function returns a value or an exception by key,
+    missing keys resolve to None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_load: Callable[[list[K]], Awaitable[dict[K, V | Exception]]],
+        window: float,
+        max_batch_size: int,
+    ) -> None:
+        self.name = name
+        self.batch_load = batch_load
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self._pending: dict[K, asyncio.Future] = {}
+        self._enqueued_at: dict[K, float] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self._loads = 0
+        self._deduplicated = 0
+        self._batches = 0
+        self._keys = 0
+        self._max_size = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._total_latency = 0.0
+
+    async def load(self, key: K) -> V | None:
+        self._loads += 1
+
+        future = self._pending.get(key)
+        if future is not None:
+            self._deduplicated += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            self._enqueued_at[key] = monotonic()
+
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                self._handle = loop.call_later(self.window, self._dispatch)
+
+        # a cancelled waiter must not cancel the load shared with the others
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        batch, self._pending = self._pending, {}
+        enqueued_at, self._enqueued_at = self._enqueued_at, {}
+        if not batch:
+            return
+
+        now = monotonic()
+        self._total_wait += sum(now - started_at for started_at in enqueued_at.values())
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future]) -> None:
+        self._batches += 1
+        self._keys += len(batch)
+        self._max_size = max(self._max_size, len(batch))
+
+        started_at = monotonic()
+        try:
+            results = await self.batch_load(list(batch))
+        except Exception as e:
+            self._failed += 1
+            logger.error(f"Error while loading a batch of {len(batch)} {self.name}: {e}")
+            results = {key: e for key in batch}
+        self._total_latency += monotonic() - started_at
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+
+            result = results.get(key)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "window": self.window,
+            "loads": self._loads,
+            "deduplicated": self._deduplicated,
+            "batches": self._batches,
+            "failed": self._failed,
+            "avg_batch_size": round(self._keys / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size": self._max_size,
+            # time keys wait for their batch to be dispatched, added by the window
+            "avg_wait": round(self._total_wait / self._keys, 4) if self._keys else 0.0,
+            "avg_latency": round(self._total_latency / self._batches, 4) if self._batches else 0.0,
+        }
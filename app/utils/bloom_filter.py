@@ -0,0 +1,68 @@
+import hashlib
+from math import ceil, exp, log
+from typing import Any, Iterable
+
+import numpy as np
+
+MASK = 2**64 - 1
+
+
+class BloomFilter:
+    """
+    Probabilistic set of byte strings, a miss is definite while a hit may be false.
+
+    The bit array is sized for the capacity and false positive rate, capped by the maximum size, and the bit
+    positions of an item come from the two halves of its 128-bit BLAKE2 hash by double hashing. Batches are
+    added with NumPy and can run in a thread while the filter is probed, bits are only ever set.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float, max_size: int | None = None) -> None:
+        self.capacity = max(capacity, 1)
+        self.false_positive_rate = false_positive_rate
+        # bits
+        self.size = max(ceil(-self.capacity * log(false_positive_rate) / log(2) ** 2), 64)
+        if max_size is not None:
+            self.size = min(self.size, max_size * 8)
+        self.hash_count = max(round(self.size / self.capacity * log(2)), 1)
+        self.count = 0
+
+        self._bits = bytearray(ceil(self.size / 8))
+        self._offsets = np.arange(self.hash_count, dtype=np.uint64)
+
+    @staticmethod
+    def _hash(item: bytes) -> bytes:
+        return hashlib.blake2b(item, digest_size=16).digest()
+
+    def add_many(self, items: Iterable[bytes]) -> None:
+        digests = b"".join(map(self._hash, items))
+        if not digests:
+            return
+
+        hashes = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+        # uint64 arithmetic wraps like the masked one of __contains__
+        positions = ((hashes[:, :1] + self._offsets * hashes[:, 1:]) % np.uint64(self.size)).ravel()
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(np.frombuffer(self._bits, dtype=np.uint8), positions >> np.uint64(3), masks)
+        self.count += len(hashes)
+
+    def __contains__(self, item: bytes) -> bool:
+        digest = self._hash(item)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little")
+        for i in range(self.hash_count):
+            position = ((h1 + i * h2) & MASK) % self.size
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def get_false_positive_rate(self) -> float:
+        return (1 - exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "size": len(self._bits),
+            "hash_count": self.hash_count,
+            "false_positive_rate": round(self.get_false_positive_rate(), 6),
+        }
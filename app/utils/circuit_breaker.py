@@ -0,0 +1,78 @@
+from time import monotonic
+from typing import Any
+
+from loguru import logger
+
+from app.enums.base import BaseStrEnum
+
+
+class CircuitState(BaseStrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails fast after consecutive failures of an upstream dependency.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls are rejected
+    for ``recovery_timeout`` seconds. Then a limited number of trial calls is let through (half-open),
+    and the circuit closes again on the first success or reopens on the first failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30, half_open_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN:
+            if monotonic() - self._opened_at < self.recovery_timeout:
+                self._rejected += 1
+                return False
+
+            logger.info(f"Circuit {self.name} is half-open")
+            self.state = CircuitState.HALF_OPEN
+            self._trial_calls = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_calls >= self.half_open_calls:
+                self._rejected += 1
+                return False
+            self._trial_calls += 1
+
+        return True
+
+    def record_success(self) -> None:
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"Circuit {self.name} is closed")
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.warning(f"Circuit {self.name} is open after {self._failures} failures")
+            self.state = CircuitState.OPEN
+            self._opened_at = monotonic()
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "rejected": self._rejected,
+            "retry_in": (
+                round(max(self.recovery_timeout - (monotonic() - self._opened_at), 0.0), 2)
+                if self.state == CircuitState.OPEN
+                else 0.0
+            ),
+        }
@@ -0,0 +1,194 @@
+from typing import Any
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from app.enums.category import CategoryDefinitionType
+from app.enums.fiscal_period import FiscalPeriod, FiscalPeriodType
+from app.utils.utils import transform_category
+
+DIGITS = 4
+
+
+def round_values(values: np.ndarray) -> np.ndarray:
+    """
+    Round values to DIGITS decimals exactly like the built-in round
+
+    NumPy rounds the value scaled by 10**DIGITS, which can move a value close to a tie across it,
+    while the built-in round works on the exact decimal. Such values are rounded one by one.
+    """
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * 10**DIGITS
+        rounded = np.rint(scaled) / 10**DIGITS
+        fallback = (
+            (np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+            | (np.abs(values) >= 2**52 / 10**DIGITS)
+            | ~np.isfinite(values)
+        )
+
+    for i in np.flatnonzero(fallback):
+        rounded[i] = round(float(values[i]), DIGITS)
+    return rounded
+
+
+def _get_bases(statements: list[dict], period_type: FiscalPeriodType, company_id: UUID) -> list[dict]:
+    if period_type in (FiscalPeriodType.LATEST, FiscalPeriodType.TTM):
+        base = {"company_id": company_id, "period": period_type, "report_date": period_type, "filing_date": period_type}
+        return [base] * len(statements)
+
+    dates = [statement["date"] for statement in statements]
+    if period_type == FiscalPeriodType.HISTORICAL:
+        periods = [f"{FiscalPeriod.FY} {year}" for year, _, _ in (date.split("-") for date in dates)]
+    else:
+        periods = [
+            f"{statement['period']} {statement['calendarYear']}" if statement.get("period") else None
+            for statement in statements
+        ]
+        derived = [i for i, period in enumerate(periods) if period is None]
+        if derived and period_type == FiscalPeriodType.ANNUAL:
+            for i in derived:
+                year, _, _ = dates[i].split("-")
+                periods[i] = f"{FiscalPeriod.FY} {year}"
+        elif derived and period_type == FiscalPeriodType.QUARTER:
+            parts = [dates[i].split("-") for i in derived]
+            quarters = np.ceil(np.array([int(month) for _, month, _ in parts]) / 3).astype(int)
+            for i, (year, _, _), quarter in zip(derived, parts, quarters.tolist()):
+                periods[i] = f"{FiscalPeriod('Q' + str(quarter))} {year}"
+        else:
+            for i in derived:
+                periods[i] = f"{statements[i]['period']} {statements[i]['calendarYear']}"
+
+    return [
+        {"company_id": company_id, "period": period, "report_date": date, "filing_date": date}
+        for period, date in zip(periods, dates)
+    ]
+
+
+def extract_statements_columnar(
+    statements: list[dict],
+    category_ids: dict[str, list[UUID]],
+    period_type: FiscalPeriodType,
+    company_id: UUID,
+    not_value_keys: set[str],
+) -> tuple[list[dict], list[dict]]:
+    """
+    Column-wise implementation of FMPService._extract_statements
+
+    The payload is flattened into parallel arrays of statement index, category and value,
+    which are rounded, expanded to the category ids and deduplicated by (period, category id) at once.
+
+    Args:
+        statements: raw FMP statements
+        category_ids: category ids by lowercase value definition, new categories are added to it
+        period_type: period type of the statements
+        company_id: company id
+        not_value_keys: statement keys that are not values
+
+    Returns:
+        Financial statements rows and new categories
+    """
+    bases = _get_bases(statements, period_type, company_id)
+
+    statement_indexes: list[int] = []
+    keys: list[str] = []
+    raw_values: list[Any] = []
+    for i, statement in enumerate(statements):
+        for k, v in statement.items():
+            if v is None or k in not_value_keys:
+                continue
+            if not isinstance(v, (int, float)):
+                raise TypeError(f"type {type(v).__name__} doesn't define __round__ method")
+            statement_indexes.append(i)
+            keys.append(k)
+            raw_values.append(v)
+
+    if not raw_values:
+        return [], []
+
+    # categories, in order of first appearance
+    categories_to_update = []
+    key_codes: dict[str, int] = {}
+    key_category_ids: list[list[UUID]] = []
+    for k in keys:
+        if k in key_codes:
+            continue
+        if not category_ids.get(k.lower()):
+            category_id = uuid4()
+            category_ids[k.lower()] = [category_id]
+            categories_to_update.append(
+                {
+                    "id": category_id,
+                    "label": transform_category(k),
+                    "value_definition": k,
+                    "description": k,
+                    "type": CategoryDefinitionType.api_tag,
+                    "priority": 1,
+                }
+            )
+        key_codes[k] = len(key_codes)
+        key_category_ids.append(category_ids[k.lower()])
+
+    # the same category can be reached from differently cased keys
+    category_codes: dict[UUID, int] = {}
+    flat_category_ids = [category_id for ids in key_category_ids for category_id in ids]
+    flat_category_codes = np.array(
+        [category_codes.setdefault(category_id, len(category_codes)) for category_id in flat_category_ids],
+        dtype=np.int64,
+    )
+    key_sizes = np.array([len(ids) for ids in key_category_ids], dtype=np.int64)
+    key_offsets = np.concatenate(([0], np.cumsum(key_sizes)[:-1]))
+
+    # one row per value and category id
+    codes = np.array([key_codes[k] for k in keys], dtype=np.int64)
+    sizes = key_sizes[codes]
+    value_rows = np.repeat(np.arange(len(codes)), sizes)
+    positions = np.arange(len(value_rows)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    row_category_indexes = key_offsets[codes][value_rows] + positions
+    row_category_codes = flat_category_codes[row_category_indexes]
+
+    is_int = np.array([isinstance(v, int) for v in raw_values])
+    values = round_values(np.array(raw_values, dtype=np.float64))
+
+    row_statements = np.array(statement_indexes, dtype=np.int64)[value_rows]
+    _, row_periods = np.unique(np.array([str(base["period"]) for base in bases], dtype=object), return_inverse=True)
+    groups = row_periods[row_statements] * len(category_codes) + row_category_codes
+
+    _, first_rows, group_indexes, group_sizes = np.unique(
+        groups, return_index=True, return_inverse=True, return_counts=True
+    )
+    order = np.argsort(first_rows, kind="stable")
+
+    def format_value(value_row: int) -> str:
+        return str(int(raw_values[value_row])) if is_int[value_row] else str(values[value_row].item())
+
+    results = []
+    if period_type != FiscalPeriodType.HISTORICAL:
+        # the last value of a (period, category) wins, in the position of the first one
+        last_rows = np.full(len(first_rows), -1, dtype=np.int64)
+        np.maximum.at(last_rows, group_indexes, np.arange(len(groups)))
+        for group in order.tolist():
+            row = int(last_rows[group])
+            results.append(
+                {
+                    "value": format_value(int(value_rows[row])),
+                    "category_id": flat_category_ids[row_category_indexes[row]],
+                }
+                | bases[row_statements[row]]
+            )
+        return results, categories_to_update
+
+    # values of a (period, category) are summed in order, rounding after every addition like the row-wise version
+    rows_by_group = np.argsort(group_indexes, kind="stable")
+    group_starts = np.concatenate(([0], np.cumsum(group_sizes)[:-1]))
+    sums = values[value_rows[rows_by_group[group_starts]]].copy()
+    for step in range(1, int(group_sizes.max())):
+        active = np.flatnonzero(group_sizes > step)
+        sums[active] = round_values(sums[active] + values[value_rows[rows_by_group[group_starts[active] + step]]])
+
+    for group in order.tolist():
+        row = int(first_rows[group])
+        value = format_value(int(value_rows[row])) if group_sizes[group] == 1 else str(sums[group].item())
+        results.append(
+            {"value": value, "category_id": flat_category_ids[row_category_indexes[row]]} | bases[row_statements[row]]
+        )
+    return results, categories_to_update
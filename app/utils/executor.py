@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class ExtractionExecutor:
+    """
+    Runs CPU-bound transformations in a process pool, off the event loop thread.
+
+    Payloads smaller than the inline threshold are transformed in the calling thread,
+    where the cost of pickling them to another process would outweigh the work itself.
+    The pool is started lazily and disabled with zero processes.
+    """
+
+    def __init__(self, processes: int, inline_threshold: int) -> None:
+        self.processes = processes
+        self.inline_threshold = inline_threshold
+
+        self._pool: ProcessPoolExecutor | None = None
+
+        self._inline = 0
+        self._offloaded = 0
+        self._failed = 0
+        self._total_latency = 0.0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawned processes don't inherit the event loop, open connections and threads of the app
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started extraction pool with {self.processes} processes")
+        return self._pool
+
+    async def run(self, size: int, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a transformation
+
+        Args:
+            size: payload size compared with the inline threshold, e.g. number of values
+            func: picklable module level function or static method
+            args: picklable function arguments
+
+        Returns:
+            Result of the function
+        """
+        if not self.processes or size < self.inline_threshold:
+            self._inline += 1
+            return func(*args)
+
+        started_at = monotonic()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+        except Exception:
+            self._failed += 1
+            raise
+
+        self._offloaded += 1
+        self._total_latency += monotonic() - started_at
+        return result
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "inline_threshold": self.inline_threshold,
+            "inline": self._inline,
+            "offloaded": self._offloaded,
+            "failed": self._failed,
+            "avg_latency": round(self._total_latency / self._offloaded, 4) if self._offloaded else 0.0,
+        }
@@ -0,0 +1,156 @@
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
+
+from loguru import logger
+
+_STOP = object()
+
+
+@dataclass
+class StageMetrics:
+    processed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    started_at: float = field(default_factory=monotonic)
+
+    def observe(self, latency: float, count: int = 1) -> None:
+        self.processed += count
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = monotonic() - self.started_at
+        calls = self.processed + self.failed
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "throughput": round(self.processed / elapsed, 2) if elapsed else 0.0,
+            "avg_latency": round(self.total_latency / calls, 4) if calls else 0.0,
+            "max_latency": round(self.max_latency, 4),
+        }
+
+
+@dataclass
+class PipelineStage:
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    # batched stages get a list of up to batch_size items
+    batch_size: int | None = None
+    flush_interval: float = 5
+    metrics: StageMetrics = field(default_factory=StageMetrics)
+    queue: asyncio.Queue | None = None
+
+
+class Pipeline:
+    """
+    Staged producer/consumer pipeline with bounded queues.
+
+    Every stage runs its own workers and reads from a bounded queue, so a slow stage applies backpressure
+    to the previous ones instead of letting items pile up in memory. A handler returning None drops the item,
+    a failing handler is logged and counted without stopping the pipeline.
+    """
+
+    def __init__(self, name: str, queue_size: int = 100) -> None:
+        self.name = name
+        self.queue_size = queue_size
+        self.stages: list[PipelineStage] = []
+
+    def add_stage(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        batch_size: int | None = None,
+        flush_interval: float = 5,
+    ) -> "Pipeline":
+        self.stages.append(
+            PipelineStage(
+                name=name, handler=handler, workers=workers, batch_size=batch_size, flush_interval=flush_interval
+            )
+        )
+        return self
+
+    async def run(self, items: Iterable[Any] | AsyncIterable[Any]) -> None:
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=self.queue_size)
+            stage.metrics = StageMetrics()
+
+        workers = [
+            [asyncio.create_task(self._run_worker(i, stage)) for _ in range(stage.workers)]
+            for i, stage in enumerate(self.stages)
+        ]
+
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await self.stages[0].queue.put(item)
+            else:
+                for item in items:
+                    await self.stages[0].queue.put(item)
+
+            for stage, stage_workers in zip(self.stages, workers):
+                for _ in stage_workers:
+                    await stage.queue.put(_STOP)
+                await asyncio.gather(*stage_workers)
+        finally:
+            for task in (task for stage_workers in workers for task in stage_workers):
+                task.cancel()
+
+    async def _run_worker(self, index: int, stage: PipelineStage) -> None:
+        next_queue = self.stages[index + 1].queue if index + 1 < len(self.stages) else None
+
+        while True:
+            if stage.batch_size:
+                items, stop = await self._get_batch(stage)
+            else:
+                item = await stage.queue.get()
+                items, stop = ([], True) if item is _STOP else ([item], False)
+
+            if items:
+                stage.metrics.in_flight += 1
+                started_at = monotonic()
+                try:
+                    result = await stage.handler(items if stage.batch_size else items[0])
+                except Exception as e:
+                    stage.metrics.failed += len(items)
+                    logger.error(f"Error in {self.name} pipeline {stage.name} stage: {e}")
+                    result = None
+                else:
+                    stage.metrics.observe(monotonic() - started_at, len(items))
+                finally:
+                    stage.metrics.in_flight -= 1
+
+                if result is not None and next_queue is not None:
+                    await next_queue.put(result)
+
+            if stop:
+                return
+
+    @staticmethod
+    async def _get_batch(stage: PipelineStage) -> tuple[list[Any], bool]:
+        items = []
+        deadline = monotonic() + stage.flush_interval
+
+        while len(items) < stage.batch_size:
+            try:
+                item = await asyncio.wait_for(stage.queue.get(), timeout=max(deadline - monotonic(), 0))
+            except asyncio.TimeoutError:
+                break
+
+            if item is _STOP:
+                return items, True
+            items.append(item)
+
+        return items, False
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            stage.name: stage.metrics.to_dict() | {"queue_size": stage.queue.qsize() if stage.queue else 0}
+            for stage in self.stages
+        }
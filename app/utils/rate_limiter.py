@@ -0,0 +1,144 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: header value, either delay in seconds or HTTP date
+
+    Returns:
+        Delay in seconds or None if the value can't be parsed
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket limiter with a concurrency cap.
+
+    Callers are queued in FIFO order instead of being rejected. When the upstream API throttles us,
+    the bucket is paused for the Retry-After delay and the refill rate is halved, then it recovers
+    additively with every successful request.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        max_concurrent: int,
+        burst: int = 1,
+        throttle_delay: float = 60,
+        min_rate_factor: float = 0.1,
+    ) -> None:
+        self.rate = requests_per_minute / 60
+        self.capacity = max(burst, 1)
+        self.throttle_delay = throttle_delay
+        self.min_rate_factor = min_rate_factor
+
+        self._tokens = float(self.capacity)
+        self._updated_at = monotonic()
+        self._paused_until = 0.0
+        self._rate_factor = 1.0
+
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+
+        self._queued = 0
+        self._in_flight = 0
+        self._acquired = 0
+        self._throttled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        started_at = monotonic()
+        self._queued += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                # the lock keeps waiters in arrival order
+                async with self._lock:
+                    await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self._queued -= 1
+
+        wait = monotonic() - started_at
+        self._acquired += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def _take_token(self) -> None:
+        while True:
+            now = monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            rate = self.rate * self._rate_factor
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / rate)
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        delay = retry_after if retry_after is not None else self.throttle_delay
+        logger.warning(f"FMP rate limit hit, pausing requests for {delay}s")
+
+        self._throttled += 1
+        self._paused_until = max(self._paused_until, monotonic() + delay)
+        self._tokens = 0.0
+        self._rate_factor = max(self._rate_factor / 2, self.min_rate_factor)
+
+    def recover(self) -> None:
+        if self._rate_factor < 1.0:
+            self._rate_factor = min(self._rate_factor + 0.01, 1.0)
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "requests_per_minute": round(self.rate * self._rate_factor * 60, 2),
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "acquired": self._acquired,
+            "throttled": self._throttled,
+            "paused_for": round(max(self._paused_until - monotonic(), 0.0), 2),
+            "avg_wait": round(self._total_wait / self._acquired, 4) if self._acquired else 0.0,
+            "max_wait": round(self._max_wait, 4),
+        }
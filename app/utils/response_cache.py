@@ -0,0 +1,214 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from time import monotonic, time
+from typing import Any
+
+from loguru import logger
+
+
+class ResponseCache:
+    """
+    Compressed on-disk cache of raw API responses.
+
+    Entries are keyed by a hash of the URI and request params and expire after a TTL chosen
+    by the longest matching URI prefix. The total size is bounded and the least recently used entries
+    are evicted first. In replay-only mode entries never expire, so derived data can be rebuilt offline.
+
+    The directory is shared by all processes, so they reuse each other's responses. Each process only tracks its
+    own writes, so the size index is rebuilt from a scan of the directory every rescan_interval seconds before
+    evicting, which bounds the size of the whole directory rather than the share of one process.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int,
+        ttls: dict[str, int],
+        default_ttl: int = 0,
+        replay_only: bool = False,
+        excluded_params: tuple[str, ...] = ("apikey",),
+        rescan_interval: float = 60,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        # longest prefixes first, so "key-metrics-ttm" wins over "key-metrics"
+        self.ttls = dict(sorted(ttls.items(), key=lambda item: len(item[0]), reverse=True))
+        self.default_ttl = default_ttl
+        self.replay_only = replay_only
+        self.excluded_params = excluded_params
+        self.rescan_interval = rescan_interval
+
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._scanned_at = 0.0
+        self._lock = asyncio.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._rescans = 0
+
+    def get_ttl(self, uri: str) -> int:
+        # v3/income-statement/AAPL -> income-statement/AAPL
+        path = uri.split("/", 1)[-1]
+        for prefix, ttl in self.ttls.items():
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get_key(self, uri: str, params: dict[str, Any] | None = None) -> str:
+        params = {k: v for k, v in (params or {}).items() if k not in self.excluded_params}
+        return hashlib.sha256(f"{uri}?{json.dumps(params, sort_keys=True, default=str)}".encode()).hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    async def load(self) -> None:
+        async with self._lock:
+            if self._loaded:
+                return
+
+            await self._rescan()
+            self._loaded = True
+
+        logger.info(f"Loaded {len(self._index)} cached responses ({self._size} bytes) from {self.directory}")
+        await self._evict()
+
+    async def _rescan(self) -> None:
+        entries = await asyncio.to_thread(self._scan)
+        self._index = OrderedDict(entries)
+        self._size = sum(self._index.values())
+        self._scanned_at = monotonic()
+        self._rescans += 1
+
+    def _scan(self) -> list[tuple[str, int]]:
+        if not self.directory.exists():
+            return []
+
+        entries = []
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # evicted by another process meanwhile
+                continue
+            entries.append((stat.st_atime, path.name.removesuffix(".json.gz"), stat.st_size))
+
+        # access times are refreshed on every read, so they keep the LRU order across restarts
+        return [(key, size) for _, key, size in sorted(entries)]
+
+    async def get(self, uri: str, params: dict[str, Any] | None = None) -> Any | None:
+        ttl = self.get_ttl(uri)
+        if not ttl and not self.replay_only:
+            return None
+
+        await self.load()
+
+        key = self.get_key(uri, params)
+        if key not in self._index:
+            self._misses += 1
+            return None
+
+        path = self._get_path(key)
+        try:
+            created_at, data = await asyncio.to_thread(self._read, path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read cached response for {uri}: {e!r}")
+            self._drop(key)
+            self._misses += 1
+            return None
+
+        if not self.replay_only and time() - created_at > ttl:
+            self._expired += 1
+            self._misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        self._hits += 1
+        return data
+
+    async def set(self, uri: str, params: dict[str, Any] | None, data: Any) -> None:
+        if not self.get_ttl(uri):
+            return
+
+        await self.load()
+
+        key = self.get_key(uri, params)
+        path = self._get_path(key)
+        try:
+            size = await asyncio.to_thread(self._write, path, data)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {uri}: {e!r}")
+            return
+
+        self._size += size - self._index.pop(key, 0)
+        self._index[key] = size
+        await self._evict()
+
+    async def invalidate(self, uri: str, params: dict[str, Any] | None = None) -> None:
+        await self.load()
+
+        key = self.get_key(uri, params)
+        if key in self._index:
+            self._drop(key)
+
+    @staticmethod
+    def _read(path: Path) -> tuple[float, Any]:
+        created_at = path.stat().st_mtime
+        with gzip.open(path, "rb") as file:
+            data = json.loads(file.read())
+        # the modification time stays the creation time, the access time tracks the LRU order
+        os.utime(path, (time(), created_at))
+        return created_at, data
+
+    @staticmethod
+    def _write(path: Path, data: Any) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wb", compresslevel=6) as file:
+            file.write(json.dumps(data, separators=(",", ":")).encode())
+        os.replace(tmp_path, path)
+        return path.stat().st_size
+
+    def _drop(self, key: str) -> None:
+        self._size -= self._index.pop(key, 0)
+        self._get_path(key).unlink(missing_ok=True)
+
+    async def _evict(self) -> None:
+        if monotonic() - self._scanned_at >= self.rescan_interval:
+            # entries written and evicted by the other processes
+            async with self._lock:
+                await self._rescan()
+
+        keys = []
+        while self._size > self.max_size and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            keys.append(key)
+
+        if keys:
+            self._evictions += len(keys)
+            await asyncio.to_thread(lambda: [self._get_path(key).unlink(missing_ok=True) for key in keys])
+
+    def get_metrics(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+        return {
+            "replay_only": self.replay_only,
+            "entries": len(self._index),
+            "size": self._size,
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "expired": self._expired,
+            "evictions": self._evictions,
+            "rescans": self._rescans,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,34 @@
+import random
+from dataclasses import dataclass, field
+
+from app.enums.base import RequestMethod
+
+IDEMPOTENT_METHODS = {RequestMethod.GET, RequestMethod.DELETE}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+
+    def should_retry(self, method: RequestMethod, attempt: int, status: int | None = None) -> bool:
+        """
+        Check if a failed request should be retried
+
+        Args:
+            method: request method, only idempotent requests are retried
+            attempt: number of the failed attempt, starting from 1
+            status: response status or None for connection errors and timeouts
+
+        Returns:
+            True if the request should be retried
+        """
+        if method not in IDEMPOTENT_METHODS or attempt >= self.max_attempts:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def get_delay(self, attempt: int) -> float:
+        # exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
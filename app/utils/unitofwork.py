@@ -7,10 +7,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import async_session
 from app.repository.api_key import ApiKeyRepository
 from app.repository.category import CategoryRepository
+from app.repository.category_source import CategorySourceRepository
 from app.repository.company import CompanyRepository, CompanyRepositoryV2
 from app.repository.financial_statement import FinancialStatementRepository, FinancialStatementRepositoryV2
+from app.repository.job import JobRepository
+from app.repository.negative_result import NegativeResultRepository
+from app.repository.registry_version import RegistryVersionRepository
+from app.repository.statement_payload_hash import StatementPayloadHashRepository
+from app.repository.stock_list import StockListRepository
 from app.repository.subscription import SubscriptionRepository
 from app.repository.user import UserRepository
+from app.repository.work_unit import WorkUnitRepository
 
 
 class ABCUnitOfWork(ABC):
@@ -23,8 +30,15 @@ class ABCUnitOfWork(ABC):
     company: CompanyRepository
     company_v2: CompanyRepositoryV2
     category: CategoryRepository
+    category_source: CategorySourceRepository
     financial_statement: FinancialStatementRepository
     financial_statement_v2: FinancialStatementRepositoryV2
+    stock_list: StockListRepository
+    job: JobRepository
+    work_unit: WorkUnitRepository
+    statement_payload_hash: StatementPayloadHashRepository
+    registry_version: RegistryVersionRepository
+    negative_result: NegativeResultRepository
 
     @abstractmethod
     def __init__(self) -> None:
@@ -53,17 +67,28 @@ class UnitOfWork(ABCUnitOfWork):
         self.company = CompanyRepository(self.session)
         self.company_v2 = CompanyRepositoryV2(self.session)
         self.category = CategoryRepository(self.session)
+        self.category_source = CategorySourceRepository(self.session)
         self.financial_statement = FinancialStatementRepository(self.session)
         self.financial_statement_v2 = FinancialStatementRepositoryV2(self.session)
+        self.stock_list = StockListRepository(self.session)
+        self.job = JobRepository(self.session)
+        self.work_unit = WorkUnitRepository(self.session)
+        self.statement_payload_hash = StatementPayloadHashRepository(self.session)
+        self.registry_version = RegistryVersionRepository(self.session)
+        self.negative_result = NegativeResultRepository(self.session)
 
         return self
 
     async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        # callbacks registered by the repositories, e.g. cache invalidations of the written rows
+        on_commit = self.session.info.pop("on_commit", [])
         if exc:
             logger.error(f"An error occurred while processing the request. Rolling back. Error: {repr(exc)}")
             await self.session.rollback()
         else:
             await self.session.commit()
+            for callback in on_commit:
+                await callback()
         await self.session.close()
         await logger.complete()
 
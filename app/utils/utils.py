@@ -1,6 +1,8 @@
 import asyncio
+import csv
 import re
 from functools import wraps
+from typing import AsyncIterable, AsyncIterator
 
 from fastapi import HTTPException, status
 from loguru import logger
@@ -91,3 +93,24 @@ def transform_category(category: str) -> str:
     words = re.sub(r"([a-z])([A-Z])", r"\1 \2", category).split()
     words[0] = words[0].capitalize()
     return " ".join(words)
+
+
+async def iter_csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[dict[str, str]]:
+    header = None
+    buffer = ""
+
+    async for line in lines:
+        buffer += line
+        # a quoted field can span several lines, wait until all quotes are closed
+        if buffer.count('"') % 2:
+            continue
+
+        row = next(csv.reader([buffer]), None)
+        buffer = ""
+        if not row:
+            continue
+
+        if header is None:
+            header = row
+        else:
+            yield dict(zip(header, row))
@@ -0,0 +1,114 @@
+import sys
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Iterable
+
+# dict slots, the entry tuple and the tag index per entry, roughly
+ENTRY_OVERHEAD = 300
+
+
+class ValueCache:
+    """
+    In-process TTL and LRU cache of values, bounded by entry count and estimated memory.
+
+    Every entry is tagged, e.g. with the ids of the rows it was read from, and invalidate() drops all entries
+    of a tag. A value read before an invalidation of one of its tags is not cached, so a read racing a write
+    can't bring the old value back: get the version before reading and pass it to set().
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.version = 0
+
+        # key -> (created at, value, tags, size)
+        self._entries: OrderedDict[Hashable, tuple[float, Any, tuple[Hashable, ...], int]] = OrderedDict()
+        self._tag_keys: dict[Hashable, set[Hashable]] = {}
+        self._invalidated_at: dict[Hashable, int] = {}
+        self._cleared_at = 0
+        self._size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        created_at, value, _, _ = entry
+        if monotonic() - created_at > self.ttl:
+            self._drop(key)
+            self._expired += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: tuple[Hashable, ...], version: int) -> None:
+        if self._cleared_at > version or any(self._invalidated_at.get(tag, 0) > version for tag in tags):
+            return
+
+        self._drop(key)
+
+        size = ENTRY_OVERHEAD + sys.getsizeof(value) + sum(sys.getsizeof(part) for part in (key, *tags))
+        self._entries[key] = (monotonic(), value, tags, size)
+        self._size += size
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_size):
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, tags: Iterable[Hashable]) -> None:
+        self.version += 1
+        for tag in tags:
+            self._invalidated_at[tag] = self.version
+            for key in self._tag_keys.pop(tag, set()):
+                self._drop(key)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        self.version += 1
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._tag_keys.clear()
+        self._size = 0
+        # every value read before now is outdated
+        self._invalidated_at.clear()
+        self._cleared_at = self.version
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        _, _, tags, size = entry
+        self._size -= size
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def get_metrics(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+            "expired": self._expired,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+        }
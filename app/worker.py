@@ -0,0 +1,27 @@
+import asyncio
+
+from loguru import logger
+
+from app.core.fmp_client import fmp_client
+from app.core.shared_cache import shared_cache
+from app.services.category_registry import category_registry
+from app.services.fetch_planner import fetch_planner
+from app.services.fmp import FMPService
+
+
+async def main() -> None:
+    await fmp_client.start()
+    await shared_cache.start()
+    await category_registry.load()
+    await fetch_planner.load()
+    try:
+        logger.info("Started financial statements worker")
+        await FMPService().run_worker()
+    finally:
+        FMPService.extraction_executor.close()
+        await shared_cache.close()
+        await fmp_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark of the COPY upsert of statements against the multi-row INSERT one
+
+Writes batches of every size through FinancialStatementRepositoryV2 with both paths, once as new rows and once
+as unchanged rows like most refreshes, and prints rows/sec and the smallest batch from which COPY wins, the
+value to compare with DB_COPY_MIN_ROWS. Every write is rolled back to a savepoint, the table is left as it was.
+
+Needs a migrated database, e.g. the one of docker-compose-db.yml:
+    POSTGRES_HOST=localhost POSTGRES_PORT=5434 POSTGRES_USER=cmg POSTGRES_PASSWORD=cmg POSTGRES_DB=cmg-finance \\
+        python -m benchmarks.copy_upsert [--sizes 100 250 500 1000 2000 5000 20000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import random
+from statistics import median
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import async_session
+from app.enums.category import CategoryDefinitionType
+from app.models.category import FMPCategory
+from app.models.company import CompanyV2
+from app.repository.base import SQLAlchemyRepository
+from app.repository.financial_statement import FinancialStatementRepositoryV2
+
+CATEGORIES = 80
+
+
+async def create_rows(session: AsyncSession, size: int) -> list[dict[str, Any]]:
+    """Statement rows of a new company, 80 categories per quarter"""
+    company_id = uuid4()
+    await session.execute(insert(CompanyV2).values(id=company_id, cik=company_id.hex, ticker="BENCH", name="Bench"))
+
+    category_ids = [uuid4() for _ in range(CATEGORIES)]
+    await session.execute(
+        insert(FMPCategory).values(
+            [
+                {
+                    "id": category_id,
+                    "label": f"Bench {category_id.hex}",
+                    "value_definition": category_id.hex,
+                    "type": CategoryDefinitionType.api_tag,
+                    "priority": 1,
+                }
+                for category_id in category_ids
+            ]
+        )
+    )
+
+    rows = []
+    for i in range(size):
+        year, quarter = divmod(i // CATEGORIES, 4)
+        report_date = f"{2024 - year}-{quarter * 3 + 3:02}-28"
+        rows.append(
+            {
+                "company_id": company_id,
+                "category_id": category_ids[i % CATEGORIES],
+                "period": f"Q{quarter + 1} {2024 - year}",
+                "report_date": report_date,
+                "filing_date": report_date,
+                "value": str(round(random.uniform(-(10**9), 10**11), 4)),
+            }
+        )
+    return rows
+
+
+async def write(repository: FinancialStatementRepositoryV2, rows: list[dict[str, Any]], copy: bool) -> None:
+    # the base method, without the cache invalidation of the subclass
+    if copy:
+        await repository.copy_many(rows)
+    else:
+        repository.use_copy = False
+        await SQLAlchemyRepository.create_many(repository, rows)
+        repository.use_copy = True
+
+
+async def measure(size: int, copy: bool, existing: bool, repeat: int) -> float:
+    """Median rows/sec"""
+    durations = []
+    async with async_session() as session:
+        repository = FinancialStatementRepositoryV2(session)
+        for _ in range(repeat):
+            savepoint = await session.begin_nested()
+            rows = await create_rows(session, size)
+            if existing:
+                await write(repository, rows, copy=False)
+
+            start = perf_counter()
+            await write(repository, rows, copy)
+            durations.append(perf_counter() - start)
+            await savepoint.rollback()
+        await session.rollback()
+    return size / median(durations)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000, 2000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for existing in (False, True):
+        print("unchanged rows" if existing else "new rows")
+        print(f"{'rows':>8} {'insert rows/s':>14} {'copy rows/s':>12}")
+        threshold = None
+        for size in args.sizes:
+            insert_rate = await measure(size, copy=False, existing=existing, repeat=args.repeat)
+            copy_rate = await measure(size, copy=True, existing=existing, repeat=args.repeat)
+            print(f"{size:>8} {insert_rate:>14.0f} {copy_rate:>12.0f}")
+            if copy_rate > insert_rate and threshold is None:
+                threshold = size
+            elif copy_rate <= insert_rate:
+                threshold = None
+        print(f"COPY wins from {threshold} rows\n" if threshold else "COPY doesn't win for these sizes\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Benchmark of the columnar statements extraction against the row-wise one
+
+Times both in this process, without the extraction pool, on a quarterly statements payload of the given number
+of years and metrics and on a historical dividends payload.
+
+Run from the repository root with the application environment:
+    python -m benchmarks.extraction [--years 40] [--metrics 80] [--repeat 20]
+"""
+
+import argparse
+from statistics import median
+from time import perf_counter
+from typing import Callable
+from uuid import uuid4
+
+from app.enums.fiscal_period import FiscalPeriodType
+from app.services.fmp import FMPService
+from app.utils.columnar import extract_statements_columnar
+from benchmarks.fixtures import get_historical_dividends, get_quarterly_statements
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Median duration in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        durations.append(perf_counter() - start)
+    return median(durations) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=40)
+    parser.add_argument("--metrics", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    company_id = uuid4()
+    payloads = {
+        FiscalPeriodType.QUARTER: get_quarterly_statements(args.years, args.metrics),
+        FiscalPeriodType.HISTORICAL: get_historical_dividends(args.years),
+    }
+    for period_type, statements in payloads.items():
+        # every category is known, like after the first extraction of a payload
+        category_ids = {key.lower(): [uuid4()] for statement in statements for key in statement}
+
+        row_wise = measure(
+            lambda: FMPService._extract_statements(statements, category_ids, period_type, company_id), args.repeat
+        )
+        columnar = measure(
+            lambda: extract_statements_columnar(
+                statements, category_ids, period_type, company_id, FMPService.not_value_keys
+            ),
+            args.repeat,
+        )
+        values = sum(
+            value is not None and key not in FMPService.not_value_keys
+            for statement in statements
+            for key, value in statement.items()
+        )
+        print(
+            f"{period_type}: {len(statements)} statements, {values} values, "
+            f"row-wise {row_wise:.1f} ms, columnar {columnar:.1f} ms, speedup {row_wise / columnar:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import random
+from datetime import date, timedelta
+from uuid import UUID, uuid4
+
+from app.enums.fiscal_period import FiscalPeriodType
+
+QUARTER_ENDS = ((3, 31), (6, 30), (9, 30), (12, 31))
+
+
+def get_metrics(count: int) -> list[str]:
+    """Income statement style metric names, the first ones have the magnitude of amounts, the rest of ratios"""
+    names = [
+        "revenue",
+        "costOfRevenue",
+        "grossProfit",
+        "researchAndDevelopmentExpenses",
+        "sellingGeneralAndAdministrativeExpenses",
+        "operatingExpenses",
+        "interestIncome",
+        "interestExpense",
+        "depreciationAndAmortization",
+        "ebitda",
+        "operatingIncome",
+        "incomeBeforeTax",
+        "incomeTaxExpense",
+        "netIncome",
+        "weightedAverageShsOut",
+        "weightedAverageShsOutDil",
+        "eps",
+        "epsdiluted",
+        "grossProfitRatio",
+        "ebitdaratio",
+        "operatingIncomeRatio",
+        "netIncomeRatio",
+    ]
+    return (names + [f"metric{i}" for i in range(len(names), count)])[:count]
+
+
+def get_value(rng: random.Random, metric: str) -> int | float | None:
+    if rng.random() < 0.03:
+        return None
+    if metric.startswith("eps"):
+        return round(rng.uniform(-5, 15), 2)
+    if metric.endswith(("Ratio", "ratio")) or metric.startswith("metric"):
+        # full float precision, some on a tie of the 5th decimal
+        return round(rng.uniform(-1, 1), 4) + 0.00005 if rng.random() < 0.05 else rng.uniform(-1, 1)
+    return rng.randrange(-(10**9), 10**11)
+
+
+def get_quarterly_statements(years: int, metrics: int, seed: int = 0) -> list[dict]:
+    """
+    Quarterly statements payload like the one of FMP, latest first
+
+    Some statements have no period, which is derived from the date like for old filings.
+    """
+    rng = random.Random(seed)
+    names = get_metrics(metrics)
+    statements = []
+    for year in range(2024, 2024 - years, -1):
+        for quarter, (month, day) in reversed(list(enumerate(QUARTER_ENDS, start=1))):
+            filling_date = date(year, month, day) + timedelta(days=30)
+            statements.append(
+                {
+                    "date": f"{year}-{month:02}-{day:02}",
+                    "symbol": "AAPL",
+                    "reportedCurrency": "USD",
+                    "cik": "0000320193",
+                    "fillingDate": filling_date.isoformat(),
+                    "acceptedDate": f"{filling_date.isoformat()} 18:01:14",
+                    "calendarYear": str(year),
+                    "period": f"Q{quarter}" if rng.random() > 0.1 else "",
+                    **{name: get_value(rng, name) for name in names},
+                    "link": "https://www.sec.gov/Archives/edgar/data/320193/",
+                    "finalLink": "https://www.sec.gov/Archives/edgar/data/320193/aapl.htm",
+                }
+            )
+    return statements
+
+
+def get_historical_dividends(years: int, seed: int = 0) -> list[dict]:
+    """Quarterly dividends payload like the one of FMP, summed by fiscal year on extraction"""
+    rng = random.Random(seed)
+    dividends = []
+    for year in range(2024, 2024 - years, -1):
+        for month, day in reversed(QUARTER_ENDS):
+            dividend = round(rng.uniform(0.1, 1), 5)
+            dividends.append(
+                {
+                    "date": f"{year}-{month:02}-{day - 20:02}",
+                    "label": f"{month} {day - 20}, {year}",
+                    "adjDividend": round(dividend * rng.uniform(0.5, 1), 7),
+                    "dividend": dividend,
+                    "recordDate": f"{year}-{month:02}-{day - 19:02}",
+                    "paymentDate": f"{year}-{month:02}-{day:02}",
+                    "declarationDate": f"{year}-{month:02}-01",
+                }
+            )
+    return dividends
+
+
+def get_random_statements(rng: random.Random, period_type: FiscalPeriodType) -> list[dict]:
+    """Small payload of edge cases: ints, bools, ties, missing and duplicate periods, differently cased keys"""
+    keys = ["revenue", "Revenue", "eps", "ratio", "flag", "newMetric", "otherMetric"]
+    statements = []
+    for _ in range(rng.randint(1, 12)):
+        year = rng.randint(2018, 2021)
+        month = rng.randint(1, 12)
+        statement = {
+            "date": f"{year}-{month:02}-{rng.randint(1, 28):02}",
+            "symbol": "TEST",
+            "calendarYear": str(year),
+            "period": rng.choice(["", None, "FY", "Q1", "Q2", "Q3", "Q4"]),
+        }
+        for key in rng.sample(keys, rng.randint(1, len(keys))):
+            statement[key] = rng.choice(
+                [
+                    rng.randrange(-(10**12), 10**12),
+                    rng.uniform(-1000, 1000),
+                    round(rng.uniform(-10, 10), 4) + 0.00005,
+                    rng.choice([True, False]),
+                    None,
+                    0,
+                    0.0,
+                ]
+            )
+        statements.append(statement)
+    return statements
+
+
+def get_category_ids(rng: random.Random) -> dict[str, list[UUID]]:
+    """Known categories of the edge case payloads, some with many ids, newMetric and otherMetric are new"""
+    shared = uuid4()
+    return {
+        "revenue": [uuid4(), shared],
+        "eps": [shared],
+        "ratio": [uuid4() for _ in range(rng.randint(1, 3))],
+        "flag": [uuid4()],
+    }
@@ -0,0 +1,110 @@
+"""
+Single-key latency benchmark of statement lookups
+
+Before: the join of companies_v2 and fmp_categories matching the label with ILIKE, in a unit of work like
+lookups did until keys were resolved by id. After: get_statement_values, resolving the ticker and label by the
+registries and probing the (company id, period, category id) index. Keys are sampled from the stored statements,
+misses are the same keys in a period without statements, and underscore labels are the keys with the spaces of
+their label replaced by underscores, which ILIKE matched and only the CATEGORY_LABEL_PATTERNS fallback still does.
+The shared cache and the statement filter aren't involved.
+
+Needs a database with statements, e.g. the one of docker-compose-db.yml:
+    POSTGRES_HOST=localhost POSTGRES_PORT=5434 POSTGRES_USER=cmg POSTGRES_PASSWORD=cmg POSTGRES_DB=cmg-finance \\
+        python -m benchmarks.statement_lookup [--keys 1000]
+"""
+
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.core import async_session
+from app.core.config import settings
+from app.models.category import FMPCategory
+from app.models.company import CompanyV2
+from app.models.financial_statement import FMPStatementV2
+from app.services.category_registry import category_registry
+from app.services.company_registry import company_registry
+from app.services.statement_loader import StatementKey, get_statement_values
+from app.utils.unitofwork import UnitOfWork
+
+MISSING_PERIOD = "Q1 1900"
+
+
+async def sample_keys(count: int) -> list[StatementKey]:
+    statement = (
+        select(CompanyV2.ticker, FMPCategory.label, FMPStatementV2.period)
+        .join(CompanyV2, FMPStatementV2.company_id == CompanyV2.id)
+        .join(FMPCategory, FMPStatementV2.category_id == FMPCategory.id)
+        .order_by(FMPStatementV2.id)
+        .limit(count)
+    )
+    async with async_session() as session:
+        rows = (await session.execute(statement)).tuples().all()
+    return [(ticker, label.lower(), period) for ticker, label, period in rows]
+
+
+async def get_joined_value(key: StatementKey) -> None:
+    ticker, label, period = key
+    statement = (
+        select(FMPStatementV2)
+        .join(CompanyV2, FMPStatementV2.company_id == CompanyV2.id)
+        .join(FMPCategory, FMPStatementV2.category_id == FMPCategory.id)
+        .where(CompanyV2.ticker == ticker, FMPCategory.label.ilike(label), FMPStatementV2.period == period)
+    )
+    async with UnitOfWork() as unit_of_work:
+        (await unit_of_work.session.execute(statement)).unique().scalars().all()
+
+
+async def get_id_value(key: StatementKey) -> None:
+    await get_statement_values([key])
+
+
+async def measure(lookup: Callable[[StatementKey], Awaitable[None]], keys: list[StatementKey]) -> str:
+    durations = []
+    for key in keys:
+        start = perf_counter()
+        await lookup(key)
+        durations.append((perf_counter() - start) * 1000)
+    percentiles = quantiles(durations, n=100)
+    return f"p50 {percentiles[49]:.2f} ms, p99 {percentiles[98]:.2f} ms"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=1000)
+    args = parser.parse_args()
+
+    settings.STATEMENT_FILTER_ENABLED = False
+    await category_registry.load()
+    await company_registry.load()
+
+    keys = await sample_keys(args.keys)
+    missing_keys = [(ticker, label, MISSING_PERIOD) for ticker, label, _ in keys]
+    # connections and plans are warmed up by a first pass
+    for key in keys[:50]:
+        await get_joined_value(key)
+        await get_id_value(key)
+
+    for name, lookup_keys in (("hits", keys), ("misses", missing_keys)):
+        print(f"{name} of {len(lookup_keys)} keys")
+        print(f"  before, join and ILIKE: {await measure(get_joined_value, lookup_keys)}")
+        print(f"  after, id probe: {await measure(get_id_value, lookup_keys)}")
+
+    # labels are matched as patterns once per registry version, the first lookups of every label included
+    pattern_keys = [(ticker, label.replace(" ", "_"), period) for ticker, label, period in keys if " " in label]
+    print(f"underscore labels of {len(pattern_keys)} keys")
+    print(f"  before, join and ILIKE: {await measure(get_joined_value, pattern_keys)}")
+    for enabled in (True, False):
+        settings.CATEGORY_LABEL_PATTERNS = enabled
+        await category_registry.load()
+        latency = await measure(get_id_value, pattern_keys)
+        found = len(await get_statement_values(pattern_keys, use_filter=False))
+        print(f"  after, id probe with CATEGORY_LABEL_PATTERNS={enabled}, {found} found: {latency}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import asyncio
+import os
+from typing import AsyncIterator
+
+import asyncpg
+import pytest
+from alembic import command
+from alembic.config import Config
+
+# settings without defaults, the database ones are those of docker-compose-db.yml
+for name, value in {
+    "APP_HOST": "localhost",
+    "APP_PORT": "8000",
+    "POSTGRES_USER": "cmg",
+    "POSTGRES_PASSWORD": "cmg",
+    # a database of its own, the tests truncate its tables
+    "POSTGRES_DB": "cmg-finance-test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5434",
+    "SQUARESPACE_API_KEY": "test",
+    "STRIPE_API_KEY": "test",
+    "FMP_API_KEY": "test",
+    "JWT_SECRET_KEY": "test",
+    "AWS_REGION": "us-east-1",
+    "AWSLOGS_GROUP": "test",
+    "AWSLOGS_STREAM": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+# tables kept by the truncation between tests
+KEPT_TABLES = ("alembic_version", "registry_versions")
+
+
+@pytest.fixture(scope="session")
+def postgres_database() -> None:
+    """Create and migrate the test database, the tests using it are skipped without a PostgreSQL server"""
+    from app.core.config import settings
+
+    async def create() -> None:
+        connection = await asyncpg.connect(
+            user=settings.POSTGRES_USER,
+            password=settings.POSTGRES_PASSWORD,
+            host=settings.POSTGRES_HOST,
+            port=settings.POSTGRES_PORT,
+            database="postgres",
+        )
+        try:
+            if not await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", settings.POSTGRES_DB):
+                await connection.execute(f'CREATE DATABASE "{settings.POSTGRES_DB}"')
+        finally:
+            await connection.close()
+
+    try:
+        asyncio.run(create())
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL isn't reachable: {e!r}")
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+
+@pytest.fixture
+async def postgres(postgres_database: None) -> AsyncIterator[None]:
+    """Empty test database, the connections are disposed of with the event loop of the test"""
+    from sqlalchemy import text
+
+    from app.core.connection import engine
+
+    async with engine.begin() as connection:
+        tables = await connection.execute(
+            text("SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND NOT tablename = ANY(:kept)"),
+            {"kept": list(KEPT_TABLES)},
+        )
+        names = ", ".join(f'"{name}"' for name in tables.scalars())
+        await connection.execute(text(f"TRUNCATE {names} CASCADE"))
+
+    yield
+
+    await engine.dispose()
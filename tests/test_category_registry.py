@@ -0,0 +1,24 @@
+import pytest
+
+from app.core.statement_cache import statement_cache
+from app.services.category_registry import CategoryRegistry
+from tests.utils import create_categories
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+KEY = ("AAA", "revenue", "FY 2024")
+
+
+async def test_reload_of_a_changed_version_clears_the_statement_cache(postgres: None) -> None:
+    registry = CategoryRegistry(check_interval=0)
+    await registry.load()
+    statement_cache.set(KEY, 1.0, tags=("AAA",), version=statement_cache.version)
+
+    await registry.refresh()
+    assert statement_cache.get(KEY) == 1.0
+
+    # changed by another process, which clears its own cache only
+    await create_categories(1)
+    await registry.refresh()
+
+    assert statement_cache.get(KEY) is None
@@ -0,0 +1,52 @@
+import random
+from copy import deepcopy
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.enums.fiscal_period import FiscalPeriodType
+from app.services.fmp import FMPService
+from app.utils.columnar import extract_statements_columnar
+from benchmarks.fixtures import (
+    get_category_ids,
+    get_historical_dividends,
+    get_quarterly_statements,
+    get_random_statements,
+)
+
+# randomized payloads per period type
+CASES = 300
+
+
+def normalize(values: list[dict], categories: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Replace the random ids of new categories by their value definition"""
+    labels = {category["id"]: category["value_definition"] for category in categories}
+    values = [value | {"category_id": labels.get(value["category_id"], value["category_id"])} for value in values]
+    categories = [category | {"id": category["value_definition"]} for category in categories]
+    return values, categories
+
+
+def assert_parity(statements: list[dict], category_ids: dict[str, list[UUID]], period_type: FiscalPeriodType) -> None:
+    company_id = uuid4()
+    expected = FMPService._extract_statements(statements, deepcopy(category_ids), period_type, company_id)
+    actual = extract_statements_columnar(
+        statements, deepcopy(category_ids), period_type, company_id, FMPService.not_value_keys
+    )
+    assert normalize(*actual) == normalize(*expected)
+
+
+def test_quarterly_statements() -> None:
+    # rounding, including ties of the 5th decimal, and periods derived from the date
+    assert_parity(get_quarterly_statements(40, 80), {}, FiscalPeriodType.QUARTER)
+
+
+def test_historical_dividends() -> None:
+    # the dividends of a fiscal year are summed
+    assert_parity(get_historical_dividends(40), {}, FiscalPeriodType.HISTORICAL)
+
+
+@pytest.mark.parametrize("period_type", list(FiscalPeriodType))
+def test_random_statements(period_type: FiscalPeriodType) -> None:
+    rng = random.Random(str(period_type))
+    for _ in range(CASES):
+        assert_parity(get_random_statements(rng, period_type), get_category_ids(rng), period_type)
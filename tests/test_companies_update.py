@@ -0,0 +1,70 @@
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.enums.job import JobStatus, JobType
+from app.models.job import Job
+from app.services.fmp import FMPService
+from app.services.job import JobRunner
+from app.utils.unitofwork import UnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def get_job(cursor: str | None = None, stats: dict[str, Any] | None = None) -> JobRunner:
+    return JobRunner(
+        Job(
+            id=uuid4(),
+            type=JobType.companies_update,
+            status=JobStatus.running,
+            params={"force_update": True},
+            cursor=cursor,
+            total=0,
+            processed=0,
+            failed=0,
+            errors=[],
+            stats=stats or {},
+        )
+    )
+
+
+@pytest.fixture
+def fmp(monkeypatch: pytest.MonkeyPatch) -> FMPService:
+    """FMP with a stock list of TICKERS, whose profile requests fail for BBB and find no company otherwise"""
+
+    async def request(self: FMPService, uri: str, *args: Any, **kwargs: Any) -> Any:
+        if uri == "v3/stock/list":
+            return [{"symbol": ticker, "name": ticker, "exchange": "NASDAQ", "type": "stock"} for ticker in TICKERS]
+        if "BBB" in uri:
+            raise RuntimeError("FMP is down")
+        return []
+
+    monkeypatch.setattr(FMPService, "request", request)
+    monkeypatch.setattr(settings, "FMP_PROFILE_BATCH_SIZE", 1)
+    return FMPService()
+
+
+async def test_failed_batches_are_checkpointed(fmp: FMPService) -> None:
+    job = get_job()
+
+    updated_tickers = await fmp.update_company_profiles(TICKERS, job=job)
+
+    assert updated_tickers == {"AAA", "CCC", "DDD"}
+    assert job.stats["failed_tickers"] == ["BBB"]
+    assert job.cursor == "DDD"
+
+
+@pytest.mark.postgres
+async def test_resumed_job_leaves_failed_tickers_out_of_the_stock_list(postgres: None, fmp: FMPService) -> None:
+    # interrupted after the batches up to CCC, the one of BBB failed
+    job = get_job(cursor="CCC", stats={"failed_tickers": ["BBB"]})
+
+    await fmp.add_companies(force_update=True, job=job)
+
+    async with UnitOfWork() as unit_of_work:
+        fingerprints = await unit_of_work.stock_list.get_fingerprints()
+    assert sorted(fingerprints) == ["AAA", "CCC", "DDD"]
@@ -0,0 +1,55 @@
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from starlette import status
+
+from app.schemas.financial_statement import FinancialStatementRequest, FinancialStatementsRequest
+from app.services.fmp import FMPService
+from app.services.negative_cache import negative_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def fmp(monkeypatch: pytest.MonkeyPatch) -> FMPService:
+    """FMP whose stored values are 1.0, the lookups and update plans of BBB fail and updates find nothing"""
+
+    async def get_financial_statement(self: FMPService, data: FinancialStatementRequest) -> float | None:
+        if data.ticker == "BBB":
+            raise RuntimeError("Database is down")
+        return 1.0 if data.ticker == "AAA" else None
+
+    async def get_update_plan(self: FMPService, data: FinancialStatementRequest, *args: Any) -> dict:
+        if data.ticker == "BBB":
+            raise RuntimeError("Database is down")
+        return {data.period_type: []}
+
+    async def update_statements(self: FMPService, requests: dict[str, FinancialStatementRequest], *args: Any) -> dict:
+        return {key: None for key in requests}
+
+    async def refresh() -> None:
+        pass
+
+    monkeypatch.setattr(FMPService, "_get_financial_statement", get_financial_statement)
+    monkeypatch.setattr(FMPService, "_get_update_plan", get_update_plan)
+    monkeypatch.setattr(FMPService, "_update_statements", update_statements)
+    monkeypatch.setattr(negative_cache, "refresh", refresh)
+    return FMPService()
+
+
+async def test_failed_keys_are_none(fmp: FMPService) -> None:
+    keys = ["AAA|revenue|FY", "BBB|revenue|FY", "CCC|revenue|FY"]
+
+    values = await fmp.get_financial_statements(FinancialStatementsRequest(keys=keys), wait_response=True)
+
+    assert values == {"AAA|revenue|FY": 1.0, "BBB|revenue|FY": None, "CCC|revenue|FY": None}
+
+
+async def test_unparseable_key_is_a_bad_request(fmp: FMPService) -> None:
+    keys = ["AAA|revenue|FY", "AAA"]
+
+    with pytest.raises(HTTPException) as e:
+        await fmp.get_financial_statements(FinancialStatementsRequest(keys=keys))
+
+    assert e.value.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,51 @@
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from starlette import status
+
+from app.enums.fmp import NegativeResultScope
+from app.schemas.financial_statement import FinancialStatementRequest
+from app.services.fmp import CompanyNotFoundError, FMPService
+from app.services.negative_cache import negative_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def confirmed(monkeypatch: pytest.MonkeyPatch) -> list[tuple[NegativeResultScope, str, list[str]]]:
+    """Misses confirmed to the negative cache"""
+    confirmed = []
+
+    async def confirm(scope: NegativeResultScope, ticker: str, keys: list[str]) -> None:
+        confirmed.append((scope, ticker, keys))
+
+    monkeypatch.setattr(negative_cache, "confirm", confirm)
+    return confirmed
+
+
+@pytest.mark.parametrize(
+    "error,scopes",
+    [
+        (CompanyNotFoundError("AAA"), [NegativeResultScope.TICKER]),
+        # e.g. an endpoint FMP has no data of the ticker for
+        (HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found"), []),
+    ],
+)
+async def test_only_an_unknown_company_confirms_the_ticker(
+    monkeypatch: pytest.MonkeyPatch,
+    confirmed: list[tuple[NegativeResultScope, str, list[str]]],
+    error: HTTPException,
+    scopes: list[NegativeResultScope],
+) -> None:
+    async def update_financial_statement(self: FMPService, *args: Any, **kwargs: Any) -> int | None:
+        raise error
+
+    monkeypatch.setattr(FMPService, "update_financial_statement", update_financial_statement)
+    fmp = FMPService()
+    data = FinancialStatementRequest(ticker="AAA", category="revenue", period="FY")
+
+    with pytest.raises(HTTPException):
+        await fmp._update_statements({"AAA|revenue|FY": data}, data, fmp.get_fetch_plan(data.period_type))
+
+    assert [scope for scope, _, _ in confirmed] == scopes
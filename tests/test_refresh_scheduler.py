@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.enums.fiscal_period import FiscalPeriodType
+from app.services.refresh_scheduler import RefreshScheduler
+from app.utils.unitofwork import UnitOfWork
+from tests.utils import create_company
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+
+async def test_age_of_new_entries_starts_at_the_stored_write(postgres: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "REFRESH_HOT_THRESHOLD", 0.5)
+    for ticker in ("AAA", "BBB"):
+        company = await create_company(ticker)
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.statement_payload_hash.create(
+                {
+                    "company_id": company.id,
+                    "period_type": FiscalPeriodType.LATEST,
+                    "hash": ticker,
+                    # AAA was written by a job longer than the SLA ago, BBB just now
+                    "updated_at": datetime.utcnow()
+                    - timedelta(seconds=2 * settings.REFRESH_HOT_SLA * (ticker == "AAA")),
+                }
+            )
+
+    refreshed = []
+
+    async def refresh(ticker: str, period_type: FiscalPeriodType) -> None:
+        refreshed.append((ticker, period_type))
+
+    scheduler = RefreshScheduler([FiscalPeriodType.LATEST])
+    scheduler._refresh = refresh
+    for ticker in ("AAA", "BBB", "CCC"):
+        scheduler.record_access(ticker, FiscalPeriodType.LATEST)
+
+    await scheduler.tick()
+
+    assert refreshed == [("AAA", FiscalPeriodType.LATEST)]
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.category import FMPCategory
+from app.utils.unitofwork import UnitOfWork
+from tests.utils import create_categories
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+
+async def get_version() -> int:
+    async with UnitOfWork() as unit_of_work:
+        return await unit_of_work.registry_version.get_version(FMPCategory.__tablename__)
+
+
+async def test_version_is_bumped_once_per_statement_which_changed_categories(postgres: None) -> None:
+    version = await get_version()
+
+    ids = await create_categories(3)
+    assert await get_version() == version + 1
+
+    async with UnitOfWork() as unit_of_work:
+        # the allocation of known categories changes nothing
+        await unit_of_work.session.execute(
+            insert(FMPCategory)
+            .values([{"label": f"Category {id.hex}", "value_definition": id.hex} for id in ids])
+            .on_conflict_do_nothing()
+        )
+        await unit_of_work.session.execute(update(FMPCategory).values(priority=FMPCategory.priority))
+        await unit_of_work.session.execute(delete(FMPCategory).where(FMPCategory.priority > 1))
+    assert await get_version() == version + 1
+
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.session.execute(update(FMPCategory).where(FMPCategory.id == ids[0]).values(priority=2))
+        await unit_of_work.session.execute(delete(FMPCategory).where(FMPCategory.priority > 1))
+    assert await get_version() == version + 3
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.repository.financial_statement import FinancialStatementRepositoryV2
+from app.utils.unitofwork import UnitOfWork
+from tests.utils import create_categories, create_company
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+
+@pytest.mark.parametrize("copy", [False, True])
+async def test_create_many_counts_inserted_updated_and_unchanged(
+    postgres: None, monkeypatch: pytest.MonkeyPatch, copy: bool
+) -> None:
+    monkeypatch.setattr(settings, "DB_COPY_MIN_ROWS", 1 if copy else 10**9)
+    company = await create_company("AAPL")
+    category_ids = await create_categories(3)
+    rows = [
+        {
+            "company_id": company.id,
+            "category_id": category_id,
+            "period": "Q1 2024",
+            "report_date": "2024-03-31",
+            "filing_date": "2024-03-31",
+            "value": Decimal(i),
+        }
+        for i, category_id in enumerate(category_ids)
+    ]
+
+    async with UnitOfWork() as unit_of_work:
+        assert await unit_of_work.financial_statement_v2.create_many(rows) == {
+            "inserted": 3,
+            "updated": 0,
+            "unchanged": 0,
+        }
+
+    rows[0] = rows[0] | {"value": Decimal(10)}
+    async with UnitOfWork() as unit_of_work:
+        assert await unit_of_work.financial_statement_v2.create_many(rows) == {
+            "inserted": 0,
+            "updated": 1,
+            "unchanged": 2,
+        }
+
+
+async def test_get_values_of_found_keys(postgres: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(FinancialStatementRepositoryV2, "values_batch_size", 2)
+    company = await create_company("AAPL")
+    category_ids = await create_categories(3)
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.financial_statement_v2.create_many(
+            [
+                {
+                    "company_id": company.id,
+                    "category_id": category_id,
+                    "period": "Q1 2024",
+                    "report_date": "2024-03-31",
+                    "filing_date": "2024-03-31",
+                    "value": Decimal(i),
+                }
+                for i, category_id in enumerate(category_ids)
+            ]
+        )
+
+    keys = [(company.id, category_id, period) for category_id in category_ids for period in ("Q1 2024", "Q2 2024")]
+    async with UnitOfWork() as unit_of_work:
+        values = await unit_of_work.financial_statement_v2.get_values(keys)
+
+    assert values == {(company.id, category_id, "Q1 2024"): Decimal(i) for i, category_id in enumerate(category_ids)}
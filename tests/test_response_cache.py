@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from app.utils.response_cache import ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+def get_size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.glob("*/*.json.gz"))
+
+
+async def test_max_size_bounds_the_directory_shared_by_processes(tmp_path: Path) -> None:
+    # two caches over one directory, like the API and worker processes
+    caches = [
+        ResponseCache(str(tmp_path), max_size=4096, ttls={"income-statement": 60}, rescan_interval=0) for _ in range(2)
+    ]
+    for i in range(40):
+        await caches[i % 2].set(f"v3/income-statement/T{i}", None, {"values": list(range(i, i + 200))})
+
+    assert get_size(tmp_path) <= 4096
+    # the latest entry of each process is kept
+    assert await caches[0].get("v3/income-statement/T38") is not None
+    assert await caches[1].get("v3/income-statement/T39") is not None
+
+
+async def test_rescan_picks_up_the_entries_of_other_processes(tmp_path: Path) -> None:
+    writer, reader = [
+        ResponseCache(str(tmp_path), max_size=1024 * 1024, ttls={"income-statement": 60}, rescan_interval=0)
+        for _ in range(2)
+    ]
+    await reader.load()
+    await writer.set("v3/income-statement/AAPL", None, {"revenue": 1})
+    await reader.set("v3/income-statement/MSFT", None, {"revenue": 2})
+
+    assert reader.get_metrics()["entries"] == 2
+    assert await reader.get("v3/income-statement/AAPL") == {"revenue": 1}
@@ -0,0 +1,112 @@
+import asyncio
+from decimal import Decimal
+from typing import AsyncIterator, Awaitable, Callable
+
+import anyio
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from app.core import shared_cache as shared_cache_module
+from app.core.config import settings
+from app.core.shared_cache import NEGATIVE, SharedCache
+
+pytestmark = pytest.mark.anyio
+
+TTL = 60
+
+
+@pytest.fixture
+async def create_cache(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[Callable[[], Awaitable[SharedCache]]]:
+    """Start shared caches of separate processes on one fake Redis server"""
+    server = FakeServer()
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://fake")
+    monkeypatch.setattr(
+        shared_cache_module.Redis, "from_url", lambda *args, **kwargs: FakeAsyncRedis(server=server), raising=False
+    )
+    caches = []
+
+    async def create() -> SharedCache:
+        cache = SharedCache()
+        await cache.start()
+        caches.append(cache)
+        return cache
+
+    yield create
+
+    for cache in caches:
+        await cache.close()
+
+
+async def test_set_many_and_get_many(create_cache: Callable[[], Awaitable[SharedCache]]) -> None:
+    cache = await create_cache()
+    generations = await cache.get_generations(["AAA", "BBB"])
+
+    await cache.set_many(
+        "statements",
+        {("AAA", "revenue"): (Decimal("1.5"), "AAA"), ("BBB", "revenue"): (NEGATIVE, "BBB")},
+        TTL,
+        generations,
+    )
+
+    values = await cache.get_many("statements", [("AAA", "revenue"), ("BBB", "revenue"), ("CCC", "revenue")])
+    assert values == {("AAA", "revenue"): Decimal("1.5"), ("BBB", "revenue"): NEGATIVE}
+
+
+async def test_value_read_before_an_invalidation_is_not_set(create_cache: Callable[[], Awaitable[SharedCache]]) -> None:
+    cache = await create_cache()
+    other = await create_cache()
+    generations = await cache.get_generations(["AAA", "BBB"])
+
+    # a write of another process between the read of the values and their caching
+    await other.invalidate(["AAA"])
+    await cache.set_many("statements", {"AAA": (1.0, "AAA"), "BBB": (2.0, "BBB")}, TTL, generations)
+
+    assert await cache.get_many("statements", ["AAA", "BBB"]) == {"BBB": 2.0}
+    assert cache.get_metrics()["outdated"] == 1
+
+
+async def test_nothing_is_set_without_generations(create_cache: Callable[[], Awaitable[SharedCache]]) -> None:
+    cache = await create_cache()
+
+    await cache.set_many("statements", {"AAA": (1.0, "AAA")}, TTL, None)
+
+    assert await cache.get_many("statements", ["AAA"]) == {}
+
+
+async def test_invalidate_deletes_the_entries_of_the_tickers(
+    create_cache: Callable[[], Awaitable[SharedCache]]
+) -> None:
+    cache = await create_cache()
+    entries = {"AAA": (1.0, "AAA"), ("AAA", "revenue"): (2.0, "AAA"), "BBB": (3.0, "BBB")}
+    await cache.set_many("statements", entries, TTL, await cache.get_generations(["AAA", "BBB"]))
+
+    await cache.invalidate(["AAA"])
+
+    assert await cache.get_many("statements", list(entries)) == {"BBB": 3.0}
+    # entries read after the invalidation are set again
+    await cache.set_many("statements", {"AAA": (4.0, "AAA")}, TTL, await cache.get_generations(["AAA"]))
+    assert await cache.get_many("statements", ["AAA"]) == {"AAA": 4.0}
+
+
+async def test_invalidations_reach_the_other_processes(create_cache: Callable[[], Awaitable[SharedCache]]) -> None:
+    cache = await create_cache()
+    other = await create_cache()
+    received: dict[str, list[list[str]]] = {"cache": [], "other": []}
+    other_received = asyncio.Event()
+
+    async def receive(tickers: list[str]) -> None:
+        received["other"].append(tickers)
+        other_received.set()
+
+    cache.subscribe(lambda tickers: received["cache"].append(tickers))
+    other.subscribe(receive)
+    with anyio.fail_after(5):
+        # both listeners have subscribed
+        while (await cache._client.pubsub_numsub(cache.channel))[0][1] < 2:
+            await asyncio.sleep(0.01)
+
+        await cache.invalidate(["BBB", "AAA"])
+        await other_received.wait()
+
+    assert received == {"cache": [], "other": [["AAA", "BBB"]]}
+    assert other.get_metrics()["received_invalidations"] == 1
@@ -0,0 +1,92 @@
+from uuid import UUID
+
+import pytest
+
+from app.enums.fiscal_period import FiscalPeriodType
+from app.enums.job import WorkUnitStatus
+from app.models.work_unit import WorkUnit
+from app.utils.unitofwork import UnitOfWork
+from tests.utils import create_company, create_job
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+TIMEOUT = 60
+MAX_ATTEMPTS = 2
+
+
+@pytest.fixture
+async def job_id(postgres: None) -> UUID:
+    """Job of 4 pending units"""
+    job = await create_job()
+    companies = [await create_company(ticker) for ticker in ("AAA", "BBB", "CCC", "DDD")]
+    async with UnitOfWork() as unit_of_work:
+        for company in companies:
+            await unit_of_work.work_unit.create(
+                {"job_id": job.id, "company_id": company.id, "period_type": FiscalPeriodType.ANNUAL}
+            )
+    return job.id
+
+
+async def lease(
+    job_id: UUID, worker_id: str = "worker", limit: int = 10, visibility_timeout: float = TIMEOUT
+) -> list[WorkUnit]:
+    async with UnitOfWork() as unit_of_work:
+        return await unit_of_work.work_unit.lease(
+            worker_id, limit=limit, visibility_timeout=visibility_timeout, max_attempts=MAX_ATTEMPTS, job_id=job_id
+        )
+
+
+async def get_counts(job_id: UUID) -> dict[str, int]:
+    async with UnitOfWork() as unit_of_work:
+        counts = await unit_of_work.work_unit.get_counts(job_id)
+    return {status: count for status, count in counts.items() if count}
+
+
+async def test_lease(job_id: UUID) -> None:
+    units = await lease(job_id, limit=3)
+
+    assert len(units) == 3
+    assert {(unit.status, unit.leased_by, unit.attempts) for unit in units} == {(WorkUnitStatus.leased, "worker", 1)}
+    assert await get_counts(job_id) == {WorkUnitStatus.leased: 3, WorkUnitStatus.pending: 1}
+
+
+async def test_concurrent_workers_lease_disjoint_units(job_id: UUID) -> None:
+    async with UnitOfWork() as unit_of_work, UnitOfWork() as other_unit_of_work:
+        # the units of the first worker stay locked until its transaction commits
+        units = await unit_of_work.work_unit.lease("worker", 2, TIMEOUT, MAX_ATTEMPTS, job_id=job_id)
+        other_units = await other_unit_of_work.work_unit.lease("other", 10, TIMEOUT, MAX_ATTEMPTS, job_id=job_id)
+        ids, other_ids = {unit.id for unit in units}, {unit.id for unit in other_units}
+
+    assert len(ids) == 2
+    assert len(other_ids) == 2
+    assert not ids & other_ids
+
+
+async def test_expired_lease_is_leased_again(job_id: UUID) -> None:
+    # not expired
+    await lease(job_id, limit=2)
+    units = await lease(job_id, limit=2, visibility_timeout=0)
+
+    other_units = await lease(job_id, worker_id="other")
+
+    assert {unit.id for unit in other_units} == {unit.id for unit in units}
+    assert {(unit.leased_by, unit.attempts) for unit in other_units} == {("other", 2)}
+
+
+async def test_expired_lease_out_of_attempts_is_dead(job_id: UUID) -> None:
+    for _ in range(MAX_ATTEMPTS):
+        await lease(job_id, visibility_timeout=0)
+
+    assert await lease(job_id) == []
+    assert await get_counts(job_id) == {WorkUnitStatus.dead: 4}
+
+
+async def test_complete(job_id: UUID) -> None:
+    units = await lease(job_id, limit=3)
+
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.work_unit.complete([unit.id for unit in units])
+
+    assert await get_counts(job_id) == {WorkUnitStatus.done: 3, WorkUnitStatus.pending: 1}
+    # done units aren't leased again
+    assert len(await lease(job_id)) == 1
@@ -0,0 +1,44 @@
+from typing import Any
+
+import pytest
+
+from app.enums.fiscal_period import FiscalPeriodType
+from app.enums.job import WorkUnitStatus
+from app.services.fmp import FMPService
+from app.utils.unitofwork import UnitOfWork
+from tests.utils import create_company, create_job
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+PAYLOAD = [{"date": "2024-12-31", "symbol": "AAA", "revenue": 1.0}]
+
+
+@pytest.fixture
+def fmp(monkeypatch: pytest.MonkeyPatch) -> FMPService:
+    """FMP whose statements of every company are PAYLOAD"""
+
+    async def fetch_statements(self: FMPService, *args: Any, **kwargs: Any) -> list[dict]:
+        return PAYLOAD
+
+    monkeypatch.setattr(FMPService, "fetch_statements", fetch_statements)
+    return FMPService()
+
+
+async def test_unit_of_an_unchanged_payload_is_done(postgres: None, fmp: FMPService) -> None:
+    company = await create_company("AAA")
+    job = await create_job()
+    async with UnitOfWork() as unit_of_work:
+        unit = await unit_of_work.work_unit.create(
+            {"job_id": job.id, "company_id": company.id, "period_type": FiscalPeriodType.ANNUAL}
+        )
+        await unit_of_work.statement_payload_hash.create(
+            {"company_id": company.id, "period_type": FiscalPeriodType.ANNUAL, "hash": fmp._get_payload_hash(PAYLOAD)}
+        )
+
+    stats: dict[str, int] = {}
+    await fmp.run_worker(job_id=job.id, stats=stats)
+
+    assert stats["unchanged_payloads"] == 1
+    async with UnitOfWork() as unit_of_work:
+        unit = await unit_of_work.work_unit.get_one(id=unit.id)
+    assert unit.status == WorkUnitStatus.done
@@ -0,0 +1,41 @@
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+
+from app.enums.category import CategoryDefinitionType
+from app.enums.job import JobStatus, JobType
+from app.models.category import FMPCategory
+from app.models.company import CompanyV2
+from app.models.job import Job
+from app.utils.unitofwork import UnitOfWork
+
+
+async def create_company(ticker: str) -> CompanyV2:
+    async with UnitOfWork() as unit_of_work:
+        return await unit_of_work.company_v2.create({"cik": uuid4().hex, "ticker": ticker, "name": ticker})
+
+
+async def create_categories(count: int) -> list[UUID]:
+    ids = [uuid4() for _ in range(count)]
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.session.execute(
+            insert(FMPCategory).values(
+                [
+                    {
+                        "id": id,
+                        "label": f"Category {id.hex}",
+                        "value_definition": id.hex,
+                        "type": CategoryDefinitionType.api_tag,
+                        "priority": 1,
+                    }
+                    for id in ids
+                ]
+            )
+        )
+    return ids
+
+
+async def create_job(type: JobType = JobType.financial_statements_update, params: dict[str, Any] | None = None) -> Job:
+    async with UnitOfWork() as unit_of_work:
+        return await unit_of_work.job.create({"type": type, "status": JobStatus.running, "params": params or {}})